@@ -1,15 +1,114 @@
 # -*- coding: utf-8 -*-
 
-__author__ = 'Ben Leathers'
-__email__ = 'benjaminleathers@gmail.com'
-__version__ = '0.1.0'
+__author__ = "Ben Leathers"
+__email__ = "benjaminleathers@gmail.com"
+__version__ = "0.1.0"
 
-import inspect
-import sys
-from . import data_utils
+import importlib
 
-_current_module = sys.modules[data_utils.__name__]
-_all_objects = (getattr(_current_module, name) for name in dir(_current_module))
-_all_public_callables = [name for name, obj in zip(dir(_current_module), _all_objects) if not name.startswith('_') and (inspect.isfunction(obj) or inspect.isclass(obj))]
+# The submodules import pandas, NumPy and the cfbd SDK, which together take
+# most of a second. Nothing is imported until one of the names below is
+# first used (PEP 562), so `import atd_utils` is instant and
+# `from atd_utils.rate_limit import TokenBucket` only loads rate_limit.
+__all__ = [
+    "APIKeyError",
+    "ApiRequestError",
+    "AsyncCfbdClient",
+    "CacheManifest",
+    "CfbdClient",
+    "EndpointLoadingNotImplemented",
+    "EndpointNotValid",
+    "FrameCache",
+    "Instrumentation",
+    "JsonArrayWriter",
+    "MetricsCollector",
+    "ResponseCache",
+    "TokenBucket",
+    "calendar_weeks",
+    "concat_frames",
+    "file_matches",
+    "file_signature",
+    "filter_rows",
+    "get_api_response",
+    "get_serializer",
+    "iter_records",
+    "load_file",
+    "load_partition",
+    "map_requests",
+    "parse_file_name_fields",
+    "parse_retry_after",
+    "partition_file_name",
+    "partition_filters",
+    "read_json",
+    "to_json",
+    "to_prometheus",
+]
 
-__all__ = _all_public_callables
+# The submodule each name in __all__ is defined in.
+_ATTRIBUTE_MODULES = {
+    "APIKeyError": "data_utils",
+    "ApiRequestError": "data_utils",
+    "AsyncCfbdClient": "async_client",
+    "CacheManifest": "cache",
+    "CfbdClient": "data_utils",
+    "EndpointLoadingNotImplemented": "data_utils",
+    "EndpointNotValid": "data_utils",
+    "FrameCache": "frame_cache",
+    "Instrumentation": "instrumentation",
+    "JsonArrayWriter": "serializers",
+    "MetricsCollector": "instrumentation",
+    "ResponseCache": "response_cache",
+    "TokenBucket": "rate_limit",
+    "calendar_weeks": "cfbd_endpoint_configs",
+    "concat_frames": "data_utils",
+    "file_matches": "data_utils",
+    "file_signature": "frame_cache",
+    "filter_rows": "data_utils",
+    "get_api_response": "data_utils",
+    "get_serializer": "serializers",
+    "iter_records": "serializers",
+    "load_file": "data_utils",
+    "load_partition": "data_utils",
+    "map_requests": "cfbd_endpoint_configs",
+    "parse_file_name_fields": "data_utils",
+    "parse_retry_after": "rate_limit",
+    "partition_file_name": "cache",
+    "partition_filters": "data_utils",
+    "read_json": "serializers",
+    "to_json": "instrumentation",
+    "to_prometheus": "instrumentation",
+}
+
+_SUBMODULES = {
+    "async_client",
+    "cache",
+    "cfbd_endpoint_configs",
+    "cfbstats_com",
+    "columnar_cache",
+    "data_utils",
+    "database",
+    "frame_cache",
+    "instrumentation",
+    "rate_limit",
+    "response_cache",
+    "serializers",
+}
+
+
+def __getattr__(name):
+    if name in _ATTRIBUTE_MODULES:
+        module = importlib.import_module(
+            f".{_ATTRIBUTE_MODULES[name]}", __name__
+        )  # noqa
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache the name so later lookups don't come through here.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
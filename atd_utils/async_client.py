@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import functools
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, List, Dict, Union
+
+import aiohttp
+import cfbd
+
+from .cfbd_endpoint_configs import (
+    ENDPOINTS_DICT,
+    CALENDAR_PULL_FUNCS,
+    PULL_FUNC_PARAMS,
+    calendar_weeks,
+)
+from .data_utils import (
+    CfbdClient,
+    ApiRequestError,
+    EndpointNotValid,
+    MAX_RETRIES,
+    BACKOFF_FACTOR,
+)
+from .rate_limit import parse_retry_after
+
+# Maximum number of requests in flight at once on the event loop.
+MAX_CONCURRENCY = 100
+
+
+class _RequestBuilder(cfbd.ApiClient):
+    """
+    cfbd.ApiClient that returns the prepared request instead of sending it.
+
+    Calling an endpoint method of an API instance built on this client runs
+    the SDK's own parameter validation, serialization and auth, and returns
+    a namespace with the method, url, query_params, headers and
+    response_type of the request it would have made.
+    """
+
+    def request(self, method, url, query_params=None, headers=None, **kwargs):
+        return SimpleNamespace(
+            method=method,
+            url=url,
+            query_params=query_params or [],
+            headers=headers or {},
+        )
+
+    def deserialize(self, response, response_type):
+        response.response_type = response_type
+        return response
+
+    def parse(self, body: bytes, response_type: str):
+        """Deserialize a response body into cfbd models."""
+        response = SimpleNamespace(data=body)
+        return super().deserialize(response, response_type)
+
+
+class AsyncCfbdClient(CfbdClient):
+    """
+    CfbdClient whose pulls run as coroutines on one event loop.
+
+    pull_year and pull_data are coroutines taking the same arguments as
+    CfbdClient's, use the same ENDPOINTS_DICT pull configs and save to the
+    same on-disk layout, so anything that reads a CfbdClient's data_dir can
+    read an AsyncCfbdClient's. Requests go out over aiohttp, share the
+    client's rate limiter, and at most max_concurrency are in flight at
+    once. Cache files and the response cache are read and written on the
+    loop's default executor, so they never block the event loop.
+
+    The coroutine versions of hit_endpoint and season_weeks are
+    ahit_endpoint and aseason_weeks. The synchronous methods inherited
+    from CfbdClient, e.g. iter_pull and missing_partitions, keep making
+    blocking requests through the cfbd SDK.
+
+    Examples:
+        >>> client = AsyncCfbdClient()
+        >>> asyncio.run(client.pull_data(range(2000, 2023), "get_games"))
+    """
+
+    def __init__(
+        self, *args, max_concurrency: int = MAX_CONCURRENCY, **kwargs
+    ) -> None:  # noqa
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        self._request_builder = _RequestBuilder(self.cfbd_configuration)
+        self._semaphore = None
+        self._session = None
+        self._session_users = 0
+
+    async def __aenter__(self) -> "AsyncCfbdClient":
+        self._session_users += 1
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self._session_users -= 1
+        if self._session_users == 0:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the client's aiohttp session, if one is open."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @asynccontextmanager
+    async def _session_scope(self):
+        """
+        Share one aiohttp session between every coroutine using the client.
+
+        The session is opened by the first scope to enter and closed when
+        the last one exits, or when the client's own `async with` block
+        ends.
+        """
+        if self._session is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        self._session_users += 1
+        try:
+            yield self._session
+        finally:
+            self._session_users -= 1
+            if self._session_users == 0:
+                await self.aclose()
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """Call a blocking function on the event loop's default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args))  # noqa
+
+    def prepare_request(
+        self, api_name: str, endpoint_name: str, request_params: Dict
+    ) -> SimpleNamespace:  # noqa
+        """Build the HTTP request an endpoint call would make."""
+        api_instance = getattr(cfbd, api_name)(self._request_builder)
+        return getattr(api_instance, endpoint_name)(**request_params)
+
+    async def _send(self, request: SimpleNamespace) -> bytes:
+        """Send a prepared request once, raising ApiRequestError on errors."""
+        await asyncio.sleep(self.rate_limiter.reserve())
+        params = [(key, str(value)) for key, value in request.query_params]
+        try:
+            async with self._semaphore:
+                async with self._session.request(
+                    request.method,
+                    request.url,
+                    params=params,
+                    headers=request.headers,
+                ) as response:
+                    body = await response.read()
+                    status = response.status
+                    headers = response.headers
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ApiRequestError(f"API Error: {e}", 0)
+        if status >= 400:
+            retry_after = parse_retry_after(headers)
+            if status == 429:
+                self.rate_limiter.throttle(retry_after)
+            raise ApiRequestError(
+                f"API Error: ({status}) {body[:200]!r}", status, retry_after
+            )
+        self.rate_limiter.recover()
+        return body
+
+    async def ahit_endpoint(
+        self,  # noqa
+        api_name: str,  # noqa
+        endpoint_name: str,  # noqa
+        request_params: Dict,
+    ) -> List[Dict]:  # noqa
+        """
+        Call an endpoint, retrying the same statuses get_api_response does.
+        Responses are cached like CfbdClient.hit_endpoint's.
+        """
+        if self.response_cache is not None:
+            cached = await self._run(
+                self.response_cache.get,
+                api_name,
+                endpoint_name,
+                request_params,
+            )
+            if cached is not None:
+                self.metrics.count(
+                    "response_cache_hits", endpoint=endpoint_name
+                )  # noqa
+                self.metrics.count(
+                    "records", len(cached), endpoint=endpoint_name
+                )  # noqa
+                return cached
+        request = self.prepare_request(api_name, endpoint_name, request_params)
+        self.metrics.count("requests", endpoint=endpoint_name)
+        async with self._session_scope():
+            for attempt in range(1, MAX_RETRIES + 1):
+                if attempt > 1:
+                    self.metrics.count("retries", endpoint=endpoint_name)
+                try:
+                    with self.metrics.span("request", endpoint=endpoint_name):
+                        body = await self._send(request)
+                    break
+                except ApiRequestError as e:
+                    if not e.retryable or attempt == MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(BACKOFF_FACTOR * 2**attempt)
+        self.metrics.count("bytes_received", len(body), endpoint=endpoint_name)
+        with self.metrics.span("response_parse", endpoint=endpoint_name):
+            api_response = self._request_builder.parse(
+                body, request.response_type
+            )  # noqa
+        results = [x.to_dict() for x in api_response]
+        self.metrics.count("records", len(results), endpoint=endpoint_name)
+        if self.response_cache is not None:
+            await self._run(
+                self.response_cache.put,
+                api_name,
+                endpoint_name,
+                request_params,
+                results,
+            )
+        return results
+
+    async def aseason_weeks(self, year: int):
+        """See CfbdClient.season_weeks."""
+        if year not in self._season_weeks:
+            calendar = await self.ahit_endpoint(
+                "GamesApi", "get_calendar", {"year": year}
+            )  # noqa
+            self._season_weeks[year] = calendar_weeks(calendar) or None
+        return self._season_weeks[year]
+
+    async def pull_data(
+        self,  # :noqa
+        years: Union[List[int], range, int],  # noqa
+        endpoint_name: str,  # noqa
+        request_params: Dict = None,  # noqa
+        save: bool = True,  # noqa
+        force: bool = False,
+        incremental: bool = False,
+    ) -> List[Dict]:  # noqa
+        """
+        Pull the given years concurrently, see CfbdClient.pull_data.
+
+        Returns:
+            The records of every year, from the most recent year to the
+            oldest.
+        """
+        if isinstance(years, int):
+            years = [years]
+        year_range = list(range(max(years), min(years) - 1, -1))
+        finished = []
+
+        async def pull_year(year: int) -> List[Dict]:
+            results = await self.pull_year(
+                year,
+                endpoint_name,
+                request_params,
+                save,
+                force,
+                incremental=incremental,
+            )
+            finished.append(year)
+            print(
+                f"Pulled {year} ({len(finished)}/{len(year_range)}):"
+                f" {len(results)} records from {endpoint_name}."
+            )
+            return results
+
+        async with self._session_scope():
+            year_results = await asyncio.gather(
+                *[pull_year(year) for year in year_range]
+            )
+        return [record for results in year_results for record in results]
+
+    async def pull_year(
+        self,  # :noqa
+        year: int,  # noqa
+        endpoint_name: str,  # noqa
+        request_params: Dict = None,  # noqa
+        save: bool = True,  # noqa
+        force: bool = False,  # noqa
+        incremental: bool = False,
+    ) -> List[Dict]:  # noqa
+        """
+        Pull one year of an endpoint, see CfbdClient.pull_year.
+
+        Every request the endpoint's pull_func would make is issued at once
+        and the results are combined in the pull_func's order.
+        """
+        try:
+            endpoint_config = ENDPOINTS_DICT[endpoint_name]["pull"]
+        except KeyError:
+            if force:
+                endpoint_config = ENDPOINTS_DICT[endpoint_name]  # noqa
+                save = False
+                print("NOT SAVING - Endpoint not fullimplemented.")
+            else:
+                msg = """Did you mean force=True? This endpoint does not exist
+                or has not been setup yet."""
+                raise EndpointNotValid(msg)
+        if endpoint_config.get("iter_teams"):
+            raise EndpointNotValid(
+                f"{endpoint_name} iterates over teams, which AsyncCfbdClient "
+                "does not support yet. Use CfbdClient instead."
+            )
+        api_name = endpoint_config["api"]
+        func = endpoint_config.get("pull_func")
+        partition_fields = endpoint_config.get("partition_fields")
+        if incremental and not partition_fields:
+            cached = await self._run(
+                self.read_cached_partition, endpoint_name, year
+            )  # noqa
+            if cached is not None:
+                return cached
+
+        request_params = {**(request_params or {}), "year": year}
+        if func is None:
+            params_list = [request_params]
+        elif func in CALENDAR_PULL_FUNCS:
+            async with self._session_scope():
+                weeks = await self.aseason_weeks(year)
+            params_list = PULL_FUNC_PARAMS[func](request_params, weeks)
+        elif func in PULL_FUNC_PARAMS:
+            params_list = PULL_FUNC_PARAMS[func](request_params)
+        else:
+            raise EndpointNotValid(
+                f"{func.__name__} has no PULL_FUNC_PARAMS entry, so "
+                "AsyncCfbdClient cannot pull it."
+            )
+
+        async def pull_partition(params: Dict) -> List[Dict]:
+            key = [params[f] for f in ["year"] + (partition_fields or [])]
+            if partition_fields and incremental:
+                cached = await self._run(
+                    self.read_cached_partition, endpoint_name, *key
+                )  # noqa
+                if cached is not None:
+                    return cached
+            result = await self.ahit_endpoint(api_name, endpoint_name, params)
+            if partition_fields and save:
+                await self._run(
+                    self.save_partition, endpoint_name, result, *key
+                )  # noqa
+            return result
+
+        async with self._session_scope():
+            partition_results = await asyncio.gather(
+                *[pull_partition(params) for params in params_list]
+            )
+        results = [r for result in partition_results for r in result]
+        if save and not partition_fields:
+            await self._run(self.save_partition, endpoint_name, results, year)
+        return results
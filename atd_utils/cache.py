@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+import os
+from os.path import join
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+# SQLite database in data_dir indexing every cached partition file.
+MANIFEST_DB = "manifest.db"
+# The partition key fields the manifest stores and filters on.
+KEY_FIELDS = ["year", "season_type", "week"]
+KEY_FIELD_TYPES = {"year": int, "season_type": str, "week": int}
+# A directory modified this recently may change again within its
+# filesystem's mtime resolution, so a scan of it isn't trusted to be
+# current, see CacheManifest.sync.
+RACY_SECONDS = 2
+
+
+def partition_file_name(
+    endpoint_name: str,  # noqa
+    year: int,  # noqa
+    season_type: Optional[str] = None,  # noqa
+    week: Optional[int] = None,
+) -> str:  # noqa
+    """
+    Build the cache file name for one partition of an endpoint.
+
+    Per-year partitions are saved as `<endpoint>_<year>.json` and per-week
+    partitions as `<endpoint>_<year>_<season_type>_<week>.json`, which is
+    the layout the "file_name_fields" load configs parse.
+    """
+    if season_type is None or week is None:
+        return f"{endpoint_name}_{year}.json"
+    return f"{endpoint_name}_{year}_{season_type}_{week}.json"
+
+
+def current_season(when: Optional[datetime] = None) -> int:
+    """
+    Return the season being played at `when` (default: now).
+
+    Games before June belong to the previous year's season, matching the
+    season_year rule in load_games_load_process.
+    """
+    when = when or datetime.now()
+    return when.year if when.month >= 6 else when.year - 1
+
+
+def pulled_after_season(entry: Optional[Dict], year: int) -> bool:
+    """
+    Whether a manifest entry of a partition of `year` was pulled after that
+    season ended, i.e. the partition can't change any more.
+
+    The current season is never complete, and neither is a partition
+    that was last pulled while its season was still being played.
+    """
+    if entry is None or year >= current_season():
+        return False
+    pulled_at = datetime.fromisoformat(entry["pulled_at"])
+    return current_season(pulled_at) > year
+
+
+class CacheManifest(object):
+    """
+    Index of the cached partition files of every endpoint.
+
+    Each file's partition key (KEY_FIELDS), record count, size, checksum
+    and pull time are kept in one table of `<data_dir>/manifest.db`, so
+    loads and incremental pulls find the partitions they need with an
+    indexed query instead of listing directories and parsing file names.
+    Partitions with no records are recorded too, so empty weeks don't have
+    to be pulled again.
+
+    Pulls record the files they save. Files that got into the cache some
+    other way, e.g. ones cached before the manifest existed, are indexed
+    by sync.
+
+    Args:
+        data_dir: The client's data_dir.
+    """
+
+    def __init__(self, data_dir: str) -> None:
+        self.data_dir = data_dir
+        # database imports pandas, which the rest of this module doesn't
+        # need.
+        from . import database
+
+        self.path = join(data_dir, MANIFEST_DB)
+        self._conn = database.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS partitions ("
+                "endpoint_name TEXT, file TEXT, year INTEGER, "
+                "season_type TEXT, week INTEGER, records INTEGER, "
+                "bytes INTEGER, checksum TEXT, pulled_at TEXT, "
+                "PRIMARY KEY (endpoint_name, file))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_partitions_key ON partitions "
+                "(endpoint_name, year, season_type, week)"
+            )
+            # The mtime each endpoint directory had when sync last
+            # listed it.
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS endpoints ("
+                "endpoint_name TEXT PRIMARY KEY, scanned_mtime_ns INTEGER)"
+            )
+
+    def _select(
+        self, endpoint_name: str, where: str = "", params=()
+    ) -> Dict[str, Dict]:  # noqa
+        columns = (
+            ["file"]
+            + KEY_FIELDS
+            + [
+                "records",
+                "bytes",
+                "checksum",
+                "pulled_at",
+            ]
+        )  # noqa
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM partitions "
+                f"WHERE endpoint_name = ? {where} ORDER BY file",
+                (endpoint_name, *params),
+            ).fetchall()
+        return {row[0]: dict(zip(columns[1:], row[1:])) for row in rows}
+
+    def entries(self, endpoint_name: str) -> Dict[str, Dict]:
+        """
+        Return every entry recorded for endpoint_name, keyed by file name.
+
+        Each entry holds the KEY_FIELDS of the partition (None for fields
+        it isn't partitioned by), "records", "bytes", "checksum" and
+        "pulled_at", an ISO timestamp. Entries of files indexed by sync
+        have no record count or checksum.
+        """
+        return self._select(endpoint_name)
+
+    def get(self, endpoint_name: str, file_name: str) -> Optional[Dict]:
+        """
+        Return the entry for one partition file.
+
+        Files cached before the manifest existed get an entry built from
+        the file's modification time.
+        """
+        entry = self._select(endpoint_name, "AND file = ?", (file_name,)).get(
+            file_name
+        )  # noqa
+        if entry is None:
+            path = join(self.data_dir, endpoint_name, file_name)
+            if os.path.exists(path):
+                pulled_at = datetime.fromtimestamp(os.path.getmtime(path))
+                entry = {"pulled_at": pulled_at.isoformat(), "records": None}
+        return entry
+
+    def partitions(
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        fields: Iterable[str] = ("year",),  # noqa
+        filters: Optional[Dict[str, set]] = None,
+    ) -> Dict[str, Dict]:  # noqa
+        """
+        Find the partition files of an endpoint, without touching its
+        directory.
+
+        Args:
+            fields: The KEY_FIELDS to return for each file.
+            filters: Optional values to keep of some of `fields`, e.g.
+                {"year": {2021}, "week": {1, 2}}. Filters on other fields
+                are ignored.
+
+        Returns:
+            {file name: {field: value}} for each matching file, sorted by
+            file name.
+        """
+        fields = list(fields)
+        unknown = [field for field in fields if field not in KEY_FIELDS]
+        if unknown:
+            raise ValueError(f"{unknown} are not in KEY_FIELDS {KEY_FIELDS}.")  # noqa
+        where = []
+        params = []
+        for field, values in (filters or {}).items():
+            if field in fields:
+                where.append(f"AND {field} IN ({', '.join('?' * len(values))})")  # noqa
+                params += sorted(values)
+        entries = self._select(endpoint_name, " ".join(where), params)
+        return {
+            file_name: {field: entry[field] for field in fields}
+            for file_name, entry in entries.items()
+        }
+
+    def record(
+        self,
+        endpoint_name: str,
+        file_name: str,
+        records: int,
+        checksum: Optional[str] = None,
+        size: Optional[int] = None,
+        fields: Optional[Dict] = None,
+    ) -> None:
+        """
+        Record that file_name was just pulled with `records` records.
+
+        Args:
+            checksum: Optional checksum of the file as saved.
+            size: The file's size in bytes (default: read from the file).
+            fields: The partition's KEY_FIELDS, e.g. {"year": 2021}. Files
+                recorded without them are indexed by the next sync.
+        """
+        if size is None:
+            size = os.path.getsize(
+                join(self.data_dir, endpoint_name, file_name)
+            )  # noqa
+        fields = fields or {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO partitions VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    endpoint_name,
+                    file_name,
+                    *[fields.get(field) for field in KEY_FIELDS],
+                    records,
+                    size,
+                    checksum,
+                    datetime.now().isoformat(),
+                ),
+            )
+
+    def sync(
+        self, endpoint_name: str, parse_fields: Callable[[str], Dict]
+    ) -> None:  # noqa
+        """
+        Bring the manifest in line with the endpoint's directory: index
+        files the manifest doesn't know and forget files that are gone.
+
+        The directory is only listed when its modification time changed
+        since the last sync, so in the usual case this is one stat call.
+        Files are only parsed the first time they're seen.
+
+        Args:
+            parse_fields: Returns the fields encoded in a file name, e.g.
+                parse_file_name_fields with the endpoint's load config.
+
+        Raises:
+            FileNotFoundError: If the endpoint has no directory.
+        """
+        path = join(self.data_dir, endpoint_name)
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            scanned = self._conn.execute(
+                "SELECT scanned_mtime_ns FROM endpoints WHERE endpoint_name = ?",  # noqa
+                (endpoint_name,),
+            ).fetchone()
+            if scanned is not None and scanned[0] == mtime_ns:
+                return
+            files = {file for file in os.listdir(path) if file[0] != "."}
+            known = dict(
+                self._conn.execute(
+                    "SELECT file, year FROM partitions WHERE endpoint_name = ?",  # noqa
+                    (endpoint_name,),
+                )
+            )
+            rows = []
+            for file in sorted(files):
+                # Entries recorded without their fields have no year.
+                if known.get(file) is not None:
+                    continue
+                try:
+                    stat = os.stat(join(path, file))
+                except FileNotFoundError:
+                    continue
+                fields = parse_fields(file)
+                pulled_at = datetime.fromtimestamp(stat.st_mtime).isoformat()
+                rows.append(
+                    (
+                        endpoint_name,
+                        file,
+                        *[fields.get(field) for field in KEY_FIELDS],
+                        stat.st_size,
+                        pulled_at,
+                    )
+                )
+            gone = [
+                (endpoint_name, file) for file in known if file not in files
+            ]  # noqa
+            # Changes made within the filesystem's mtime resolution of the
+            # listing may not have moved the mtime, so list again next time.
+            racy = time.time_ns() - mtime_ns < RACY_SECONDS * 10**9
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO partitions (endpoint_name, file, year, "
+                    "season_type, week, bytes, pulled_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (endpoint_name, file) DO UPDATE SET "
+                    "year = excluded.year, "
+                    "season_type = excluded.season_type, "
+                    "week = excluded.week, "
+                    "bytes = coalesce(bytes, excluded.bytes)",
+                    rows,
+                )
+                self._conn.executemany(
+                    "DELETE FROM partitions WHERE endpoint_name = ? AND file = ?",  # noqa
+                    gone,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO endpoints VALUES (?, ?)",
+                    (endpoint_name, None if racy else mtime_ns),
+                )
+
+    def is_complete(
+        self, endpoint_name: str, file_name: str, year: int
+    ) -> bool:  # noqa
+        """
+        Whether a partition of `year` was pulled after that season ended,
+        see pulled_after_season.
+        """
+        return pulled_after_season(self.get(endpoint_name, file_name), year)
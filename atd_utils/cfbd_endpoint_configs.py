@@ -1,26 +1,146 @@
-from typing import List, Dict, Callable  # , Optional, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import List, Dict, Callable, Iterable, Iterator, Optional
 import pandas as pd
 import numpy as np
 
 # from tqdm import tqdm
 
+SEASON_TYPES = ["regular", "postseason"]
+WEEKS = range(1, 17)
+
+
+def map_requests(
+    func: Callable[[Dict], List[Dict]],  # noqa
+    params_list: Iterable[Dict],  # noqa
+    max_workers: int = 1,
+) -> Iterator[List[Dict]]:  # noqa
+    """
+    Call func once per request params dict, optionally on a thread pool.
+
+    Args:
+        func: Callable taking a single request params dict.
+        params_list: The request params dicts to call func with.
+        max_workers: Number of threads to issue the requests on. 1 (the
+            default) issues them serially on the calling thread.
+
+    Yields:
+        The result of each call, in the same order as params_list no matter
+        which order the requests finish in. At most 2 * max_workers calls
+        are submitted ahead of the result being yielded, so a slow consumer
+        never has more than that many results waiting in memory.
+    """
+    if max_workers <= 1:
+        yield from map(func, params_list)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for params in params_list:
+            pending.append(executor.submit(func, params))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def season_type_params(request_params: Dict) -> List[Dict]:
+    """Return a copy of request_params for each season type."""
+    return [dict(request_params, season_type=kind) for kind in SEASON_TYPES]
+
+
+def calendar_weeks(calendar: List[Dict]) -> Dict[str, List[int]]:
+    """
+    Group the weeks of a get_calendar response by season type.
+
+    Returns:
+        The sorted weeks of each of SEASON_TYPES the calendar has, e.g.
+        {"regular": [0, 1, ..., 14], "postseason": [1]}. Empty if the
+        calendar holds no weeks.
+    """
+    weeks = {}
+    for entry in calendar:
+        season_type = entry.get("season_type")
+        week = entry.get("week")
+        if season_type in SEASON_TYPES and week is not None:
+            weeks.setdefault(season_type, set()).add(week)
+    return {
+        season_type: sorted(weeks[season_type])
+        for season_type in SEASON_TYPES
+        if season_type in weeks
+    }
+
+
+def season_type_and_week_params(
+    request_params: Dict, weeks: Optional[Dict[str, List[int]]] = None
+) -> List[Dict]:  # noqa
+    """
+    Return a copy of request_params for each week of each season type.
+
+    Args:
+        weeks: The weeks of each season type, see calendar_weeks (default:
+            None, i.e. WEEKS of every one of SEASON_TYPES).
+    """
+    if not weeks:
+        weeks = {season_type: WEEKS for season_type in SEASON_TYPES}
+    return [
+        {**request_params, "week": week, "season_type": season_type}
+        for season_type, season_weeks in weeks.items()
+        for week in season_weeks
+    ]
+
 
 def pull_over_season_types_and_weeks(
     request_func: Callable[[Dict, str, bool, bool], List[Dict]],  # noqa
     api_name: str,  # noqa
     endpoint_name: str,  # noqa
     request_params: Dict,
+    max_workers: int = 1,
+    read_cache: Optional[Callable[[Dict], Optional[List[Dict]]]] = None,
+    write_cache: Optional[Callable[[Dict, List[Dict]], None]] = None,
+    weeks: Optional[Dict[str, List[int]]] = None,
 ) -> List[Dict]:  # noqa
-    results = []
+    """
+    Pull every week of every season type for request_params["year"].
+
+    Each week gets its own copy of request_params, so the caller's dict is
+    never mutated and concurrent requests never share state.
+
+    Args:
+        max_workers: Number of week requests to have in flight at once
+            (default: 1, i.e. serial).
+        read_cache: Optional callable taking a week's request params and
+            returning its cached results, or None if it has to be pulled.
+        write_cache: Optional callable taking a week's request params and
+            its freshly pulled results, e.g. to save them per week.
+        weeks: The weeks of each season type to pull, e.g. from the
+            season's calendar (default: None, i.e. weeks 1-16 of both
+            season types).
+
+    Returns:
+        The combined results in season type then week order.
+    """
     print(f"year:{request_params['year']}")
-    for season_type in ["regular", "postseason"]:
-        for week in range(1, 17):
-            request_params["week"] = week
-            request_params["season_type"] = season_type
-            result = request_func(api_name, endpoint_name, request_params)
-            if result:
-                results += result
-                print(f"\tWeek:{week}\tseason_type:{season_type}")
+    week_params = season_type_and_week_params(request_params, weeks)
+
+    def pull_week(params: Dict) -> List[Dict]:
+        if read_cache is not None:
+            cached = read_cache(params)
+            if cached is not None:
+                return cached
+        result = request_func(api_name, endpoint_name, params)
+        if write_cache is not None:
+            write_cache(params, result)
+        return result
+
+    results = []
+    week_results = map_requests(pull_week, week_params, max_workers)
+    for params, result in zip(week_params, week_results):
+        if result:
+            results += result
+            print(
+                f"\tWeek:{params['week']}\tseason_type:{params['season_type']}"
+            )  # noqa
     return results
 
 
@@ -29,11 +149,15 @@ def pull_over_season_types(
     api_name: str,  # noqa
     endpoint_name: str,  # noqa
     request_params: Dict,
+    max_workers: int = 1,
 ) -> List[Dict]:  # noqa
+    def pull_season_type(params: Dict) -> List[Dict]:
+        return request_func(api_name, endpoint_name, params)
+
     results = []
-    for season_type in ["regular", "postseason"]:
-        request_params["season_type"] = season_type
-        result = request_func(api_name, endpoint_name, request_params)
+    for result in map_requests(
+        pull_season_type, season_type_params(request_params), max_workers
+    ):  # noqa
         if result:
             results += result
     return results
@@ -76,69 +200,114 @@ def pull_over_season_types(
 #     return df.reset_index(drop=True)
 
 
-def load_games_load_process(df: pd.DataFrame) -> pd.DataFrame:
-    home_line_scores_cols = [
-        "home_q1_points",
-        "home_q2_points",
-        "home_q3_points",
-        "home_q4_points",
-    ]
-    df[home_line_scores_cols] = df["home_line_scores"].apply(
-        lambda x: pd.Series([np.nan] * 4)
-        if x is None or len(x) == 0
-        else pd.Series(x[:4])
-    )
-    df["home_ot_total_points"] = df["home_line_scores"].apply(
-        lambda x: sum(x[4:]) if x is not None and len(x) > 4 else None
-    )
-    df["home_ot_points_per_period"] = df["home_line_scores"].apply(
-        lambda x: str(x[4:]) if x is not None and len(x) > 4 else None
-    )
-    df["home_num_ot_periods"] = df["home_line_scores"].apply(
-        lambda x: len(x[4:]) if x is not None and len(x) > 4 else None
-    )
-    away_line_score_cols = [
-        "away_q1_points",
-        "away_q2_points",
-        "away_q3_points",
-        "away_q4_points",
-    ]
-    df[away_line_score_cols] = df["away_line_scores"].apply(
-        lambda x: pd.Series([np.nan] * 4)
-        if x is None or len(x) == 0
-        else pd.Series(x[:4])
-    )
-    df["away_ot_total_points"] = df["away_line_scores"].apply(
-        lambda x: sum(x[4:]) if x is not None and len(x) > 4 else None
-    )
-    df["away_ot_points_per_period"] = df["away_line_scores"].apply(
-        lambda x: str(x[4:]) if x is not None and len(x) > 4 else None
-    )
-    df["away_num_ot_periods"] = df["away_line_scores"].apply(
-        lambda x: len(x[4:]) if x is not None and len(x) > 4 else None
+def _pad_line_scores(line_scores: pd.Series):
+    """
+    Pad a column of line score lists into one 2-D array.
+
+    Returns:
+        A (scores, lengths, integral) tuple. scores has a row per game and
+        at least four columns, NaN past the end of each list (and for
+        games with no line scores). lengths is each list's length and
+        integral whether every score was an int.
+    """
+    lists = [[] if x is None else x for x in line_scores]
+    lengths = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+    flat = np.array(list(chain.from_iterable(lists)))
+    integral = flat.dtype.kind in "iu"
+    width = max(4, int(lengths.max(initial=0)))
+    scores = np.full((len(lists), width), np.nan)
+    scores[np.arange(width) < lengths[:, None]] = flat.astype(float)
+    return scores, lengths, integral
+
+
+def _infer_column(values: np.ndarray, present: np.ndarray, integral: bool):
+    """
+    Give a float column the dtype pandas infers for a list of numbers and
+    Nones: object if every value is missing, int64 if none is and the
+    numbers are ints, float64 otherwise.
+    """
+    if not present.any():
+        return np.full(len(values), None, dtype=object)
+    if integral and present.all():
+        return values.astype(np.int64)
+    return np.where(present, values, np.nan)
+
+
+def _line_score_columns(df: pd.DataFrame, side: str) -> None:
+    """
+    Replace df's `<side>_line_scores` lists with per-quarter and overtime
+    columns.
+    """
+    scores, lengths, integral = _pad_line_scores(df[f"{side}_line_scores"])
+    quarters = scores[:, :4]
+    if integral and not np.isnan(quarters).any():
+        quarters = quarters.astype(np.int64)
+    df[[f"{side}_q{quarter}_points" for quarter in range(1, 5)]] = quarters
+    has_ot = lengths > 4
+    df[f"{side}_ot_total_points"] = _infer_column(
+        np.nansum(scores[:, 4:], axis=1), has_ot, integral
     )
+    # Only the few overtime games need their periods formatted.
+    ot_periods = np.full(len(df), None, dtype=object)
+    line_scores = df[f"{side}_line_scores"].to_numpy()
+    for ix in np.flatnonzero(has_ot):
+        ot_periods[ix] = str(line_scores[ix][4:])
+    df[f"{side}_ot_points_per_period"] = ot_periods
+    df[f"{side}_num_ot_periods"] = _infer_column(lengths - 4, has_ot, True)
+
+
+def load_games_load_process(df: pd.DataFrame) -> pd.DataFrame:
+    _line_score_columns(df, "home")
+    _line_score_columns(df, "away")
     df.drop("home_line_scores", axis=1, inplace=True)
     df.drop("away_line_scores", axis=1, inplace=True)
 
     df["game_date"] = pd.to_datetime(df.start_date)
-    df["season_year"] = df.game_date.apply(
-        lambda x: pd.to_datetime(x).year - 1
-        if pd.to_datetime(x).month < 6
-        else pd.to_datetime(x).year
-    )
+    # Games before June belong to the previous year's season.
+    season_year = df.game_date.dt.year - (df.game_date.dt.month < 6)
+    if not season_year.hasnans:
+        season_year = season_year.astype(np.int64)
+    df["season_year"] = season_year
     df.drop("start_date", axis=1, inplace=True)
     return df
 
 
-def get_player_game_stats_pre_pandas_load_process(
-    data: List[Dict],
-) -> List[Dict]:  # noqa
-    rows = []
+# Columns of get_player_game_stats_to_df holding a handful of repeated
+# strings, stored as categoricals.
+PLAYER_GAME_STATS_CATEGORICALS = [
+    "home_away",
+    "team_name",
+    "conference",
+    "category",
+    "type",
+]
+
+
+def get_player_game_stats_to_df(data: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Flatten get_player_game_stats responses straight into a DataFrame.
+
+    Produces the rows the old dict-per-row pre_pandas_load_process did,
+    without building a dict per stat line or running json_normalize. The
+    game, team, category and type fields are collected once per stat type
+    and repeated over its athletes, and the columns in
+    PLAYER_GAME_STATS_CATEGORICALS are categoricals.
+    """
+    groups = {
+        "game_id": [],
+        "home_away": [],
+        "team_name": [],
+        "conference": [],
+        "category": [],
+        "type": [],
+    }
+    counts = []
+    athlete_ids = []
+    athlete_names = []
+    stats = []
     for game in data:
         game_id = game["id"]
-        teams = game["teams"]
-        for team in teams:
-            categories = team["categories"]
+        for team in game["teams"]:
             if "home_away" in team.keys():
                 home_away = team["home_away"]
                 team_name = team["school"]["name"]
@@ -147,30 +316,37 @@ def get_player_game_stats_pre_pandas_load_process(
                 home_away = team["homeAway"]
                 team_name = team["school"]
                 conference = team["conference"]
-            categories = team["categories"]
-            for category in categories:
-                name = category["name"]
-                types = category["types"]
-                for typ in types:
-                    typ_name = typ["name"]
+            home_away = "home" if home_away else "away"
+            for category in team["categories"]:
+                for typ in category["types"]:
                     athletes = typ["athletes"]
-                    for athlete in athletes:
-                        athlete_id = athlete["id"]
-                        athlete_name = athlete["name"]
-                        stat = athlete["stat"]
-                        row = {
-                            "game_id": game_id,
-                            "home_away": "home" if home_away else "away",
-                            "team_name": team_name,
-                            "conference": conference,
-                            "category": name,
-                            "type": typ_name,
-                            "athlete_id": athlete_id,
-                            "athlete_name": athlete_name,
-                            "stat": stat,
-                        }
-                        rows.append(row)
-    return rows
+                    groups["game_id"].append(game_id)
+                    groups["home_away"].append(home_away)
+                    groups["team_name"].append(team_name)
+                    groups["conference"].append(conference)
+                    groups["category"].append(category["name"])
+                    groups["type"].append(typ["name"])
+                    counts.append(len(athletes))
+                    athlete_ids += [athlete["id"] for athlete in athletes]
+                    athlete_names += [athlete["name"] for athlete in athletes]
+                    stats += [athlete["stat"] for athlete in athletes]
+    if not athlete_ids:
+        # What json_normalize makes of no rows.
+        return pd.DataFrame()
+    counts = np.array(counts, dtype=np.int64)
+    columns = {}
+    for name, values in groups.items():
+        if name in PLAYER_GAME_STATS_CATEGORICALS:
+            categorical = pd.Categorical(values)
+            columns[name] = pd.Categorical.from_codes(
+                np.repeat(categorical.codes, counts), categorical.categories
+            )
+        else:
+            columns[name] = np.repeat(np.array(values), counts)
+    columns["athlete_id"] = athlete_ids
+    columns["athlete_name"] = athlete_names
+    columns["stat"] = stats
+    return pd.DataFrame(columns)
 
 
 # def pull_get_player_game_stats(
@@ -192,30 +368,62 @@ def get_player_game_stats_pre_pandas_load_process(
 #     return results
 
 
-def get_rankings_load_process(df):
-    # Extract the common keys
-    exploded_first = df.explode("polls")
-    normalized_polls = pd.json_normalize(exploded_first["polls"])
-    recombined = pd.concat(
-        [
-            exploded_first.reset_index(drop=True),
-            normalized_polls.reset_index(drop=True),
-        ],
-        axis=1,
-    )
-    exploded_ranks = recombined.explode("ranks")
-    normalized_ranks = pd.json_normalize(exploded_ranks["ranks"])
-    final_recombined = pd.concat(
-        [
-            exploded_ranks.reset_index(drop=True),
-            normalized_ranks.reset_index(drop=True),
-        ],
-        axis=1,
+# Field order of the API's rank objects. The columnar cache stores ranks as
+# Arrow structs, which sort their fields, so the rank columns are ordered
+# from this list rather than from the dicts.
+RANK_FIELDS = ["rank", "school", "conference", "first_place_votes", "points"]
+
+
+def get_rankings_load_process(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flatten the polls -> ranks nesting of get_rankings into one row per
+    rank.
+
+    The week's columns are taken once per rank with a single take, the
+    poll name is a categorical, and the rank fields are read straight out
+    of the nested dicts, so no intermediate exploded frames are built.
+    Like the explode it replaced, a week without polls (an empty list, or
+    NaN where json_normalize found no key) and a poll without ranks each
+    keep one row, with missing poll or rank fields.
+    """
+    week_ix = []
+    poll_names = []
+    counts = []
+    ranks = []
+    for ix, polls in enumerate(df["polls"]):
+        if not isinstance(polls, list) or not polls:
+            polls = [{"poll": None, "ranks": []}]
+        for poll in polls:
+            week_ix.append(ix)
+            poll_names.append(poll["poll"])
+            poll_ranks = poll["ranks"] or [{}]
+            counts.append(len(poll_ranks))
+            ranks += poll_ranks
+    counts = np.array(counts, dtype=np.int64)
+    rows = np.repeat(np.array(week_ix, dtype=np.int64), counts)
+    flat = df.drop("polls", axis=1).take(rows).reset_index(drop=True)
+    polls = pd.Categorical(poll_names)
+    flat["poll"] = pd.Categorical.from_codes(
+        np.repeat(polls.codes, counts), polls.categories
     )
-    return_cols = [
-        col for col in final_recombined.columns if col not in ["polls", "ranks"]  # noqa
-    ]  # noqa
-    return final_recombined[return_cols]
+    fields = set(next((rank for rank in ranks if rank), {}))
+    for field in [f for f in RANK_FIELDS if f in fields] + sorted(
+        fields - set(RANK_FIELDS)
+    ):  # noqa
+        flat[field] = [rank.get(field) for rank in ranks]
+    return flat
+
+
+# Pull funcs that take the season's weeks, which clients read from the
+# get_calendar endpoint.
+CALENDAR_PULL_FUNCS = {pull_over_season_types_and_weeks}
+
+# The request params each pull_func fans request_params out to, for clients
+# that issue the requests themselves (e.g. AsyncCfbdClient).
+PULL_FUNC_PARAMS = {
+    pull_over_season_types: season_type_params,
+    pull_over_season_types_and_weeks: season_type_and_week_params,
+}
 
 
 ENDPOINTS_DICT = {
@@ -224,29 +432,44 @@ ENDPOINTS_DICT = {
         "pull": {
             "api": "GamesApi",
             "pull_func": pull_over_season_types_and_weeks,
+            "partition_fields": ["season_type", "week"],
         }  # noqa
     },
     "get_draft_picks": {"pull": {"api": "DraftApi"}},
     "get_coaches": {
         "pull": {
             "api": "CoachesApi",
+            "cache_ttl": 7 * 24 * 60 * 60,
         },
         "load": {
             "record_path": ["seasons"],
             "meta": ["first_name", "last_name", "hire_date"],
+            "key_columns": ["first_name", "last_name", "school", "year"],
+            "index_columns": [["year"], ["school"]],
         },
     },
     "get_games": {
         "pull": {
             "api": "GamesApi",
             "pull_func": pull_over_season_types,
+            # Scores come in through game days.
+            "cache_ttl": 60 * 60,
+        },
+        "load": {
+            "df_load_process": load_games_load_process,
+            "key_columns": ["id"],
+            "index_columns": [
+                ["season", "week"],
+                ["home_team"],
+                ["away_team"],
+            ],
         },
-        "load": {"df_load_process": load_games_load_process},
     },
     "get_player_game_stats": {
         "pull": {
             "api": "GamesApi",
             "pull_func": pull_over_season_types_and_weeks,
+            "partition_fields": ["season_type", "week"],
         },
         "load": {
             "file_name_fields": {
@@ -254,21 +477,51 @@ ENDPOINTS_DICT = {
                 "season_type": (-2, str),
                 "week": (-1, int),
             },
-            "pre_pandas_load_process": get_player_game_stats_pre_pandas_load_process,  # noqa
+            "records_to_df": get_player_game_stats_to_df,
+            "key_columns": [
+                "game_id",
+                "team_name",
+                "category",
+                "type",
+                "athlete_id",
+            ],
+            "index_columns": [
+                ["year", "week"],
+                ["team_name"],
+                ["athlete_id"],
+            ],
         },
     },
     "get_fbs_teams": {
         "pull": {
             "api": "TeamsApi",
+            "cache_ttl": 7 * 24 * 60 * 60,
         },
-        "load": {"stringify_lists": ["logos"]},
+        "load": {
+            "stringify_lists": ["logos"],
+            "key_columns": ["id", "year"],
+            "index_columns": [["year"], ["school"]],
+        },
+    },
+    "get_calendar": {
+        "pull": {
+            "api": "GamesApi",
+            "cache_ttl": 7 * 24 * 60 * 60,
+        },
+        "load": {"key_columns": ["season", "season_type", "week"]},
     },
     "get_rankings": {
         "pull": {
             "api": "RankingsApi",
             "pull_func": pull_over_season_types,
+            # Polls come out once a week.
+            "cache_ttl": 24 * 60 * 60,
+        },
+        "load": {
+            "df_load_process": get_rankings_load_process,
+            "key_columns": ["season", "season_type", "week", "poll", "school"],  # noqa
+            "index_columns": [["season", "week"], ["school"]],
         },
-        "load": {"df_load_process": get_rankings_load_process},
     },
     # #########################################################################
     # Nothing implemented
@@ -279,7 +532,6 @@ ENDPOINTS_DICT = {
     "get_nfl_teams": {"api": "DraftApi"},
     "get_drives": {"api": "DrivesApi"},
     "get_advanced_box_score": {"api": "GamesApi"},
-    "get_calendar": {"api": "GamesApi"},
     "get_game_media": {"api": "GamesApi"},
     "get_game_weather": {"api": "GamesApi"},
     "get_scoreboard": {"api": "GamesApi"},
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+import os
+from os.path import join
+import threading
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+    pq = None
+
+# Parquet partitions live next to the JSON files they were built from, in a
+# dot directory so load_to_df's directory listing skips them.
+COLUMNAR_DIR = ".columnar"
+# Oldest pyarrow the cache works with. read_partitions relies on
+# concat_tables' promote_options, added in pyarrow 14.
+MIN_PYARROW_VERSION = (14, 0)
+
+
+def _version(version: str) -> tuple:
+    return tuple(int(part) for part in version.split(".")[:2])
+
+
+def available() -> bool:
+    """
+    Whether pyarrow is installed, at MIN_PYARROW_VERSION or later, which
+    the columnar cache needs.
+    """
+    return pq is not None and _version(pa.__version__) >= MIN_PYARROW_VERSION
+
+
+def partition_path(endpoint_path: str, file: str) -> str:
+    """Return the Parquet path for the JSON partition file `file`."""
+    return join(endpoint_path, COLUMNAR_DIR, f"{file.split('.')[0]}.parquet")
+
+
+def is_fresh(endpoint_path: str, file: str) -> bool:
+    """
+    Whether the Parquet copy of `file` exists and is at least as new as
+    the JSON file, i.e. was built from its current contents.
+    """
+    path = partition_path(endpoint_path, file)
+    try:
+        parquet_mtime = os.path.getmtime(path)
+    except OSError:
+        return False
+    return parquet_mtime >= os.path.getmtime(join(endpoint_path, file))
+
+
+def write_partition(df: pd.DataFrame, endpoint_path: str, file: str) -> bool:
+    """
+    Write a normalized partition frame to Parquet.
+
+    Returns:
+        False if the frame can't be represented in Arrow (e.g. a column
+        mixing numbers and strings), in which case nothing is written and
+        the partition keeps being loaded from JSON.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+    path = partition_path(endpoint_path, file)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return True
+
+
+def read_partitions(
+    endpoint_path: str, files: List[str], columns: Optional[List[str]] = None
+) -> pd.DataFrame:  # noqa
+    """
+    Memory-map the Parquet copies of `files` into one DataFrame.
+
+    The partitions are concatenated as Arrow tables and converted to pandas
+    once, which is much cheaper than converting each one.
+
+    Args:
+        columns: Optional columns to read. Columns a partition doesn't have
+            are skipped, as if they were missing from its JSON.
+
+    Returns:
+        The frames load_file would have produced from the JSON files,
+        concatenated. List columns are turned back into Python lists, since
+        Arrow returns them as NumPy arrays.
+    """
+    tables = []
+    for file in files:
+        path = partition_path(endpoint_path, file)
+        file_columns = columns
+        if columns is not None:
+            names = set(pq.read_schema(path).names)
+            file_columns = [column for column in columns if column in names]
+        tables.append(
+            pq.read_table(path, columns=file_columns, memory_map=True)
+        )  # noqa
+    # Empty partitions only hold their file name fields, which would move
+    # those columns to the front, see data_utils.concat_frames.
+    tables = [table for table in tables if table.num_rows] or tables[:1]
+    try:
+        table = pa.concat_tables(tables, promote_options="default")
+    except pa.ArrowInvalid:
+        # Partitions disagree on a column's type, e.g. int in one year and
+        # float in another. Let pandas reconcile them.
+        return pd.concat(
+            [_table_to_df(table) for table in tables], ignore_index=True
+        )  # noqa
+    return _table_to_df(table)
+
+
+def _table_to_df(table: "pa.Table") -> pd.DataFrame:
+    df = table.to_pandas()
+    for field in table.schema:
+        if pa.types.is_nested(field.type):
+            df[field.name] = df[field.name].map(_to_python)
+    return df
+
+
+def _to_python(value):
+    """Turn the NumPy arrays Arrow returns for lists back into lists."""
+    if isinstance(value, np.ndarray):
+        if value.dtype != object:
+            return value.tolist()
+        return [_to_python(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _to_python(item) for key, item in value.items()}
+    return value
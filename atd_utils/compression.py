@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import io
+import os
+import threading
+from os.path import join
+from typing import BinaryIO, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# Codecs cache files can be compressed with. Files keep their .json names
+# whatever the codec, and readers tell it from the file's first bytes, so
+# a cache can mix compressed and uncompressed partitions.
+COMPRESSIONS = ["gzip", "zstd"]
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def check_compression(compression: Optional[str]) -> None:
+    """
+    Raises:
+        ValueError: If compression isn't None or one of COMPRESSIONS, or is
+            "zstd" and the zstandard package isn't installed.
+    """
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(
+            f"compression must be None or one of {COMPRESSIONS}, not "
+            f"{compression!r}."
+        )
+    if compression == "zstd" and zstandard is None:
+        raise ValueError(
+            "zstd compression needs the zstandard package installed."
+        )  # noqa
+
+
+def checksum(data: bytes) -> str:
+    """The SHA-256 hex digest cache files are checked against."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_checksum(path: str) -> str:
+    """checksum of a file's bytes as stored, i.e. still compressed."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress the contents of a cache file, whatever its codec."""
+    if data.startswith(_GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(_ZSTD_MAGIC):
+        _require_zstandard()
+        # decompressobj handles frames that don't record their size, as
+        # written by AtomicWriter.
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data
+
+
+def read_bytes(path: str) -> bytes:
+    """Read a cache file, decompressing it if needed."""
+    with open(path, "rb") as f:
+        return decompress(f.read())
+
+
+def open_file(path: str) -> BinaryIO:
+    """
+    Open a cache file for reading as a binary stream of its decompressed
+    contents.
+    """
+    raw = open(path, "rb")
+    magic = raw.peek(len(_ZSTD_MAGIC))[: len(_ZSTD_MAGIC)]
+    if magic.startswith(_GZIP_MAGIC):
+        raw.close()
+        return gzip.open(path, "rb")
+    if magic.startswith(_ZSTD_MAGIC):
+        try:
+            _require_zstandard()
+        except ValueError:
+            raw.close()
+            raise
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.BufferedReader(reader)
+    return raw
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ValueError(
+            "The file is zstd compressed, which needs the zstandard package "
+            "installed."
+        )
+
+
+class _HashingWriter(io.RawIOBase):
+    """Pass writes through to a file, hashing the bytes on the way."""
+
+    def __init__(self, file: BinaryIO) -> None:
+        self._file = file
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+
+class AtomicWriter(object):
+    """
+    Write a file through a temporary file that is fsynced and renamed
+    over `path` only when the block exits cleanly.
+
+    A crash or error part way through leaves the old file, if any, in
+    place and never a truncated one. Use as a context manager; the block
+    gets a binary file object whose writes are compressed with the chosen
+    codec.
+
+    Args:
+        path: The file to write.
+        compression: None, "gzip" or "zstd", see COMPRESSIONS.
+
+    Attributes:
+        checksum: The checksum of the bytes written to disk, set on exit.
+        size: The number of bytes written to disk, set on exit.
+
+    Examples:
+        >>> with AtomicWriter("get_games_2021.json", "gzip") as f:
+        ...     f.write(data)
+    """
+
+    def __init__(self, path: str, compression: Optional[str] = None) -> None:
+        check_compression(compression)
+        self.path = path
+        self.compression = compression
+        self.checksum = None
+        self.size = None
+        # A dot file, so a temporary file left behind by a crash is skipped
+        # like the cache's other dot files instead of loaded as a partition.
+        directory, name = os.path.split(path)
+        self._tmp_path = join(
+            directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )  # noqa
+        self._raw = None
+        self._hashing = None
+        self._file = None
+
+    def __enter__(self) -> BinaryIO:
+        self._raw = open(self._tmp_path, "wb")
+        self._hashing = _HashingWriter(self._raw)
+        if self.compression == "gzip":
+            # mtime=0 keeps the output, and so its checksum, reproducible.
+            self._file = gzip.GzipFile(
+                fileobj=self._hashing,
+                mode="wb",
+                compresslevel=GZIP_LEVEL,
+                mtime=0,
+            )
+        elif self.compression == "zstd":
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+            self._file = compressor.stream_writer(self._hashing, closefd=False)
+        else:
+            self._file = self._hashing
+        return self._file
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if self._file is not self._hashing:
+                self._file.close()
+            self._raw.flush()
+            if exc_type is None:
+                os.fsync(self._raw.fileno())
+        finally:
+            self._raw.close()
+        if exc_type is not None:
+            os.remove(self._tmp_path)
+            return
+        os.replace(self._tmp_path, self.path)
+        _fsync_dir(os.path.dirname(self.path))
+        self.checksum = self._hashing.digest.hexdigest()
+        self.size = self._hashing.size
+
+
+def atomic_write(
+    path: str, data: bytes, compression: Optional[str] = None
+) -> AtomicWriter:  # noqa
+    """
+    Write data to path atomically, see AtomicWriter.
+
+    Returns:
+        The finished AtomicWriter, holding the checksum and size of what
+        was written.
+    """
+    writer = AtomicWriter(path, compression)
+    with writer as f:
+        f.write(data)
+    return writer
+
+
+def _fsync_dir(path: str) -> None:
+    """Persist a rename in `path`, where the platform allows it."""
+    if not hasattr(os, "O_DIRECTORY"):  # pragma: no cover
+        return
+    fd = os.open(path or ".", os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
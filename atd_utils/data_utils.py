@@ -2,13 +2,62 @@
 import os
 from os.path import join
 import json
+import threading
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    as_completed,
+)
+from contextlib import contextmanager
+from itertools import repeat
 import pandas as pd
-import cfbd
-from cfbd.rest import ApiException
-import sqlite3
 from retrying import retry
-from typing import List, Dict, Optional, Union
-from .cfbd_endpoint_configs import ENDPOINTS_DICT
+from typing import (
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from .cfbd_endpoint_configs import (
+    ENDPOINTS_DICT,
+    CALENDAR_PULL_FUNCS,
+    PULL_FUNC_PARAMS,
+    calendar_weeks,
+    map_requests,
+)
+from . import columnar_cache, database
+from .compression import (
+    atomic_write,
+    check_compression,
+    checksum,
+    decompress,
+    file_checksum,
+)
+from .frame_cache import FrameCache, file_signature, MAX_BYTES
+from .instrumentation import Instrumentation
+from .response_cache import ResponseCache, RESPONSE_CACHE_DB
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+from .cache import (
+    CacheManifest,
+    KEY_FIELD_TYPES,
+    partition_file_name,
+    pulled_after_season,
+)
+from .serializers import (
+    get_serializer,
+    read_json,
+    iter_records,
+    JsonArrayWriter,
+)
+from .rate_limit import TokenBucket, parse_retry_after, REQUESTS_PER_SECOND
 
 dir_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 
@@ -16,20 +65,88 @@ dir_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
 # Define the maximum number of retries and the backoff interval between retries
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 2
+# Maximum number of API requests in flight at once per client, shared by
+# every thread the client pulls on.
+MAX_CONCURRENT_REQUESTS = 8
+# Statuses worth retrying. Status 0 stands for network errors (refused
+# connections, timeouts, SSL errors), which never got a response. Any other
+# 4xx is a problem with the request itself.
+RETRYABLE_STATUSES = {0, 429, 500, 502, 503, 504}
+
+# The cfbd SDK takes a noticeable fraction of a second to import and is only
+# needed to call the API, so it is imported on first use, see _cfbd.
+cfbd = None
+
+
+def _cfbd():
+    """Import the cfbd SDK, once."""
+    global cfbd
+    if cfbd is None:
+        import cfbd as module
+
+        cfbd = module
+    return cfbd
+
+
+class ApiRequestError(Exception):
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status is None or self.status in RETRYABLE_STATUSES
+
+
+def _is_retryable(exception: Exception) -> bool:
+    return isinstance(exception, ApiRequestError) and exception.retryable
 
 
 @retry(
+    retry_on_exception=_is_retryable,
     wait_exponential_multiplier=BACKOFF_FACTOR * 1000,
     stop_max_attempt_number=MAX_RETRIES,
 )
-def get_api_response(api_instance, request_params):
+def get_api_response(
+    api_instance, request_params, rate_limiter: Optional[TokenBucket] = None
+):
+    """
+    Call an API endpoint method, retrying rate limits and server errors.
+
+    Args:
+        api_instance: The bound cfbd endpoint method to call.
+        request_params: Keyword arguments for the endpoint method.
+        rate_limiter: Optional TokenBucket to take a token from before every
+            attempt. It is throttled on 429s and recovers on successes.
+
+    Raises:
+        ApiRequestError: Immediately for non-retryable statuses, or once
+            MAX_RETRIES attempts have failed.
+    """
+    from cfbd.rest import ApiException
+    from urllib3.exceptions import HTTPError
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
     try:
         # Call the API function
         api_response = api_instance(**request_params)
     except ApiException as e:
-        # Raise a custom exception for API errors
-        raise Exception(f"API Error: {e}")
-
+        retry_after = parse_retry_after(e.headers)
+        if e.status == 429 and rate_limiter is not None:
+            rate_limiter.throttle(retry_after)
+        raise ApiRequestError(f"API Error: {e}", e.status, retry_after)
+    except HTTPError as e:
+        # cfbd lets urllib3's connection errors and timeouts through.
+        raise ApiRequestError(f"API Error: {e}", 0)
+    if rate_limiter is not None:
+        rate_limiter.recover()
     return api_response
 
 
@@ -45,6 +162,309 @@ class EndpointLoadingNotImplemented(Exception):
     pass
 
 
+def parse_file_name_fields(file: str, endpoint_config: Dict) -> Dict:
+    """
+    Parse the fields encoded in a cached file's name.
+
+    Args:
+        file: The file name, e.g. "get_games_2021.json".
+        endpoint_config: The endpoint's "load" config. Its
+            "file_name_fields" maps field names to (index, type) pairs
+            into the "_"-split file name. Without it the last part of the
+            name is the year.
+    """
+    file_name_fields_config = endpoint_config.get("file_name_fields", False)
+    file_name_fields = {}
+    if file_name_fields_config:
+        parts = file.split(".")[0].split("_")
+        for key, (value, value_type) in file_name_fields_config.items():
+            file_name_fields[key] = value_type(parts[value])
+    else:
+        file_name_fields["year"] = int(file.split("_")[-1].split(".")[0])  # noqa
+    return file_name_fields
+
+
+def partition_filters(
+    years: Optional[Iterable[int]] = None,  # noqa
+    season_types: Optional[Iterable[str]] = None,  # noqa
+    weeks: Optional[Iterable[int]] = None,
+) -> Dict[str, set]:  # noqa
+    """Collect load_to_df's filter arguments, keyed by the field they match."""
+    filters = {"year": years, "season_type": season_types, "week": weeks}
+    filters = {k: v for k, v in filters.items() if v is not None}
+    return {field: set(values) for field, values in filters.items()}
+
+
+def file_matches(file: str, endpoint_config: Dict, filters: Dict) -> bool:
+    """
+    Whether a cached file may hold rows matching `filters`.
+
+    Only the fields encoded in the file name are checked, so this never
+    rules out a file that has matching rows.
+    """
+    file_name_fields = parse_file_name_fields(file, endpoint_config)
+    return all(
+        file_name_fields[field] in values
+        for field, values in filters.items()
+        if field in file_name_fields
+    )
+
+
+def filter_rows(df: pd.DataFrame, filters: Dict) -> pd.DataFrame:
+    """
+    Keep the rows of df whose columns match every filter.
+
+    Raises:
+        ValueError: If df has rows but no column for one of the filters.
+    """
+    mask = pd.Series(True, index=df.index)
+    for field, values in filters.items():
+        if field not in df.columns:
+            if len(df):
+                raise ValueError(f"Cannot filter on {field!r}, no such column.")  # noqa
+            continue
+        mask &= df[field].isin(values)
+    if mask.all():
+        return df
+    return df[mask].reset_index(drop=True)
+
+
+def _project_records(
+    contents: Iterable[Dict], columns: List[str]
+) -> Iterator[Dict]:  # noqa
+    """
+    Drop the keys of each record that can't end up in any of `columns`.
+
+    json_normalize names nested fields "parent.child", so a key is kept if
+    it is a column or a prefix of one.
+    """
+    keep = set()
+    for column in columns:
+        parts = column.split(".")
+        keep.update(".".join(parts[:ix]) for ix in range(1, len(parts) + 1))
+    for row in contents:
+        yield {key: value for key, value in row.items() if key in keep}
+
+
+def load_file(
+    endpoint_path: str,  # noqa
+    file: str,  # noqa
+    endpoint_config: Dict,  # noqa
+    serializer: Optional[str] = None,  # noqa
+    streaming: bool = False,  # noqa
+    columns: Optional[List[str]] = None,  # noqa
+    metrics: Optional[Instrumentation] = None,
+) -> pd.DataFrame:  # noqa
+    """
+    Parse and normalize one cached endpoint file.
+
+    Args:
+        endpoint_path: The endpoint's cache directory.
+        file: The name of the file within endpoint_path.
+        endpoint_config: The endpoint's "load" config from ENDPOINTS_DICT.
+        serializer: Name of the JSON backend to parse with, see
+            serializers.get_serializer (default: the fastest installed).
+        streaming: Whether to decode the file one record at a time rather
+            than parsing it whole. Endpoints with a pre_pandas_load_process
+            or records_to_df then never hold the raw file and all its
+            parsed records at once.
+        columns: Optional columns to keep. For endpoints without a
+            record_path the other fields are dropped from each record
+            before it is normalized.
+        metrics: Optional Instrumentation to report the file_parse and
+            normalize spans to.
+
+    Returns:
+        The file's records as a DataFrame, with the fields encoded in the
+        file name (e.g. year) added as columns.
+    """
+    metrics = metrics or Instrumentation()
+    endpoint_name = os.path.basename(endpoint_path)
+    record_path = endpoint_config.get("record_path", None)
+    meta = endpoint_config.get("meta", None)
+    path = join(endpoint_path, file)
+    if streaming:
+        contents = iter_records(path, serializer)
+    else:
+        with metrics.span("file_parse", endpoint=endpoint_name):
+            contents = read_json(path, serializer)
+    with metrics.span("normalize", endpoint=endpoint_name):
+        contents_df = _normalize(
+            file, contents, endpoint_config, columns, record_path, meta
+        )  # noqa
+    if columns is not None:
+        contents_df = contents_df[
+            [column for column in columns if column in contents_df.columns]
+        ]
+    return contents_df
+
+
+def _normalize(
+    file: str,  # noqa
+    contents: Iterable[Dict],  # noqa
+    endpoint_config: Dict,  # noqa
+    columns: Optional[List[str]],  # noqa
+    record_path: Optional[Union[str, List[str]]],  # noqa
+    meta: Optional[List],
+) -> pd.DataFrame:  # noqa
+    """Turn a file's parsed records into a DataFrame, see load_file."""
+    fields_to_stringify = endpoint_config.get("stringify_lists", False)
+    if fields_to_stringify:
+        contents = _stringify_fields(contents, fields_to_stringify)
+
+    file_name_fields = parse_file_name_fields(file, endpoint_config)
+
+    pre_pandas_load_process = endpoint_config.get("pre_pandas_load_process")
+    if pre_pandas_load_process:
+        contents = pre_pandas_load_process(contents)
+
+    records_to_df = endpoint_config.get("records_to_df", False)
+    if records_to_df:
+        contents_df = records_to_df(contents)
+    else:
+        if columns is not None and record_path is None:
+            contents = _project_records(contents, columns)
+        if not isinstance(contents, list):
+            contents = list(contents)
+        contents_df = pd.json_normalize(
+            contents, record_path=record_path, meta=meta  # noqa  # noqa
+        )
+    for key, value in file_name_fields.items():
+        contents_df[key] = value
+    return contents_df
+
+
+def load_partition(
+    endpoint_path: str,  # noqa
+    file: str,  # noqa
+    endpoint_config: Dict,  # noqa
+    serializer: Optional[str] = None,  # noqa
+    streaming: bool = False,  # noqa
+    columnar: bool = False,  # noqa
+    columns: Optional[List[str]] = None,  # noqa
+    metrics: Optional[Instrumentation] = None,
+) -> pd.DataFrame:  # noqa
+    """
+    load_file, refreshing the partition's columnar copy.
+
+    Args:
+        columnar: Whether to write the normalized frame to Parquet for
+            later loads to memory-map. The Parquet copy holds every column,
+            so the file is then normalized whole and projected afterwards.
+
+    See load_file for the other arguments.
+    """
+    if not columnar:
+        return load_file(
+            endpoint_path,
+            file,
+            endpoint_config,
+            serializer,
+            streaming,
+            columns,
+            metrics,
+        )
+    df = load_file(
+        endpoint_path,
+        file,
+        endpoint_config,
+        serializer,
+        streaming,
+        metrics=metrics,
+    )
+    columnar_cache.write_partition(df, endpoint_path, file)
+    if columns is not None:
+        df = df[[column for column in columns if column in df.columns]]
+    return df
+
+
+def _stringify_fields(
+    contents: Iterable[Dict], fields: List[str]
+) -> Iterator[Dict]:  # noqa
+    """JSON-encode the given list fields of each record."""
+    for row in contents:
+        for field in fields:
+            row[field] = json.dumps(row[field])
+        yield row
+
+
+def _load_file_chunk(
+    endpoint_path: str,  # noqa
+    file: str,  # noqa
+    endpoint_config: Dict,  # noqa
+    serializer: Optional[str] = None,  # noqa
+    streaming: bool = False,  # noqa
+    columnar: bool = False,  # noqa
+    columns: Optional[List[str]] = None,
+) -> Union[pd.DataFrame, "pa.Table"]:  # noqa
+    """
+    load_partition for process pool workers.
+
+    Frames of flat columns are sent back to the parent as Arrow tables,
+    which pickle as a few contiguous buffers rather than one Python object
+    per cell. Frames holding lists or dicts are sent as they are, since
+    Arrow would turn their lists into NumPy arrays.
+    """
+    df = load_partition(
+        endpoint_path,
+        file,
+        endpoint_config,
+        serializer,
+        streaming,
+        columnar,
+        columns,
+    )
+    if pa is None:
+        return df
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return df
+    return table
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate partition frames, keeping categorical columns categorical.
+
+    pd.concat falls back to object dtype for a categorical column whose
+    categories differ between frames, so every frame's categories are
+    widened to their union first. Frames without rows, e.g. of empty
+    weekly partitions, are left out, since their all-missing columns would
+    turn ints into floats and reorder the columns.
+
+    Returns:
+        An empty frame when there are no frames, e.g. when no file matched
+        load_to_df's filters, or the first frame when none has rows.
+    """
+    if not frames:
+        return pd.DataFrame()
+    frames = [frame for frame in frames if len(frame)] or frames[:1]
+    for column in frames[0].columns if frames else []:
+        if not all(
+            isinstance(frame[column].dtype, pd.CategoricalDtype)
+            for frame in frames
+            if column in frame.columns
+        ):
+            continue
+        categories = frames[0][column].cat.categories
+        for frame in frames[1:]:
+            if column in frame.columns:
+                categories = categories.union(frame[column].cat.categories)
+        for frame in frames:
+            if column in frame.columns:
+                frame[column] = frame[column].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _chunk_to_df(chunk: Union[pd.DataFrame, "pa.Table"]) -> pd.DataFrame:
+    if isinstance(chunk, pd.DataFrame):
+        return chunk
+    return chunk.to_pandas()
+
+
 class CfbdClient(object):
     def __init__(
         self,  # noqa
@@ -53,29 +473,119 @@ class CfbdClient(object):
         api_key: Optional[str] = None,  # noqa
         db: str = "atd.db",
         scratch_db: str = "scratch.db",
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        pool_size: Optional[int] = None,
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        rate_limiter: Optional[TokenBucket] = None,
+        serializer: Optional[str] = None,
+        columnar: Optional[bool] = None,
+        read_pool_size: int = database.POOL_SIZE,
+        frame_cache_bytes: int = MAX_BYTES,
+        response_cache: Union[bool, ResponseCache] = True,
+        metrics: Optional[Instrumentation] = None,
+        compression: Optional[str] = None,
     ) -> None:  # noqa
-        self.cfbd_configuration = cfbd.Configuration()
         if api_key:
-            self.cfbd_configuration.api_key["Authorization"] = api_key
+            self._api_key = api_key
         elif "CFBD_API_KEY" in os.environ:
-            key = os.environ["CFBD_API_KEY"]
-            self.cfbd_configuration.api_key["Authorization"] = key
+            self._api_key = os.environ["CFBD_API_KEY"]
         else:
             raise APIKeyError(
                 """API key not provided and CFBD_API_KEY environment variable
                 not set."""
             )
 
-        self.cfbd_configuration.api_key_prefix["Authorization"] = "Bearer"
+        self._request_slots = threading.BoundedSemaphore(
+            max_concurrent_requests
+        )  # noqa
+        # Pass the same rate_limiter to several clients to have them share
+        # one quota.
+        self.rate_limiter = rate_limiter or TokenBucket(requests_per_second)
+        # One long-lived ApiClient (and so one urllib3 pool) is shared by
+        # every request so connections are kept alive between calls.
+        self._connection_pool_maxsize = pool_size or max_concurrent_requests
+        self._cfbd_configuration = None
+        self._configuration_lock = threading.Lock()
+        self._api_client = None
+        self._api_instances = {}
+        self._api_lock = threading.Lock()
 
         self.data_dir = data_dir
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
-        self.conn = sqlite3.connect(join(data_dir, db))
+        # Both databases run in WAL mode with the tuning in
+        # database.PRAGMAS. query() reads atd.db on its own pooled
+        # connections, so readers on other threads don't block writes
+        # through self.conn.
+        self.conn = database.connect(join(data_dir, db))
+        self.read_pool = database.ConnectionPool(
+            join(data_dir, db), read_pool_size
+        )  # noqa
         self.scratch_dir = scratch_dir
         if not os.path.exists(scratch_dir):
             os.makedirs(scratch_dir)
-        self.scratch_conn = sqlite3.connect(join(scratch_dir, scratch_db))
+        self.scratch_conn = database.connect(join(scratch_dir, scratch_db))
+        self.manifest = CacheManifest(data_dir)
+        # JSON backend for the cache files: orjson, msgspec or json.
+        self.serializer = get_serializer(serializer)
+        # Codec new cache files are compressed with: None, "gzip" or
+        # "zstd". Files are read whatever codec they were written with.
+        check_compression(compression)
+        self.compression = compression
+        # Keep a Parquet copy of every normalized partition for load_to_df
+        # to memory-map. On by default when pyarrow is installed.
+        if columnar is None:
+            columnar = columnar_cache.available()
+        elif columnar and not columnar_cache.available():
+            raise ValueError(
+                "columnar=True needs pyarrow "
+                f"{'.'.join(map(str, columnar_cache.MIN_PYARROW_VERSION))} "
+                "or later installed."
+            )
+        self.columnar = columnar
+        # Frames load_to_df returned, reused until their files change.
+        # Set frame_cache_bytes=0 to turn it off.
+        self.frame_cache = FrameCache(frame_cache_bytes)
+        # hit_endpoint reuses responses stored in data_dir/responses.db
+        # for the TTLs set in the pull configs. Pass response_cache=False
+        # to always call the API.
+        if response_cache is True:
+            response_cache = ResponseCache(
+                join(data_dir, RESPONSE_CACHE_DB),
+                ttls={
+                    name: config.get("pull", {})
+                    for name, config in ENDPOINTS_DICT.items()
+                },
+                serializer=self.serializer,
+            )
+        self.response_cache = response_cache or None
+        # Weeks of each season type per year, from get_calendar.
+        self._season_weeks = {}
+        # Timing spans and counters of pulls and loads, see
+        # instrumentation. Pass a MetricsCollector to keep them.
+        self.metrics = metrics or Instrumentation()
+        # The endpoint each thread is calling, for the spans of the
+        # ApiClient's deserialize.
+        self._calls = threading.local()
+
+    @property
+    def cfbd_configuration(self):
+        """
+        The cfbd.Configuration requests are made with.
+
+        Built on first use, so clients that only load cached data never
+        import the cfbd SDK.
+        """
+        with self._configuration_lock:
+            if self._cfbd_configuration is None:
+                configuration = _cfbd().Configuration()
+                configuration.api_key["Authorization"] = self._api_key
+                configuration.api_key_prefix["Authorization"] = "Bearer"
+                configuration.connection_pool_maxsize = (
+                    self._connection_pool_maxsize
+                )  # noqa
+                self._cfbd_configuration = configuration
+        return self._cfbd_configuration
 
     def is_table(self, table_name):
         """This method seems to be working now"""
@@ -91,21 +601,237 @@ class CfbdClient(object):
         else:
             return True
 
-    def save_data(self, sub_dir: str, filename: str, data: str) -> None:
+    def query(
+        self,  # noqa
+        sql: str,  # noqa
+        params: Optional[Union[Sequence, Dict]] = None,  # noqa
+        arrow: bool = False,
+    ) -> Union[pd.DataFrame, "pa.Table"]:  # noqa
+        """
+        Run a read-only query against atd.db.
+
+        Safe to call from any number of threads at once, including while
+        a pull or load_to_df is writing: each call borrows a connection
+        from the client's read pool and sees the last committed data.
+
+        Args:
+            sql: The query, with ? or :name placeholders.
+            params: Values for the placeholders.
+            arrow: Whether to return a pyarrow Table instead of a
+                DataFrame.
+
+        Raises:
+            ValueError: If arrow is True and pyarrow isn't installed.
+
+        Examples:
+            >>> client.query(
+            ...     "SELECT * FROM get_games WHERE season = ? AND week = ?",
+            ...     (2021, 1),
+            ... )
+        """
+        if arrow and pa is None:
+            raise ValueError("arrow=True needs the pyarrow package installed.")  # noqa
+        with self.read_pool.connection() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        if arrow:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        return df
+
+    def save_data(
+        self, sub_dir: str, filename: str, data: Union[str, bytes]
+    ) -> str:  # noqa
         """
         Save data to a file within a subdirectory.
 
+        The file is compressed with the client's `compression` codec and
+        written atomically: to a temporary file that is fsynced and then
+        renamed over the old one, so a crash never leaves a truncated
+        file behind.
+
         Args:
             sub_dir (str): The subdirectory to append to self.data_dir to save
                             the data in.
             filename (str): The name of the file to save the data to.
-            data (str): The data to save.
+            data (str or bytes): The data to save. Bytes, as returned by
+                            self.serializer.dumps, are written as they are.
+                            Strings are encoded as UTF-8.
+
+        Returns:
+            str: The checksum of the file as written, see
+                compression.checksum.
         """
         path = join(self.data_dir, sub_dir)
+        os.makedirs(path, exist_ok=True)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        with self.metrics.span("save", endpoint=sub_dir):
+            writer = atomic_write(join(path, filename), data, self.compression)  # noqa
+        self.metrics.count("bytes_written", writer.size, endpoint=sub_dir)
+        return writer.checksum
+
+    def read_cached_partition(
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        year: int,  # noqa
+        season_type: Optional[str] = None,  # noqa
+        week: Optional[int] = None,
+    ) -> Optional[List[Dict]]:  # noqa
+        """
+        Return the cached records of a partition that doesn't need pulling.
+
+        Returns:
+            The records saved for the partition if it was pulled after its
+            season ended and the file still matches the checksum recorded
+            when it was saved, otherwise None.
+        """
+        file_name = partition_file_name(endpoint_name, year, season_type, week)
+        path = join(self.data_dir, endpoint_name, file_name)
         if not os.path.exists(path):
-            os.makedirs(path)
-        with open(f"{path}/{filename}", "w") as f:
-            f.write(data)
+            return None
+        if not self.manifest.is_complete(endpoint_name, file_name, year):
+            return None
+        with open(path, "rb") as f:
+            data = f.read()
+        expected = self.manifest.get(endpoint_name, file_name).get("checksum")
+        if expected is not None and checksum(data) != expected:
+            return None
+        return self.serializer.loads(decompress(data))
+
+    def verify_cache(self, endpoint_name: str) -> List[str]:
+        """
+        Check an endpoint's cached files against the checksums recorded
+        when they were saved.
+
+        Returns:
+            The names of the files that no longer match. Files saved
+            before checksums were recorded aren't checked.
+        """
+        entries = self.manifest.entries(endpoint_name)
+        endpoint_path = join(self.data_dir, endpoint_name)
+        corrupt = []
+        for file_name, entry in sorted(entries.items()):
+            path = join(endpoint_path, file_name)
+            expected = entry.get("checksum")
+            if expected is None or not os.path.exists(path):
+                continue
+            if file_checksum(path) != expected:
+                corrupt.append(file_name)
+        return corrupt
+
+    def sync_manifest(self, endpoint_name: str) -> None:
+        """
+        Index an endpoint's cache files the manifest doesn't know about,
+        e.g. ones copied in by hand, and forget deleted ones. See
+        CacheManifest.sync.
+        """
+        endpoint_config = ENDPOINTS_DICT.get(endpoint_name, {})
+        if "load" in endpoint_config:
+            name_config = endpoint_config["load"]
+        else:
+            # Pull-only endpoints are named by partition_file_name.
+            fields = ["year"] + (
+                endpoint_config.get("pull", {}).get("partition_fields") or []
+            )  # noqa
+            name_config = {}
+            if len(fields) > 1:
+                name_config["file_name_fields"] = {
+                    field: (ix - len(fields), KEY_FIELD_TYPES[field])
+                    for ix, field in enumerate(fields)
+                }
+        self.manifest.sync(
+            endpoint_name,
+            lambda file: parse_file_name_fields(file, name_config),
+        )
+
+    def save_partition(
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        results: List[Dict],  # noqa
+        year: int,  # noqa
+        season_type: Optional[str] = None,  # noqa
+        week: Optional[int] = None,
+    ) -> None:  # noqa
+        """Save one partition's records and record the pull in the manifest."""
+        file_name = partition_file_name(endpoint_name, year, season_type, week)
+        data = self.serializer.dumps(results)
+        digest = self.save_data(endpoint_name, file_name, data)
+        self.manifest.record(
+            endpoint_name,
+            file_name,
+            len(results),
+            digest,
+            fields={"year": year, "season_type": season_type, "week": week},
+        )
+
+    @contextmanager
+    def partition_writer(
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        year: int,  # noqa
+        season_type: Optional[str] = None,  # noqa
+        week: Optional[int] = None,
+    ) -> Iterator[JsonArrayWriter]:  # noqa
+        """
+        Stream one partition's records to its cache file in batches.
+
+        The file is only replaced, and the pull recorded in the manifest,
+        once the block exits without an error.
+        """
+        file_name = partition_file_name(endpoint_name, year, season_type, week)
+        path = join(self.data_dir, endpoint_name)
+        os.makedirs(path, exist_ok=True)
+        writer = JsonArrayWriter(
+            join(path, file_name), self.serializer.name, self.compression
+        )  # noqa
+        with writer:
+            yield writer
+        self.manifest.record(
+            endpoint_name,
+            file_name,
+            writer.count,
+            writer.checksum,
+            writer.size,
+            {"year": year, "season_type": season_type, "week": week},
+        )
+        self.metrics.count("bytes_written", writer.size, endpoint=endpoint_name)  # noqa
+
+    def get_api_instance(self, api_name: str):
+        """
+        Return the cfbd API instance for api_name, creating it on first use.
+
+        Every API instance shares the client's single pooled cfbd.ApiClient.
+
+        Args:
+            api_name (str): The name of the cfbd API class, e.g. "GamesApi".
+        """
+        with self._api_lock:
+            api_instance = self._api_instances.get(api_name)
+            if api_instance is None:
+                sdk = _cfbd()
+                if self._api_client is None:
+                    self._api_client = sdk.ApiClient(self.cfbd_configuration)
+                    self._api_client.deserialize = self._instrumented(
+                        self._api_client.deserialize
+                    )  # noqa
+                api_instance = getattr(sdk, api_name)(self._api_client)
+                self._api_instances[api_name] = api_instance
+        return api_instance
+
+    def _instrumented(self, deserialize):
+        """
+        Wrap ApiClient.deserialize to report response sizes and the
+        response_parse span of the endpoint being called.
+        """
+
+        def instrumented_deserialize(response, response_type):
+            endpoint_name = getattr(self._calls, "endpoint", None)
+            self.metrics.count(
+                "bytes_received", len(response.data), endpoint=endpoint_name
+            )  # noqa
+            with self.metrics.span("response_parse", endpoint=endpoint_name):
+                return deserialize(response, response_type)
+
+        return instrumented_deserialize
 
     def hit_endpoint(
         self,  # noqa
@@ -113,13 +839,64 @@ class CfbdClient(object):
         endpoint_name: str,  # noqa
         request_params: Dict,
     ) -> List[Dict]:  # noqa
-        api = getattr(cfbd, api_name)
-        api_instance = api(cfbd.ApiClient(self.cfbd_configuration))
+        """
+        Call an endpoint, or return its cached response, see
+        response_cache.ResponseCache.
+        """
+        if self.response_cache is not None:
+            cached = self.response_cache.get(
+                api_name, endpoint_name, request_params
+            )  # noqa
+            if cached is not None:
+                self.metrics.count(
+                    "response_cache_hits", endpoint=endpoint_name
+                )  # noqa
+                self.metrics.count(
+                    "records", len(cached), endpoint=endpoint_name
+                )  # noqa
+                return cached
+        api_instance = self.get_api_instance(api_name)
         endpoint_method = getattr(api_instance, endpoint_name)
-        api_response = get_api_response(endpoint_method, request_params)
+        attempts = 0
+
+        def call_endpoint(**params):
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self.metrics.count("retries", endpoint=endpoint_name)
+            self._calls.endpoint = endpoint_name
+            with self._request_slots:
+                with self.metrics.span("request", endpoint=endpoint_name):
+                    return endpoint_method(**params)
+
+        self.metrics.count("requests", endpoint=endpoint_name)
+        api_response = get_api_response(
+            call_endpoint, request_params, self.rate_limiter
+        )  # noqa
         results = [x.to_dict() for x in api_response]
+        self.metrics.count("records", len(results), endpoint=endpoint_name)
+        if self.response_cache is not None:
+            self.response_cache.put(
+                api_name, endpoint_name, request_params, results
+            )  # noqa
         return results
 
+    def season_weeks(self, year: int) -> Optional[Dict[str, List[int]]]:
+        """
+        Return the weeks of each season type in `year`, from get_calendar.
+
+        Returns:
+            E.g. {"regular": [0, 1, ..., 14], "postseason": [1]}, or None if
+            the calendar has no weeks for the year, in which case weekly
+            pulls fall back to weeks 1-16 of both season types.
+        """
+        if year not in self._season_weeks:
+            calendar = self.hit_endpoint(
+                "GamesApi", "get_calendar", {"year": year}
+            )  # noqa
+            self._season_weeks[year] = calendar_weeks(calendar) or None
+        return self._season_weeks[year]
+
     def pull_data(
         self,  # :noqa
         years: Union[List[int], range, int],  # noqa
@@ -128,6 +905,8 @@ class CfbdClient(object):
         save: bool = True,  # noqa
         force: bool = False,
         iter_teams: bool = False,
+        max_workers: Optional[int] = None,
+        incremental: bool = False,
     ) -> List[Dict]:  # noqa
         """
         Pulls data from an API endpoint for the given years, and returns a
@@ -146,29 +925,264 @@ class CfbdClient(object):
                 unimplemented endpoints. Setting this to True will
                 automatically overwrite your choice of save with False.
                 (default: False).
+            max_workers: Optional number of years to pull concurrently. All
+                years share the client's max_concurrent_requests limit
+                (default: None, i.e. one year at a time).
+            incremental: Optional boolean flag to reuse cached partitions of
+                seasons that finished before they were pulled, see pull_year
+                (default: False).
 
         Returns:
-            A list of dictionaries representing the data pulled from the API.
+            A list of dictionaries representing the data pulled from the API,
+            ordered from the most recent year to the oldest.
         """
+        pull_kwargs = {}
+        if incremental:
+            pull_kwargs["incremental"] = True
         if isinstance(years, int):
             results = self.pull_year(
-                years, endpoint_name, request_params, save, force
+                years,
+                endpoint_name,
+                request_params,
+                save,
+                force,
+                **pull_kwargs,
             )  # noqa
             print(f"Pulled {len(results)} records from {endpoint_name}.")
-        else:
-            results = []
-            for ix, year in enumerate(range(max(years), min(years) - 1, -1)):
-                if ix % 5 == 0:
-                    print(
-                        f"""Pulling {year}.\n\tPulled {len(results)} records
-                    from {endpoint_name}."""
-                    )
-                year_results = self.pull_year(
-                    year, endpoint_name, request_params, save, force, iter_teams  # noqa
+            return results
+
+        endpoint_config = ENDPOINTS_DICT.get(endpoint_name, {}).get("pull", {})
+        if iter_teams or endpoint_config.get("iter_teams"):
+            # Load the teams once, on this thread: client.conn can't be used
+            # from the worker threads of a parallel pull.
+            pull_kwargs["teams"] = self.load_to_df("get_fbs_teams")
+
+        year_range = list(range(max(years), min(years) - 1, -1))
+        year_results = {}
+
+        def report(year: int) -> None:
+            print(
+                f"Pulled {year} ({len(year_results)}/{len(year_range)}):"
+                f" {len(year_results[year])} records from {endpoint_name}."
+            )
+
+        if not max_workers or max_workers <= 1:
+            for year in year_range:
+                year_results[year] = self.pull_year(
+                    year,
+                    endpoint_name,
+                    request_params,
+                    save,
+                    force,
+                    iter_teams,
+                    **pull_kwargs,
                 )  # noqa
-                results += year_results
+                report(year)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                futures = {
+                    executor.submit(
+                        self.pull_year,
+                        year,
+                        endpoint_name,
+                        request_params,
+                        save,
+                        force,
+                        iter_teams,
+                        **pull_kwargs,
+                    ): year
+                    for year in year_range
+                }
+                for future in as_completed(futures):
+                    year = futures[future]
+                    year_results[year] = future.result()
+                    report(year)
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+        results = []
+        for year in year_range:
+            results += year_results[year]
         return results
 
+    def iter_pull(
+        self,  # noqa
+        years: Union[List[int], range, int],  # noqa
+        endpoint_name: str,  # noqa
+        request_params: Dict = None,  # noqa
+        save: bool = True,  # noqa
+        max_workers: Optional[int] = None,  # noqa
+        incremental: bool = False,
+    ) -> Iterator[Tuple[Dict, List[Dict]]]:  # noqa
+        """
+        Pull years of an endpoint, yielding each request's records as they
+        arrive instead of returning them all at once.
+
+        Takes the same arguments as pull_data and writes the same files,
+        but only holds a bounded number of batches: weekly partitions are
+        saved as each request finishes, per-year files are streamed to
+        disk batch by batch, and at most 2 * max_workers requests run ahead
+        of the batch being consumed. Memory use doesn't grow with the
+        number of years.
+
+        Yields:
+            (request_params, records) for every request, from the most
+            recent year to the oldest. Cached partitions reused by an
+            incremental pull are yielded the same way.
+
+        Raises:
+            EndpointNotValid: For endpoints without a pull config, or ones
+                that iterate over teams.
+
+        Examples:
+            >>> for params, records in client.iter_pull(
+            ...     range(2004, 2023), "get_player_game_stats"
+            ... ):
+            ...     print(params["year"], params["week"], len(records))
+        """
+        if isinstance(years, int):
+            years = [years]
+        for year in range(max(years), min(years) - 1, -1):
+            yield from self._iter_pull_year(
+                year,
+                endpoint_name,
+                request_params,
+                save,
+                max_workers,
+                incremental,
+            )
+
+    def _iter_pull_year(
+        self,  # noqa
+        year: int,  # noqa
+        endpoint_name: str,  # noqa
+        request_params: Optional[Dict],  # noqa
+        save: bool,  # noqa
+        max_workers: Optional[int],  # noqa
+        incremental: bool,
+    ) -> Iterator[Tuple[Dict, List[Dict]]]:  # noqa
+        try:
+            endpoint_config = ENDPOINTS_DICT[endpoint_name]["pull"]
+        except KeyError:
+            raise EndpointNotValid(
+                f"{endpoint_name} has no pull config, so it can't be streamed."
+            )
+        if endpoint_config.get("iter_teams"):
+            raise EndpointNotValid(
+                f"{endpoint_name} iterates over teams, which iter_pull does "
+                "not support yet. Use pull_data instead."
+            )
+        api_name = endpoint_config["api"]
+        partition_fields = endpoint_config.get("partition_fields")
+        request_params = {**(request_params or {}), "year": year}
+        if incremental and not partition_fields:
+            cached = self.read_cached_partition(endpoint_name, year)
+            if cached is not None:
+                yield request_params, cached
+                return
+        params_list = self._requests(endpoint_config, request_params)
+
+        def pull_partition(params: Dict) -> List[Dict]:
+            key = [params[f] for f in ["year"] + (partition_fields or [])]
+            if partition_fields and incremental:
+                cached = self.read_cached_partition(endpoint_name, *key)
+                if cached is not None:
+                    return cached
+            result = self.hit_endpoint(api_name, endpoint_name, params)
+            if partition_fields and save:
+                self.save_partition(endpoint_name, result, *key)
+            return result
+
+        batches = zip(
+            params_list,
+            map_requests(pull_partition, params_list, max_workers or 1),
+        )
+        if not save or partition_fields:
+            yield from batches
+            return
+        with self.partition_writer(endpoint_name, year) as writer:
+            for params, batch in batches:
+                writer.write(batch)
+                yield params, batch
+
+    def _requests(
+        self, endpoint_config: Dict, request_params: Dict
+    ) -> List[Dict]:  # noqa
+        """The params of every request a pull config makes for one year."""
+        func = endpoint_config.get("pull_func")
+        if func is None:
+            return [request_params]
+        if func in CALENDAR_PULL_FUNCS:
+            return PULL_FUNC_PARAMS[func](
+                request_params, self.season_weeks(request_params["year"])
+            )
+        if func in PULL_FUNC_PARAMS:
+            return PULL_FUNC_PARAMS[func](request_params)
+        raise EndpointNotValid(
+            f"{func.__name__} has no PULL_FUNC_PARAMS entry, so its "
+            "requests can't be planned."
+        )
+
+    def missing_partitions(
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        years: Union[List[int], range, int],  # noqa
+        complete: bool = True,
+    ) -> List[Dict]:  # noqa
+        """
+        List the partitions of an endpoint missing from the cache.
+
+        Answered from the manifest, without opening the cache files or,
+        unless they changed, listing them. Endpoints pulled week by week
+        expect the weeks of the season's calendar, which is requested
+        through the response cache like any pull.
+
+        Args:
+            years: A single year, or years to check.
+            complete: Whether partitions pulled while their season was
+                still being played count as missing too, as they do for
+                incremental pulls (default: True).
+
+        Returns:
+            The key of each missing partition, e.g. {"year": 2023,
+            "season_type": "regular", "week": 5}, from the most recent year
+            to the oldest.
+
+        Raises:
+            EndpointNotValid: For endpoints without a pull config.
+
+        Examples:
+            >>> client.missing_partitions("get_player_game_stats", range(2004, 2024))
+        """  # noqa
+        try:
+            endpoint_config = ENDPOINTS_DICT[endpoint_name]["pull"]
+        except KeyError:
+            raise EndpointNotValid(f"{endpoint_name} has no pull config.")
+        if isinstance(years, int):
+            years = [years]
+        key_fields = ["year"] + (endpoint_config.get("partition_fields") or [])  # noqa
+        if os.path.isdir(join(self.data_dir, endpoint_name)):
+            self.sync_manifest(endpoint_name)
+        entries = self.manifest.entries(endpoint_name)
+        missing = []
+        for year in sorted(set(years), reverse=True):
+            params_list = [{"year": year}]
+            if key_fields != ["year"]:
+                params_list = self._requests(endpoint_config, {"year": year})
+            for params in params_list:
+                key = {field: params[field] for field in key_fields}
+                file_name = partition_file_name(endpoint_name, **key)
+                # Files cached before the manifest existed aren't in entries.
+                entry = entries.get(file_name) or self.manifest.get(
+                    endpoint_name, file_name
+                )  # noqa
+                if entry is None or (
+                    complete and not pulled_after_season(entry, year)
+                ):  # noqa
+                    missing.append(key)
+        return missing
+
     def pull_year(
         self,  # :noqa
         year: int,  # noqa
@@ -177,6 +1191,9 @@ class CfbdClient(object):
         save: bool = True,  # noqa
         force: bool = False,  # noqa
         iter_teams: bool = False,
+        max_workers: Optional[int] = None,
+        incremental: bool = False,
+        teams: Optional[pd.DataFrame] = None,
     ) -> List[Dict]:  # noqa
         """
         Retrieve data from a specified College Football Data API endpoint for
@@ -187,6 +1204,22 @@ class CfbdClient(object):
             endpoint_name (str): The name of the endpoint method to call on
                                 the API instance. This should match one of
                                 the keys in ENDPOINTS_DICT.
+            max_workers (int): Optional number of requests the endpoint's
+                                pull_func may have in flight at once, e.g.
+                                the week/season_type fan-out of
+                                pull_over_season_types_and_weeks. Results
+                                keep their serial order (default: None,
+                                i.e. serial).
+            incremental (bool): If True, reuse the cached files of seasons
+                                that had already ended when they were
+                                pulled instead of calling the API. Endpoints
+                                with "partition_fields" are checked week by
+                                week, so only missing or partial weeks and
+                                the current season are pulled again
+                                (default: False).
+            teams (DataFrame): Optional get_fbs_teams frame to iterate over
+                                when iter_teams is set, instead of loading
+                                it (default: None).
 
         Returns:
             list: A list of dictionaries containing the fetched data for the
@@ -211,30 +1244,129 @@ class CfbdClient(object):
                 or has not been setup yet."""
                 raise EndpointNotValid(msg)
         func = endpoint_config.setdefault("pull_func", None)
-        if not request_params:
-            request_params = {"year": year}
-        else:
-            request_params["year"] = year
+        partition_fields = endpoint_config.get("partition_fields")
+        if incremental and not partition_fields:
+            cached = self.read_cached_partition(endpoint_name, year)
+            if cached is not None:
+                return cached
+        request_params = {**(request_params or {}), "year": year}
 
         args = [api_name, endpoint_name, request_params]
         if iter_teams:
-            args.append(self.load_to_df("get_fbs_teams"))
+            if teams is None:
+                teams = self.load_to_df("get_fbs_teams")
+            args.append(teams)
         if func:
             args = [self.hit_endpoint] + args
-            results = func(*args)  # noqa
+            kwargs = {}
+            if max_workers:
+                kwargs["max_workers"] = max_workers
+            if func in CALENDAR_PULL_FUNCS:
+                weeks = self.season_weeks(year)
+                if weeks:
+                    kwargs["weeks"] = weeks
+            if partition_fields:
+
+                def partition_key(params: Dict) -> List:
+                    return [params[f] for f in ["year"] + partition_fields]
+
+                def read_cache(params: Dict) -> Optional[List[Dict]]:
+                    return self.read_cached_partition(
+                        endpoint_name, *partition_key(params)
+                    )  # noqa
+
+                def write_cache(params: Dict, result: List[Dict]) -> None:
+                    self.save_partition(
+                        endpoint_name, result, *partition_key(params)
+                    )  # noqa
+
+                if incremental:
+                    kwargs["read_cache"] = read_cache
+                if save:
+                    kwargs["write_cache"] = write_cache
+            results = func(*args, **kwargs)  # noqa
         else:
             results = self.hit_endpoint(*args)  # noqa
-        if save:
-            self.save_data(
-                endpoint_name,  # noqa
-                f"{endpoint_name}_{year}.json",  # noqa
-                json.dumps(results),
-            )
+        if save and not partition_fields:
+            self.save_partition(endpoint_name, results, year)
         return results
 
     def load_to_df(
-        self, endpoint_name: str, save_to_db: bool = False  # noqa
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        save_to_db: bool = False,  # noqa
+        max_workers: Optional[int] = None,  # noqa
+        streaming: bool = False,  # noqa
+        years: Optional[Iterable[int]] = None,  # noqa
+        weeks: Optional[Iterable[int]] = None,  # noqa
+        season_types: Optional[Iterable[str]] = None,  # noqa
+        columns: Optional[List[str]] = None,  # noqa
+        write_mode: str = "replace",
     ) -> pd.DataFrame:  # noqa
+        """
+        Load every cached file of an endpoint into one DataFrame.
+
+        Partitions with an up to date Parquet copy (see the client's
+        `columnar` option) are memory-mapped instead of parsed from JSON.
+        Compressed files (see the client's `compression` option) are
+        decompressed as they are read.
+
+        Args:
+            endpoint_name: The endpoint to load. Must have a "load" config in
+                ENDPOINTS_DICT.
+            save_to_db: Whether to write the endpoint's table in atd.db.
+                The table is always written if it doesn't exist yet.
+            max_workers: Optional number of processes to parse and normalize
+                the files on. Useful for endpoints with hundreds of files
+                such as get_player_game_stats (default: None, i.e. parse
+                the files serially in this process).
+            streaming: Whether to decode each file record by record instead
+                of parsing it whole, see load_file (default: False).
+            years: Optional years to load.
+            weeks: Optional weeks to load.
+            season_types: Optional season types to load, e.g. ["regular"].
+            columns: Optional columns to return. For endpoints without a
+                df_load_process only these columns are read from Parquet or
+                normalized from JSON.
+            write_mode: How to write the table (default: "replace"):
+                "replace" rewrites it with DataFrame.to_sql. Filtered
+                loads can't be saved this way.
+                "upsert" writes only the rows of cached files that are new
+                or changed since they were last written, replacing rows
+                with the same key_columns, in one transaction.
+                "append" writes only files that were never written.
+                Loads filtered by years, weeks or season_types can be
+                upserted or appended as long as every file they load is
+                loaded whole, i.e. the filters only skip files and columns
+                is None. Either way the load config's index_columns are
+                indexed.
+
+        The files to load are looked up in the client's manifest, which
+        indexes the year, week and season type in each file's name, so
+        files that rule out the years, weeks and season types asked for
+        (e.g. get_games_2019.json for years=[2021]) are never opened. The
+        endpoint's directory is only listed again when it changed, to pick
+        up files that weren't saved by a pull. Filters on fields the file
+        names don't hold are applied to the rows, before df_load_process.
+
+        Raises:
+            ValueError: If save_to_db is set for a load that can't be written:
+                one narrowed by columns or by filters on fields the file
+                names don't hold, or a filtered load in "replace" mode.
+
+        Examples:
+            >>> client.load_to_df(
+            ...     "get_player_game_stats",
+            ...     years=[2023],
+            ...     weeks=[1, 2],
+            ...     columns=["game_id", "athlete_id", "stat"],
+            ... )
+        """
+        if write_mode not in database.WRITE_MODES:
+            raise ValueError(
+                f"write_mode must be one of {database.WRITE_MODES}, not "
+                f"{write_mode!r}."
+            )
         try:
             endpoint_config = ENDPOINTS_DICT[endpoint_name]["load"]
         except KeyError:
@@ -244,61 +1376,218 @@ class CfbdClient(object):
                 json_normalize needs record_path and/or meta.
                 """
             )
-        record_path = endpoint_config.get("record_path", None)
-        meta = endpoint_config.get("meta", None)
         endpoint_path = join(self.data_dir, endpoint_name)
-        dir_list = os.listdir(endpoint_path)
-        df = None
-        for file in dir_list:
-            if file[0] == ".":
-                continue
-            with open(join(endpoint_path, file), "r") as f:
-                contents = json.loads(f.read())
-            fields_to_stringify = endpoint_config.setdefault(
-                "stringify_lists", False
-            )  # noqa
-            if fields_to_stringify:
-                for ix, row in enumerate(contents):
-                    for field in fields_to_stringify:
-                        contents[ix][field] = json.dumps(row[field])
-
-            file_name_fields_config = endpoint_config.setdefault(
-                "file_name_fields", False
+        filters = partition_filters(years, season_types, weeks)
+        # Filters the file names can't answer are applied to the rows.
+        file_name_fields = list(
+            endpoint_config.get("file_name_fields", ["year"])
+        )  # noqa
+        self.sync_manifest(endpoint_name)
+        partitions = self.manifest.partitions(
+            endpoint_name, file_name_fields, filters
+        )  # noqa
+        files = list(partitions)
+        row_filters = {
+            field: values
+            for field, values in filters.items()
+            if field not in file_name_fields
+        }
+        # Partial partitions can't be written incrementally, and nothing
+        # partial can replace the whole table.
+        partial = bool(row_filters) or columns is not None
+        if save_to_db and partial:
+            narrowed = [f"{field} filter" for field in row_filters]
+            if columns is not None:
+                narrowed.append("columns")
+            raise ValueError(
+                "save_to_db=True can't write a load narrowed by "
+                f"{' and '.join(narrowed)}, which loads only part of each "
+                "file. Load without them to write the table."
             )
-            file_name_fields = {}
-            if file_name_fields_config:
-                for key, (value, value_type) in file_name_fields_config.items():  # noqa
-                    file_name_fields[key] = value_type(
-                        file.split(".")[0].split("_")[value]
-                    )
-            else:
-                file_name_fields["year"] = int(
-                    file.split("_")[-1].split(".")[0]
-                )  # noqa
-
-            pre_pandas_load_process = endpoint_config.setdefault(
-                "pre_pandas_load_process", False
+        if save_to_db and filters and write_mode == "replace":
+            raise ValueError(
+                "save_to_db=True with write_mode='replace' can't write a load "
+                "filtered by years, weeks or season_types, which would "
+                "replace the table with part of it. Use write_mode='upsert' "
+                "or 'append' instead."
             )
-            if pre_pandas_load_process:
-                contents = pre_pandas_load_process(contents)
-
-            contents_df = pd.json_normalize(
-                contents, record_path=record_path, meta=meta  # noqa  # noqa
-            )
-            for key, value in file_name_fields.items():
-                contents_df[key] = value
-            if df is None:
-                df = contents_df.copy()
+        key = (
+            endpoint_name,
+            tuple(sorted((f, tuple(sorted(v))) for f, v in filters.items())),
+            None if columns is None else tuple(columns),
+        )
+        signature = file_signature(endpoint_path, files)
+        with self.metrics.span("load", endpoint=endpoint_name):
+            df = self.frame_cache.get(key, signature)
+            if df is not None:
+                self.metrics.count("frame_cache_hits", endpoint=endpoint_name)
             else:
-                df = pd.concat([df, contents_df])
-
-        df.reset_index(drop=True, inplace=True)
-        if "df_load_process" in endpoint_config.keys():
-            df = endpoint_config["df_load_process"](df)
+                df = self._load_files(
+                    endpoint_path,
+                    files,
+                    endpoint_config,
+                    row_filters,
+                    columns,
+                    max_workers,
+                    streaming,
+                )
+                self.frame_cache.put(key, signature, df)
         if save_to_db or not self.is_table(endpoint_name):
-            df.to_sql(endpoint_name, self.conn, if_exists="replace")
+            self._write_table(
+                endpoint_name,
+                df,
+                endpoint_path,
+                partitions,
+                write_mode,
+                partial=partial,
+                filtered=bool(filters),
+            )
         return df
 
+    def _load_files(
+        self,  # noqa
+        endpoint_path: str,  # noqa
+        files: List[str],  # noqa
+        endpoint_config: Dict,  # noqa
+        row_filters: Dict,  # noqa
+        columns: Optional[List[str]],  # noqa
+        max_workers: Optional[int],  # noqa
+        streaming: bool,
+    ) -> pd.DataFrame:  # noqa
+        """Load, filter and process the files load_to_df selected."""
+        endpoint_name = os.path.basename(endpoint_path)
+        # df_load_process may need columns the caller didn't ask for, so only
+        # project the partitions when there isn't one.
+        df_load_process = endpoint_config.get("df_load_process")
+        read_columns = None
+        if columns is not None and not df_load_process:
+            read_columns = list(columns) + [
+                field for field in row_filters if field not in columns
+            ]
+        partition_args = [
+            endpoint_config,
+            self.serializer.name,
+            streaming,
+            self.columnar,
+            read_columns,
+        ]
+        frames = []
+        if self.columnar:
+            is_fresh = columnar_cache.is_fresh
+            fresh = [file for file in files if is_fresh(endpoint_path, file)]
+            if fresh:
+                with self.metrics.span("columnar_read", endpoint=endpoint_name):  # noqa
+                    frames.append(
+                        columnar_cache.read_partitions(
+                            endpoint_path, fresh, read_columns
+                        )
+                    )
+                fresh = set(fresh)
+                files = [file for file in files if file not in fresh]
+        # Collect every file's frame and concatenate once at the end.
+        # Concatenating inside the loop copies everything loaded so far on
+        # each iteration, which is quadratic in the number of files.
+        if max_workers and max_workers > 1 and len(files) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                chunks = executor.map(
+                    _load_file_chunk,
+                    repeat(endpoint_path),
+                    files,
+                    *[repeat(arg) for arg in partition_args],
+                    chunksize=max(1, len(files) // (4 * max_workers)),
+                )
+                frames += [_chunk_to_df(chunk) for chunk in chunks]
+        else:
+            frames += [
+                load_partition(
+                    endpoint_path, file, *partition_args, self.metrics
+                )  # noqa
+                for file in files
+            ]
+        df = concat_frames(frames)
+        if row_filters:
+            df = filter_rows(df, row_filters)
+        # Load processes expect the endpoint's columns, which a load of no
+        # records doesn't have.
+        if df_load_process and len(df):
+            with self.metrics.span("df_load_process", endpoint=endpoint_name):
+                df = df_load_process(df)
+        if columns is not None:
+            df = df[[column for column in columns if column in df.columns]]
+        return df
+
+    def _write_table(
+        self,  # noqa
+        endpoint_name: str,  # noqa
+        df: pd.DataFrame,  # noqa
+        endpoint_path: str,  # noqa
+        partitions: Dict[str, Dict],  # noqa
+        write_mode: str,  # noqa
+        partial: bool,  # noqa
+        filtered: bool,
+    ) -> None:  # noqa
+        """
+        Write a frame load_to_df loaded to the endpoint's table.
+
+        Args:
+            partitions: The fields of each loaded file's name, keyed by file
+                name, as found in the manifest.
+        """
+        endpoint_config = ENDPOINTS_DICT[endpoint_name]["load"]
+        index_columns = endpoint_config.get("index_columns", [])
+        if write_mode == "replace":
+            if partial or filtered:
+                return
+            with self.metrics.span(
+                "sql_write", table=endpoint_name, mode=write_mode
+            ):  # noqa
+                df.to_sql(endpoint_name, self.conn, if_exists="replace")
+                database.forget_partitions(self.conn, endpoint_name)
+                with self.conn:
+                    database.create_indexes(
+                        self.conn, endpoint_name, index_columns
+                    )  # noqa
+            self.metrics.count("rows_written", len(df), table=endpoint_name)
+        elif not partial:
+            complete = not filtered
+            if (
+                filtered
+                and self.is_table(endpoint_name)
+                and not database.written_partitions(self.conn, endpoint_name)
+            ):  # noqa
+                # A table written some other way, e.g. by the replace mode,
+                # is rebuilt, so it needs every partition, not only the
+                # filtered ones.
+                partitions = self.manifest.partitions(
+                    endpoint_name,
+                    list(endpoint_config.get("file_name_fields", ["year"])),
+                )
+                complete = True
+                df = self._load_files(
+                    endpoint_path,
+                    list(partitions),
+                    endpoint_config,
+                    {},
+                    None,
+                    None,
+                    False,
+                )
+            with self.metrics.span(
+                "sql_write", table=endpoint_name, mode=write_mode
+            ):  # noqa
+                rows = database.write_partitions(
+                    self.conn,
+                    endpoint_name,
+                    df,
+                    endpoint_path,
+                    partitions,
+                    endpoint_config.get("key_columns"),
+                    index_columns,
+                    write_mode,
+                    complete=complete,
+                )
+            self.metrics.count("rows_written", rows, table=endpoint_name)
+
     def help(self):
         methods = [
             method_name
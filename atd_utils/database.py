@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+import os
+from os.path import join
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Bookkeeping table recording which cached partition files have been
+# written to which endpoint table, and the file's state when they were.
+PARTITIONS_TABLE = "_partitions"
+# How load_to_df writes an endpoint's table, see write_partitions.
+WRITE_MODES = ["replace", "upsert", "append"]
+# Applied to every connection. WAL lets readers run while a write is in
+# progress, and NORMAL only syncs at checkpoints, which is safe in WAL
+# mode. cache_size is in KiB when negative.
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 2**20,
+    "cache_size": -64 * 2**10,
+    "temp_store": "MEMORY",
+}
+# Seconds a connection waits on a lock held by another before failing.
+BUSY_TIMEOUT = 30.0
+# Default number of read connections kept by a ConnectionPool.
+POOL_SIZE = 4
+
+
+def _quote(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def connect(
+    path: str, check_same_thread: bool = True, **pragmas
+) -> sqlite3.Connection:  # noqa
+    """
+    Open a SQLite database with PRAGMAS applied.
+
+    Args:
+        check_same_thread: Passed to sqlite3.connect. Set it to False only
+            for connections that are never used by two threads at once,
+            such as a ConnectionPool's.
+        pragmas: PRAGMAS to override, e.g. synchronous="FULL".
+    """
+    conn = sqlite3.connect(
+        path, timeout=BUSY_TIMEOUT, check_same_thread=check_same_thread
+    )  # noqa
+    for name, value in {**PRAGMAS, **pragmas}.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+class ConnectionPool(object):
+    """
+    Thread-safe pool of read-only connections to one SQLite database.
+
+    Connections are opened on demand, up to `size`, and a thread borrows
+    one for the duration of a `with pool.connection()` block. Because the
+    database is in WAL mode, readers see the last committed state and
+    never wait on a writer.
+
+    Args:
+        path: The database file.
+        size: Maximum number of open connections (default: POOL_SIZE).
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE) -> None:
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting for one if all are in use."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                open_one = self._opened < self.size
+                if open_one:
+                    self._opened += 1
+            if open_one:
+                conn = connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA query_only = ON")
+            else:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+def table_columns(conn: sqlite3.Connection, table_name: str) -> List[str]:
+    """Return the columns of table_name, or [] if it doesn't exist."""
+    rows = conn.execute(f"PRAGMA table_info({_quote(table_name)})")
+    return [row[1] for row in rows]
+
+
+def create_indexes(
+    conn: sqlite3.Connection,  # noqa
+    table_name: str,  # noqa
+    index_columns: Sequence[Sequence[str]],
+) -> None:  # noqa
+    """
+    Create an index on each group of columns in index_columns.
+
+    Groups naming a column the table doesn't have are skipped, so one
+    config can cover endpoints whose columns vary by season.
+    """
+    columns = set(table_columns(conn, table_name))
+    for group in index_columns:
+        if not set(group) <= columns:
+            continue
+        index_name = f"ix_{table_name}_{'_'.join(group)}"
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} "
+            f"ON {_quote(table_name)} ({', '.join(map(_quote, group))})"
+        )
+
+
+def _sql_values(series: pd.Series) -> np.ndarray:
+    """
+    Convert a column to Python objects sqlite3 can bind, None for missing
+    values. Timestamps are written as text, as DataFrame.to_sql does.
+    """
+    missing = series.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.astype(str)
+    values = series.astype(object).to_numpy()
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def frame_rows(df: pd.DataFrame) -> Iterator[Tuple]:
+    """Yield the rows of df as tuples of sqlite3-bindable values."""
+    return zip(*[_sql_values(df[column]) for column in df.columns])
+
+
+def written_partitions(
+    conn: sqlite3.Connection, table_name: str
+) -> Dict[str, Tuple[int, int]]:  # noqa
+    """
+    Return the (mtime_ns, size) each partition file of table_name had when
+    it was last written, keyed by file name.
+    """
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {PARTITIONS_TABLE} ("
+        "table_name TEXT, file TEXT, mtime_ns INTEGER, size INTEGER, "
+        "PRIMARY KEY (table_name, file))"
+    )
+    rows = conn.execute(
+        f"SELECT file, mtime_ns, size FROM {PARTITIONS_TABLE} "
+        "WHERE table_name = :table_name",
+        {"table_name": table_name},
+    )
+    return {file: (mtime_ns, size) for file, mtime_ns, size in rows}
+
+
+def forget_partitions(conn: sqlite3.Connection, table_name: str) -> None:
+    """Drop table_name's partition records, e.g. after replacing it."""
+    written_partitions(conn, table_name)
+    with conn:
+        conn.execute(
+            f"DELETE FROM {PARTITIONS_TABLE} WHERE table_name = ?",
+            (table_name,),
+        )
+
+
+def write_partitions(
+    conn: sqlite3.Connection,  # noqa
+    table_name: str,  # noqa
+    df: pd.DataFrame,  # noqa
+    endpoint_path: str,  # noqa
+    partitions: Dict[str, Dict],  # noqa
+    key_columns: Optional[List[str]] = None,  # noqa
+    index_columns: Sequence[Sequence[str]] = (),  # noqa
+    mode: str = "upsert",
+    complete: bool = True,
+) -> int:  # noqa
+    """
+    Write the rows of new or changed partition files to table_name.
+
+    Every statement runs in one transaction: partition rows are written
+    with executemany, and the indexes and bookkeeping are updated, or
+    nothing is.
+
+    Args:
+        df: The loaded frame, holding the rows of every file in partitions.
+        endpoint_path: The directory holding the partition files.
+        partitions: The fields parsed from each file's name, keyed by file
+            name. The fields must be columns of df.
+        key_columns: The natural key of a row. A unique index is built on
+            it, and upserted rows replace the rows they match.
+        index_columns: Groups of columns to index, see create_indexes.
+        mode: "upsert" rewrites the rows of files that are new or changed
+            since they were last written. "append" only writes files that
+            were never written.
+        complete: Whether partitions holds every cached partition of the
+            table, rather than e.g. the years of a filtered load.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        ValueError: If table_name exists but was written some other way,
+            e.g. by the replace mode, and partitions isn't complete. The
+            table has to be rebuilt, which would drop the rows of every
+            partition not in partitions.
+    """
+    if mode not in ["upsert", "append"]:
+        raise ValueError(f"mode must be 'upsert' or 'append', not {mode!r}.")
+    written = written_partitions(conn, table_name)
+    columns = table_columns(conn, table_name)
+    if columns and not written and not complete:
+        raise ValueError(
+            f"{table_name} wasn't written partition by partition, so it "
+            "can only be rebuilt from every cached partition."
+        )
+    stats = {}
+    for file in partitions:
+        stat = os.stat(join(endpoint_path, file))
+        stats[file] = (stat.st_mtime_ns, stat.st_size)
+    if mode == "upsert":
+        to_write = [
+            file for file in partitions if written.get(file) != stats[file]
+        ]  # noqa
+    else:
+        to_write = [file for file in partitions if file not in written]
+    if not to_write:
+        return 0
+
+    fields = list(next(iter(partitions.values())))
+    keys = [
+        tuple(partitions[file][field] for field in fields) for file in to_write
+    ]  # noqa
+    rows = df[pd.MultiIndex.from_frame(df[fields]).isin(keys)]
+    key_columns = [c for c in key_columns or [] if c in df.columns]
+
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    with conn:
+        if columns and not written:
+            # A table written some other way, e.g. by the replace mode,
+            # can't be updated partition by partition.
+            conn.execute(f"DROP TABLE {_quote(table_name)}")
+            columns = []
+        if not columns:
+            conn.execute(pd.io.sql.get_schema(df, table_name, con=conn))
+            if key_columns:
+                conn.execute(
+                    "CREATE UNIQUE INDEX "
+                    f"{_quote(f'ux_{table_name}_key')} ON "
+                    f"{_quote(table_name)} "
+                    f"({', '.join(map(_quote, key_columns))})"
+                )
+        else:
+            for column in df.columns:
+                if column not in columns:
+                    conn.execute(
+                        f"ALTER TABLE {_quote(table_name)} "
+                        f"ADD COLUMN {_quote(column)}"
+                    )
+        if mode == "upsert":
+            # Drop the rows of changed partitions first, so rows removed
+            # from a file since it was last written go too.
+            conn.executemany(
+                f"DELETE FROM {_quote(table_name)} WHERE "
+                + " AND ".join(f"{_quote(field)} = ?" for field in fields),
+                keys,
+            )
+        conflict = "REPLACE" if mode == "upsert" else "IGNORE"
+        conn.executemany(
+            f"INSERT OR {conflict} INTO {_quote(table_name)} "
+            f"({', '.join(map(_quote, rows.columns))}) "
+            f"VALUES ({', '.join('?' * len(rows.columns))})",
+            frame_rows(rows),
+        )
+        create_indexes(conn, table_name, index_columns)
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {PARTITIONS_TABLE} VALUES (?, ?, ?, ?)",
+            [(table_name, file, *stats[file]) for file in to_write],
+        )
+    return len(rows)
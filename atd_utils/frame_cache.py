@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import os
+from os.path import join
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+# Default memory budget of a client's FrameCache.
+MAX_BYTES = 512 * 2**20
+
+
+def file_signature(endpoint_path: str, files: List[str]) -> Tuple:
+    """
+    Identify the state of a set of cached files by name, mtime and size.
+
+    Any file being added, removed or rewritten changes the signature.
+    """
+    signature = []
+    for file in sorted(files):
+        stat = os.stat(join(endpoint_path, file))
+        signature.append((file, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class FrameCache(object):
+    """
+    Thread-safe, memory-bounded LRU cache of loaded DataFrames.
+
+    Each entry is stored with the file_signature of the files it was
+    loaded from, and is only returned while the files still match it.
+    When the frames held exceed max_bytes (as measured by
+    DataFrame.memory_usage(deep=True)) the least recently used ones are
+    dropped. Frames are copied on the way in and out, so callers are free
+    to modify what they get back.
+
+    Args:
+        max_bytes: Memory budget. 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, signature: Tuple) -> Optional[pd.DataFrame]:
+        """Return a copy of the frame cached for key, if still current."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry_signature, df, nbytes = entry
+            if entry_signature != signature:
+                del self._entries[key]
+                self.nbytes -= nbytes
+                return None
+            self._entries.move_to_end(key)
+        return df.copy()
+
+    def put(self, key: Hashable, signature: Tuple, df: pd.DataFrame) -> None:
+        """
+        Cache a copy of df, evicting least recently used frames to stay
+        under max_bytes. Frames bigger than max_bytes aren't cached.
+        """
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        df = df.copy()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[2]
+            self._entries[key] = (signature, df, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self) -> None:
+        """Drop every cached frame."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Timing spans and counters for the hot paths of pulls and loads.
+
+CfbdClient and AsyncCfbdClient report to the Instrumentation passed as
+their `metrics` argument. The default, Instrumentation itself, does
+nothing. MetricsCollector keeps everything in memory and can be exported
+with to_prometheus or to_json.
+
+Spans, in seconds, labelled by endpoint unless noted:
+    request: One API call attempt, including response_parse.
+    response_parse: Decoding a response body into cfbd models.
+    save: Writing a partition file.
+    load: A whole load_to_df call.
+    columnar_read: Memory-mapping the Parquet copies of partitions.
+    file_parse: Parsing a cached JSON file. Streaming loads decode while
+        normalizing, so their parse time is part of normalize.
+    normalize: Turning a file's records into a DataFrame.
+    df_load_process: The endpoint's df_load_process.
+    sql_write: Writing a table to atd.db, labelled by table and mode.
+
+Counters, labelled by endpoint unless noted:
+    requests: Calls to the API, not counting retries.
+    retries: Repeated attempts of a failed call.
+    response_cache_hits: Calls answered from the response cache.
+    bytes_received: Response body bytes.
+    records: Records returned by hit_endpoint, from the API or the cache.
+    bytes_written: Bytes of partition files saved.
+    frame_cache_hits: load_to_df calls answered from the frame cache.
+    rows_written: Rows written to atd.db, labelled by table.
+
+Files loaded on a process pool (load_to_df's max_workers) report nothing
+from the workers, only the load span of the whole call.
+"""
+import json
+import re
+import threading
+import time
+from contextlib import nullcontext
+from typing import ContextManager, Dict, List, Optional, Tuple
+
+# Prefix of the metric names to_prometheus exports.
+PROMETHEUS_PREFIX = "atd"
+
+_NULL_SPAN = nullcontext()
+_LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict) -> _LabelKey:
+    return name, tuple(
+        sorted((k, str(v)) for k, v in labels.items() if v is not None)
+    )  # noqa
+
+
+class Instrumentation(object):
+    """
+    Where a client reports its spans and counters. Does nothing.
+
+    Subclass and override observe and count to send metrics elsewhere,
+    e.g. to a statsd or OpenTelemetry client.
+    """
+
+    def span(self, name: str, **labels) -> ContextManager:
+        """Time the block, reporting its duration to observe."""
+        return _NULL_SPAN
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """Record one duration of the span `name`."""
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """Add value to the counter `name`."""
+
+
+class _Span(object):
+    __slots__ = ("_metrics", "_name", "_labels", "_start")
+
+    def __init__(self, metrics: Instrumentation, name: str, labels: Dict):
+        self._metrics = metrics
+        self._name = name
+        self._labels = labels
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        seconds = time.perf_counter() - self._start
+        self._metrics.observe(self._name, seconds, **self._labels)
+
+
+class MetricsCollector(Instrumentation):
+    """
+    Thread-safe, in-memory Instrumentation.
+
+    Keeps the count, total and maximum of each span and the total of each
+    counter, per distinct set of labels. Labels whose value is None are
+    dropped.
+
+    Examples:
+        >>> metrics = MetricsCollector()
+        >>> client = CfbdClient(metrics=metrics)
+        >>> client.pull_data(2023, "get_games")
+        >>> print(to_prometheus(metrics))
+    """
+
+    def __init__(self) -> None:
+        self._counters = {}
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **labels) -> ContextManager:
+        return _Span(self, name, labels)
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                self._spans[key] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name: str, **labels) -> float:
+        """Return the value of one counter, 0 if never counted."""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def span_stats(self, name: str, **labels) -> Optional[Dict]:
+        """Return {"count", "sum", "max"} of one span, if ever observed."""
+        with self._lock:
+            stats = self._spans.get(_key(name, labels))
+        if stats is None:
+            return None
+        return dict(zip(["count", "sum", "max"], stats))
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """
+        Return every counter and span as plain data.
+
+        Returns:
+            {"counters": [{"name", "labels", "value"}, ...],
+             "spans": [{"name", "labels", "count", "sum", "max"}, ...]},
+            each sorted by name and labels.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            spans = sorted(
+                (key, list(stats)) for key, stats in self._spans.items()
+            )  # noqa
+        return {
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in counters
+            ],
+            "spans": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": count,
+                    "sum": total,
+                    "max": longest,
+                }
+                for (name, labels), (count, total, longest) in spans
+            ],
+        }
+
+    def reset(self) -> None:
+        """Drop every counter and span."""
+        with self._lock:
+            self._counters.clear()
+            self._spans.clear()
+
+
+def to_json(metrics: MetricsCollector) -> str:
+    """Export a collector's snapshot as JSON."""
+    return json.dumps(metrics.snapshot(), sort_keys=True)
+
+
+def _metric_name(*parts: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", "_".join(parts))
+
+
+def _escape(value: str) -> str:
+    value = value.replace("\\", "\\\\").replace('"', '\\"')
+    return value.replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def to_prometheus(
+    metrics: MetricsCollector, prefix: str = PROMETHEUS_PREFIX
+) -> str:  # noqa
+    """
+    Export a collector in the Prometheus text exposition format.
+
+    Counters become `<prefix>_<name>_total` counters. Spans become
+    `<prefix>_<name>_seconds` summaries (_count and _sum) plus a
+    `<prefix>_<name>_seconds_max` gauge.
+    """
+    snapshot = metrics.snapshot()
+    lines = []
+    typed = set()
+
+    def declare(name: str, kind: str) -> None:
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for counter in snapshot["counters"]:
+        name = _metric_name(prefix, counter["name"], "total")
+        declare(name, "counter")
+        lines.append(
+            f"{name}{_format_labels(counter['labels'])} {counter['value']}"
+        )  # noqa
+    for span in snapshot["spans"]:
+        name = _metric_name(prefix, span["name"], "seconds")
+        labels = _format_labels(span["labels"])
+        declare(name, "summary")
+        lines.append(f"{name}_count{labels} {span['count']}")
+        lines.append(f"{name}_sum{labels} {span['sum']}")
+    for span in snapshot["spans"]:
+        name = _metric_name(prefix, span["name"], "seconds_max")
+        declare(name, "gauge")
+        lines.append(f"{name}{_format_labels(span['labels'])} {span['max']}")
+    return "\n".join(lines) + "\n"
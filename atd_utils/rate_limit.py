@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Mapping, Optional
+
+# Default sustained request rate and burst size for the CFBD API.
+REQUESTS_PER_SECOND = 10.0
+BURST = 10
+# On a 429 the rate is multiplied by THROTTLE_FACTOR, and every successful
+# request afterwards adds RECOVERY_STEP requests/second back, up to the
+# configured rate.
+THROTTLE_FACTOR = 0.5
+RECOVERY_STEP = 0.1
+MIN_REQUESTS_PER_SECOND = 0.2
+
+
+def parse_retry_after(headers: Optional[Mapping]) -> Optional[float]:
+    """
+    Read a Retry-After header as a number of seconds to wait.
+
+    Args:
+        headers: Response headers, e.g. ApiException.headers. May be None.
+
+    Returns:
+        The number of seconds to wait, or None if the header is missing or
+        cannot be parsed. Both the delay-seconds and HTTP-date forms are
+        supported.
+    """
+    if not headers:
+        return None
+    value = headers.get("Retry-After", headers.get("retry-after"))
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket rate limiter with adaptive backoff.
+
+    Every call to acquire takes one token, blocking until one is available.
+    Tokens refill at `rate` per second up to `capacity`. throttle() is
+    called on a 429: it pauses every caller for the Retry-After period and
+    cuts the rate, which then recovers a little on each recover() call.
+
+    Args:
+        rate: Sustained requests per second.
+        capacity: Maximum burst size (default: BURST).
+        min_rate: Floor the rate will not be throttled below.
+        clock: Monotonic clock returning seconds.
+        sleep: Function used to wait.
+    """
+
+    def __init__(
+        self,
+        rate: float = REQUESTS_PER_SECOND,
+        capacity: Optional[float] = None,
+        min_rate: float = MIN_REQUESTS_PER_SECOND,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity or BURST)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        # Tokens have been accounted for up to _updated. throttle() moves it
+        # into the future to pause every caller until then.
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            elapsed = now - self._updated
+            self._tokens = min(
+                self.capacity, self._tokens + elapsed * self.rate
+            )  # noqa
+            self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token without blocking.
+
+        Returns:
+            The number of seconds the caller must wait before using the
+            token. Lets asyncio callers wait with asyncio.sleep.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(0.0, self._updated - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self) -> None:
+        """Block until a token is available and take it."""
+        wait = self.reserve()
+        if wait > 0:
+            self._sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Back off after the API rate limited a request.
+
+        Args:
+            retry_after: Seconds the API asked us to wait. Defaults to the
+                time it takes to earn one token at the reduced rate.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * THROTTLE_FACTOR)
+            if retry_after is None:
+                retry_after = 1 / self.rate
+            now = self._clock()
+            self._refill(now)
+            self._updated = max(self._updated, now + retry_after)
+            # Empty the bucket so callers don't burst as soon as the pause
+            # ends.
+            self._tokens = min(self._tokens, 0.0)
+
+    def recover(self) -> None:
+        """Creep the rate back towards max_rate after a successful call."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + RECOVERY_STEP)
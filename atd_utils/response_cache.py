@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from . import database
+from .cache import current_season
+from .serializers import Serializer, get_serializer
+
+RESPONSE_CACHE_DB = "responses.db"
+# Seconds a response is reused for, unless its endpoint's pull config sets
+# "cache_ttl". Responses fetched after their season ended don't change and
+# never expire.
+DEFAULT_TTL = 6 * 60 * 60
+# Seconds an empty response is reused for, unless the pull config sets
+# "negative_cache_ttl". Short, since an empty week is often one that
+# hasn't been played yet.
+NEGATIVE_TTL = 60 * 60
+# zlib level the stored responses are compressed at.
+COMPRESSION_LEVEL = 6
+
+
+def request_key(api_name: str, endpoint_name: str, request_params: Dict) -> str:  # noqa
+    """
+    Hash a request into the key its response is stored under.
+
+    Params are sorted, so dicts holding the same params in a different
+    order share a key.
+    """
+    request = [api_name, endpoint_name, sorted(request_params.items())]
+    encoded = json.dumps(request, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResponseCache(object):
+    """
+    On-disk cache of endpoint responses, content-addressed by request_key.
+
+    Responses are stored zlib-compressed in one SQLite table. A response is
+    reused until its time to live runs out: forever if it was fetched after
+    its season ended, otherwise the endpoint's "cache_ttl" (DEFAULT_TTL),
+    or its "negative_cache_ttl" (NEGATIVE_TTL) for empty responses. TTLs
+    are set per endpoint through the ttls argument.
+
+    Args:
+        path: The SQLite file to store responses in.
+        ttls: Optional {endpoint_name: {"cache_ttl": seconds,
+            "negative_cache_ttl": seconds}} overrides, e.g. the pull
+            configs of ENDPOINTS_DICT.
+        serializer: JSON backend to encode responses with.
+        clock: Returns the current time in seconds since the epoch.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[Dict[str, Dict]] = None,
+        serializer: Optional[Serializer] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttls = ttls or {}
+        self.serializer = serializer or get_serializer()
+        self._clock = clock
+        self._conn = database.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, api_name TEXT, endpoint_name TEXT, "
+                "params TEXT, records INTEGER, fetched_at REAL, body BLOB)"
+            )
+
+    def ttl(
+        self,
+        endpoint_name: str,
+        request_params: Dict,
+        records: int,
+        fetched_at: float,
+    ) -> Optional[float]:
+        """
+        Seconds a response may be reused for, None meaning forever.
+
+        Only a response fetched after its season ended is kept forever, the
+        rule cache.pulled_after_season applies to partition files. One
+        fetched mid-season, e.g. an empty bowl week, expires like any other.
+        """
+        year = request_params.get("year")
+        fetched_season = current_season(datetime.fromtimestamp(fetched_at))
+        if year is not None and fetched_season > year:
+            return None
+        ttls = self.ttls.get(endpoint_name, {})
+        if records:
+            return ttls.get("cache_ttl", DEFAULT_TTL)
+        return ttls.get("negative_cache_ttl", NEGATIVE_TTL)
+
+    def get(
+        self, api_name: str, endpoint_name: str, request_params: Dict
+    ) -> Optional[List[Dict]]:  # noqa
+        """Return the stored response to a request, if still fresh."""
+        key = request_key(api_name, endpoint_name, request_params)
+        query = "SELECT records, fetched_at, body FROM responses WHERE key = ?"
+        with self._lock:
+            row = self._conn.execute(query, (key,)).fetchone()
+        if row is None:
+            return None
+        records, fetched_at, body = row
+        ttl = self.ttl(endpoint_name, request_params, records, fetched_at)
+        if ttl is not None and self._clock() - fetched_at > ttl:
+            return None
+        return self.serializer.loads(zlib.decompress(body))
+
+    def put(
+        self,
+        api_name: str,
+        endpoint_name: str,
+        request_params: Dict,
+        results: List[Dict],
+    ) -> None:
+        """Store the response to a request."""
+        key = request_key(api_name, endpoint_name, request_params)
+        body = zlib.compress(self.serializer.dumps(results), COMPRESSION_LEVEL)  # noqa
+        params = json.dumps(request_params, default=str, sort_keys=True)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",  # noqa
+                (
+                    key,
+                    api_name,
+                    endpoint_name,
+                    params,
+                    len(results),
+                    self._clock(),
+                    body,
+                ),
+            )
+
+    def clear(self, endpoint_name: Optional[str] = None) -> None:
+        """Drop every stored response, or only endpoint_name's."""
+        with self._lock, self._conn:
+            if endpoint_name is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE endpoint_name = ?",
+                    (endpoint_name,),
+                )
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from .compression import AtomicWriter, open_file, read_bytes
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+# Characters read at a time by iter_json_array.
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\n\r"
+
+
+class Serializer(NamedTuple):
+    """
+    A JSON backend.
+
+    dumps returns bytes and loads accepts bytes or str, whatever the
+    backend, so callers can read and write files in binary mode.
+    """
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    "json": Serializer("json", _json_dumps, json.loads),
+}
+if msgspec is not None:
+    SERIALIZERS["msgspec"] = Serializer(
+        "msgspec", msgspec.json.encode, msgspec.json.decode
+    )
+if orjson is not None:
+    SERIALIZERS["orjson"] = Serializer("orjson", orjson.dumps, orjson.loads)
+
+# Fastest first.
+_PREFERENCE = ["orjson", "msgspec", "json"]
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """
+    Return the named JSON backend, or the fastest one installed.
+
+    Args:
+        name: One of "orjson", "msgspec" or "json" (default: None, i.e.
+            orjson if installed, then msgspec, then the stdlib json module).
+
+    Raises:
+        ValueError: If the named backend isn't installed.
+    """
+    if name is None:
+        name = next(name for name in _PREFERENCE if name in SERIALIZERS)
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(
+            f"JSON backend {name!r} is not available. Installed backends: "
+            f"{', '.join(SERIALIZERS)}."
+        )
+
+
+def read_json(path: str, serializer: Optional[str] = None) -> Any:
+    """
+    Parse a whole JSON file, handing the backend bytes rather than str.
+    Compressed files are decompressed first, see compression.
+    """
+    return get_serializer(serializer).loads(read_bytes(path))
+
+
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:  # noqa
+    """
+    Yield the elements of a file holding a JSON array one at a time.
+
+    Only the element being decoded (plus one read chunk) is held in memory,
+    instead of the whole file and the whole parsed list. Compressed files
+    are decompressed as they are read.
+
+    Raises:
+        ValueError: If the file isn't a JSON array or is truncated.
+    """
+    decoder = json.JSONDecoder()
+    with io.TextIOWrapper(open_file(path), encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip(_WHITESPACE)
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} does not hold a JSON array.")
+        pos = 1
+        eof = False
+
+        def read_more(size: int) -> bool:
+            nonlocal buffer, pos, eof
+            more = f.read(size)
+            if not more:
+                eof = True
+                return False
+            buffer = buffer[pos:] + more
+            pos = 0
+            return True
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE + ",":
+                pos += 1
+            if pos == len(buffer):
+                if not read_more(chunk_size):
+                    raise ValueError(f"{path} is truncated.")
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The element runs past the buffer. Read at least as much
+                # again as is buffered so large elements are re-parsed a
+                # logarithmic number of times.
+                if eof or not read_more(max(chunk_size, len(buffer))):
+                    raise ValueError(f"{path} is truncated or invalid.")
+                continue
+            if end == len(buffer) and not eof:
+                # A number at the end of the buffer may continue in the
+                # next chunk.
+                if read_more(chunk_size):
+                    continue
+            yield element
+            pos = end
+
+
+def iter_json_lines(
+    path: str, serializer: Optional[str] = None
+) -> Iterator[Any]:  # noqa
+    """Yield the records of a JSON Lines file one at a time."""
+    loads = get_serializer(serializer).loads
+    with open_file(path) as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def iter_records(path: str, serializer: Optional[str] = None) -> Iterator[Any]:  # noqa
+    """
+    Stream the records of a cached endpoint file.
+
+    Files ending in .jsonl are read as JSON Lines, anything else as a JSON
+    array.
+    """
+    if path.endswith(".jsonl"):
+        return iter_json_lines(path, serializer)
+    return iter_json_array(path)
+
+
+class JsonArrayWriter(object):
+    """
+    Write a JSON array to a file a batch of elements at a time.
+
+    Use as a context manager. The array is written through a
+    compression.AtomicWriter, so it replaces `path` only when the block
+    exits cleanly: readers never see a partial file and an interrupted
+    write leaves the old file in place.
+
+    Args:
+        path: The file to write.
+        serializer: Name of the JSON backend to encode with.
+        compression: Optional codec to compress the file with, see
+            compression.COMPRESSIONS.
+
+    Attributes:
+        count: The number of elements written so far.
+        checksum: The checksum of the file as written, set on exit.
+        size: The size of the file as written, set on exit.
+
+    Examples:
+        >>> with JsonArrayWriter("games.json") as writer:
+        ...     for batch in batches:
+        ...         writer.write(batch)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.count = 0
+        self.checksum = None
+        self.size = None
+        self._dumps = get_serializer(serializer).dumps
+        self._writer = AtomicWriter(path, compression)
+        self._file = None
+
+    def __enter__(self) -> "JsonArrayWriter":
+        self._file = self._writer.__enter__()
+        self._file.write(b"[")
+        return self
+
+    def write(self, elements: Iterable[Any]) -> None:
+        """Append elements to the array."""
+        elements = list(elements)
+        if not elements:
+            return
+        if self.count:
+            self._file.write(b",")
+        # Drop the brackets of the batch's own array.
+        self._file.write(self._dumps(elements).strip()[1:-1])
+        self.count += len(elements)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self._file.write(b"]")
+        self._writer.__exit__(exc_type, exc_value, traceback)
+        self.checksum = self._writer.checksum
+        self.size = self._writer.size
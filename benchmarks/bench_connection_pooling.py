@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Count the TCP connections a 32 week pull opens against a local stub API,
+with a fresh cfbd.ApiClient per request versus the client's pooled one.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_connection_pooling
+"""
+
+import tempfile
+import time
+
+import cfbd
+
+from atd_utils.data_utils import CfbdClient
+from atd_utils.cfbd_endpoint_configs import pull_over_season_types_and_weeks
+from tests.stub_server import StubServer
+
+
+def unpooled_api_instance(client):
+    """The pre-pooling behaviour: a new ApiClient for every request."""
+
+    def get_api_instance(api_name):
+        api_client = cfbd.ApiClient(client.cfbd_configuration)
+        return getattr(cfbd, api_name)(api_client)
+
+    return get_api_instance
+
+
+def run(pooled: bool, max_workers: int = 1) -> dict:
+    with StubServer() as server, tempfile.TemporaryDirectory() as data_dir:
+        client = CfbdClient(
+            api_key="benchmark",
+            data_dir=data_dir,
+            scratch_dir=f"{data_dir}/scratch",
+        )
+        client.cfbd_configuration.host = server.url
+        if not pooled:
+            client.get_api_instance = unpooled_api_instance(client)
+        start = time.perf_counter()
+        pull_over_season_types_and_weeks(
+            client.hit_endpoint,
+            "GamesApi",
+            "get_player_game_stats",
+            {"year": 2022},
+            max_workers=max_workers,
+        )
+        elapsed = time.perf_counter() - start
+        return {
+            "requests": len(server.requests),
+            "connections": server.connections,
+            "seconds": elapsed,
+        }
+
+
+def main():
+    for max_workers in (1, 8):
+        for pooled in (False, True):
+            result = run(pooled, max_workers)
+            label = "pooled" if pooled else "per-request ApiClient"
+            print(
+                f"{label:>22} max_workers={max_workers}:"
+                f" {result['requests']} requests,"
+                f" {result['connections']} TCP connections,"
+                f" {result['seconds']:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
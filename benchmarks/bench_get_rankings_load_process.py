@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Compare get_rankings_load_process with the explode and json_normalize
+version it replaced, in time and peak traced memory, on synthetic
+rankings histories.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_get_rankings_load_process
+"""
+
+import time
+import tracemalloc
+
+import pandas as pd
+
+from atd_utils.cfbd_endpoint_configs import get_rankings_load_process
+from benchmarks.synthetic import rankings
+from tests.test_cfbd_endpoint_configs import legacy_get_rankings_load_process
+
+SEASON_COUNTS = [5, 20, 80]
+
+
+def measure(func, df):
+    """Return (seconds, peak MiB) of one call, timed without tracing."""
+    start = time.perf_counter()
+    func(df.copy())
+    seconds = time.perf_counter() - start
+    df = df.copy()
+    tracemalloc.start()
+    func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main():
+    print(
+        f"{'seasons':>7} {'rows':>7} {'legacy s':>9} {'flat s':>7}"
+        f" {'legacy MiB':>11} {'flat MiB':>9}"
+    )
+    for seasons in SEASON_COUNTS:
+        df = pd.DataFrame(
+            [
+                week
+                for season in range(2022 - seasons, 2022)
+                for week in rankings(season, seed=season)
+            ]
+        )
+        expected = legacy_get_rankings_load_process(df.copy())
+        flat = get_rankings_load_process(df.copy())
+        pd.testing.assert_frame_equal(flat.astype({"poll": object}), expected)
+        legacy_s, legacy_mib = measure(legacy_get_rankings_load_process, df)
+        flat_s, flat_mib = measure(get_rankings_load_process, df)
+        print(
+            f"{seasons:>7} {len(flat):>7} {legacy_s:>9.3f} {flat_s:>7.3f}"
+            f" {legacy_mib:>11.1f} {flat_mib:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Measure how long common atd_utils imports take with `-X importtime`, and
+which heavy dependencies each one loads.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import_time
+"""
+
+import subprocess
+import sys
+
+from tests.test_imports import HEAVY_MODULES, import_times
+
+STATEMENTS = [
+    "import atd_utils",
+    "from atd_utils.rate_limit import TokenBucket",
+    "from atd_utils.serializers import read_json",
+    "from atd_utils import CfbdClient",
+    "from atd_utils.async_client import AsyncCfbdClient",
+]
+RUNS = 5
+
+
+def wall_time(statement: str) -> float:
+    """Seconds statement takes to run in a fresh interpreter."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout)
+
+
+def main():
+    print(f"{'statement':<52} {'best ms':>8}  heavy modules")
+    for statement in STATEMENTS:
+        best = min(wall_time(statement) for _ in range(RUNS))
+        times = import_times(statement)
+        heavy = [name for name in HEAVY_MODULES if name in times]
+        print(f"{statement:<52} {best * 1000:>8.1f}  {', '.join(heavy)}")
+
+
+if __name__ == "__main__":
+    main()
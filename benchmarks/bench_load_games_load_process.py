@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Time load_games_load_process against the row-by-row version it replaced
+on synthetic get_games frames of increasing size.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_load_games_load_process
+"""
+
+import time
+
+import pandas as pd
+
+from atd_utils.cfbd_endpoint_configs import load_games_load_process
+from benchmarks.synthetic import games
+from tests.test_cfbd_endpoint_configs import legacy_load_games_load_process
+
+GAME_COUNTS = [1000, 10000, 50000]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'games':>6} {'legacy s':>9} {'vectorized s':>13} {'speedup':>8}")
+    for count in GAME_COUNTS:
+        df = pd.DataFrame(games(count))
+        expected, legacy_time = timed(legacy_load_games_load_process, df.copy())  # noqa
+        result, vectorized_time = timed(load_games_load_process, df.copy())
+        pd.testing.assert_frame_equal(result, expected)
+        print(
+            f"{count:>6} {legacy_time:>9.3f} {vectorized_time:>13.4f}"
+            f" {legacy_time / vectorized_time:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
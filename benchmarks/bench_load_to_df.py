@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Time CfbdClient.load_to_df on get_player_game_stats caches of increasing
+size, to check the per-file cost stays flat as the cache grows.
+
+The legacy column reimplements the old loader, which concatenated each
+file's frame onto everything loaded so far. The parallel column loads on
+a PARALLEL_WORKERS process pool, and the warm column memory-maps the
+Parquet copies written by a previous load.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_load_to_df
+"""
+
+import json
+import os
+import tempfile
+import time
+from os.path import join
+
+import pandas as pd
+
+from atd_utils.data_utils import CfbdClient
+from benchmarks.synthetic import write_week_files
+from tests.test_cfbd_endpoint_configs import (
+    legacy_get_player_game_stats_pre_pandas_load_process,
+)
+
+ENDPOINT = "get_player_game_stats"
+FILE_COUNTS = [125, 250, 500, 1000]
+PARALLEL_WORKERS = 4
+
+
+def legacy_load(client: CfbdClient) -> pd.DataFrame:
+    """The concat-per-file loop load_to_df used to run."""
+    endpoint_path = join(client.data_dir, ENDPOINT)
+    df = None
+    for file in os.listdir(endpoint_path):
+        if file[0] == ".":
+            continue
+        with open(join(endpoint_path, file), "r") as f:
+            contents = json.loads(f.read())
+        contents_df = pd.json_normalize(
+            legacy_get_player_game_stats_pre_pandas_load_process(contents)
+        )
+        df = contents_df if df is None else pd.concat([df, contents_df])
+    return df
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(
+        f"{'files':>6} {'rows':>9} {'legacy ms/file':>15} {'ms/file':>8}"
+        f" {'parallel ms/file':>17} {'warm ms/file':>13}"
+    )
+    for files in FILE_COUNTS:
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_week_files(data_dir, ENDPOINT, files)
+            client = CfbdClient(
+                api_key="benchmark",
+                data_dir=data_dir,
+                scratch_dir=join(data_dir, "scratch"),
+                columnar=False,
+                frame_cache_bytes=0,
+            )
+            # Create the table up front so load_to_df doesn't time a write.
+            client.conn.execute(f"CREATE TABLE {ENDPOINT} (x)")
+            _, legacy_seconds = timed(legacy_load, client)
+            df, seconds = timed(client.load_to_df, ENDPOINT)
+            _, parallel_seconds = timed(
+                client.load_to_df, ENDPOINT, max_workers=PARALLEL_WORKERS
+            )
+            client.columnar = True
+            client.load_to_df(ENDPOINT)
+            _, warm_seconds = timed(client.load_to_df, ENDPOINT)
+            print(
+                f"{files:>6} {len(df):>9}"
+                f" {1000 * legacy_seconds / files:>15.2f}"
+                f" {1000 * seconds / files:>8.2f}"
+                f" {1000 * parallel_seconds / files:>17.2f}"
+                f" {1000 * warm_seconds / files:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Compare get_player_game_stats_to_df with the dict-per-row flattener and
+json_normalize pass it replaced, in time and peak traced memory.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_player_game_stats_to_df
+"""
+
+import time
+import tracemalloc
+
+import pandas as pd
+
+from atd_utils.cfbd_endpoint_configs import get_player_game_stats_to_df
+from benchmarks.synthetic import player_game_stats
+from tests.test_cfbd_endpoint_configs import (
+    legacy_get_player_game_stats_pre_pandas_load_process,
+)
+
+GAME_COUNTS = [50, 200, 800]
+
+
+def legacy_to_df(data):
+    records = legacy_get_player_game_stats_pre_pandas_load_process(data)
+    return pd.json_normalize(records)
+
+
+def measure(func, data):
+    """Return (seconds, peak MiB) of one call, timed without tracing."""
+    start = time.perf_counter()
+    func(data)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20
+
+
+def main():
+    print(
+        f"{'games':>6} {'rows':>7} {'legacy s':>9} {'columnar s':>11}"
+        f" {'legacy MiB':>11} {'columnar MiB':>13}"
+    )
+    for games in GAME_COUNTS:
+        data = player_game_stats(games)
+        rows = len(get_player_game_stats_to_df(data))
+        legacy_s, legacy_mib = measure(legacy_to_df, data)
+        columnar_s, columnar_mib = measure(get_player_game_stats_to_df, data)
+        print(
+            f"{games:>6} {rows:>7} {legacy_s:>9.3f} {columnar_s:>11.3f}"
+            f" {legacy_mib:>11.1f} {columnar_mib:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+Offline benchmark suite for the pull and load paths.
+
+For each of ENDPOINTS and each size (a number of seasons), the suite
+times:
+
+    pull: pull_year over the seasons, with hit_endpoint replaced by a
+        mock answering with synthetic payloads after `latency` seconds.
+    load: load_to_df of the files the pull saved, parsed from JSON (the
+        columnar and frame caches are off).
+    process: the endpoint's df_load_process, or records_to_df for
+        endpoints with one, or json_normalize for endpoints with neither.
+    sqlite_replace, sqlite_upsert: writing the loaded frame to SQLite with
+        DataFrame.to_sql and with database.write_partitions.
+
+Every case reports the best of `repeat` runs after a warm-up run. Results
+are saved to .benchmarks/<commit>.json, replacing the cases rerun, and
+compared with the newest results file of another commit. Cases more than
+THRESHOLD slower are flagged, and with --check make the run exit with
+status 1.
+
+Run from the repository root:
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --sizes 1 4 16 --compare .benchmarks/abc1234.json  # noqa
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from os.path import join
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from atd_utils import database
+from atd_utils.cfbd_endpoint_configs import ENDPOINTS_DICT
+from atd_utils.data_utils import CfbdClient
+from benchmarks import synthetic
+
+ENDPOINTS = [
+    "get_games",
+    "get_player_game_stats",
+    "get_rankings",
+    "get_coaches",
+]  # noqa
+SIZES = [1, 4]
+# Seconds the mocked hit_endpoint waits before answering.
+LATENCY = 0.005
+REPEAT = 3
+# Games a week. A season is then 160 games and ~30k player stat rows.
+GAMES_PER_WEEK = 10
+# Slowdown over the previous results that counts as a regression.
+THRESHOLD = 0.25
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = join(ROOT, ".benchmarks")
+FIRST_SEASON = 2022
+
+
+def response(endpoint_name: str, params: Dict) -> List[Dict]:
+    """The synthetic payload the API would answer a request with."""
+    year = params["year"]
+    season_type = params.get("season_type", "regular")
+    week = params.get("week", 0)
+    seed = year * 100 + week
+    if endpoint_name == "get_calendar":
+        return synthetic.calendar(year)
+    if endpoint_name == "get_games":
+        weeks = 15 if season_type == "regular" else 1
+        payload = synthetic.games(GAMES_PER_WEEK * weeks, seed=seed)
+        for game in payload:
+            game["season"] = year
+            game["season_type"] = season_type
+        return payload
+    if endpoint_name == "get_player_game_stats":
+        return synthetic.player_game_stats(GAMES_PER_WEEK, seed=seed)
+    if endpoint_name == "get_rankings":
+        return [
+            poll_week
+            for poll_week in synthetic.rankings(year, seed=year)
+            if poll_week["season_type"] == season_type
+        ]
+    if endpoint_name == "get_coaches":
+        return synthetic.coaches(year, seed=year)
+    raise ValueError(f"No synthetic payload for {endpoint_name}.")
+
+
+def mock_hit_endpoint(latency: float) -> Callable:
+    """
+    A hit_endpoint that sleeps for `latency` seconds and returns synthetic
+    payloads. Payloads are generated once, so repeated pulls only time the
+    client.
+    """
+    payloads = {}
+
+    def hit_endpoint(api_name, endpoint_name, request_params):
+        key = (endpoint_name, tuple(sorted(request_params.items())))
+        if key not in payloads:
+            payloads[key] = response(endpoint_name, request_params)
+        time.sleep(latency)
+        return payloads[key]
+
+    return hit_endpoint
+
+
+def best_of(
+    func: Callable, repeat: int, setup: Optional[Callable] = None
+) -> float:  # noqa
+    """
+    Seconds of the fastest of `repeat` calls of func, after a warm-up.
+
+    Args:
+        setup: Optional callable run untimed before each call. Its return
+            value is passed to func.
+    """
+    times = []
+    for run in range(repeat + 1):
+        args = [setup()] if setup else []
+        start = time.perf_counter()
+        func(*args)
+        if run:
+            times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def process_func(endpoint_name: str, records: List[Dict]) -> Callable:
+    """The load hook `process` times, applied to a fresh input."""
+    config = ENDPOINTS_DICT[endpoint_name]["load"]
+    if config.get("records_to_df"):
+        return lambda: config["records_to_df"](records)
+    if config.get("df_load_process"):
+        df = pd.json_normalize(records)
+        return lambda: config["df_load_process"](df.copy())
+    return lambda: pd.json_normalize(
+        records, record_path=config.get("record_path"), meta=config.get("meta")
+    )
+
+
+def bench_endpoint(
+    endpoint_name: str, size: int, latency: float, repeat: int
+) -> Dict[str, Dict]:  # noqa
+    """Run every case of one endpoint at one size."""
+    years = range(FIRST_SEASON, FIRST_SEASON - size, -1)
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        client = CfbdClient(
+            api_key="benchmark",
+            data_dir=data_dir,
+            scratch_dir=join(data_dir, "scratch"),
+            columnar=False,
+            frame_cache_bytes=0,
+            response_cache=False,
+        )
+        client.hit_endpoint = mock_hit_endpoint(latency)
+        records = []
+
+        def pull():
+            records.clear()
+            # Weekly pulls print every week they request.
+            with redirect_stdout(io.StringIO()):
+                for year in years:
+                    records.extend(client.pull_year(year, endpoint_name))
+
+        results["pull"] = best_of(pull, repeat)
+
+        # An existing table keeps load_to_df from timing a write.
+        client.conn.execute(f"CREATE TABLE {endpoint_name} (x)")
+        results["load"] = best_of(
+            lambda: client.load_to_df(endpoint_name), repeat
+        )  # noqa
+        results["process"] = best_of(
+            process_func(endpoint_name, records), repeat
+        )  # noqa
+
+        df = client.load_to_df(endpoint_name)
+        results["sqlite_replace"] = best_of(
+            lambda: df.to_sql(endpoint_name, client.conn, if_exists="replace"),  # noqa
+            repeat,
+        )
+        config = ENDPOINTS_DICT[endpoint_name]["load"]
+        endpoint_path = join(data_dir, endpoint_name)
+        partitions = client.manifest.partitions(
+            endpoint_name, list(config.get("file_name_fields", ["year"]))
+        )  # noqa
+
+        def drop_table():
+            client.conn.execute(f"DROP TABLE IF EXISTS {endpoint_name}")
+            database.forget_partitions(client.conn, endpoint_name)
+            client.conn.commit()
+
+        results["sqlite_upsert"] = best_of(
+            lambda _: database.write_partitions(
+                client.conn,
+                endpoint_name,
+                df,
+                endpoint_path,
+                partitions,
+                config.get("key_columns"),
+                config.get("index_columns", []),
+                "upsert",
+            ),
+            repeat,
+            setup=drop_table,
+        )
+        rows = len(df)
+    return {
+        f"{endpoint_name}/{case}/{size}": {"seconds": seconds, "rows": rows}
+        for case, seconds in results.items()
+    }
+
+
+def commit_id() -> str:
+    """The short HEAD commit, suffixed -dirty if tracked files changed."""
+
+    def git(*args) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ["git", *args], cwd=ROOT, capture_output=True, text=True
+        )  # noqa
+
+    commit = git("rev-parse", "--short", "HEAD").stdout.strip() or "unknown"
+    if git("diff", "--quiet", "HEAD").returncode:
+        commit += "-dirty"
+    return commit
+
+
+def previous_results(exclude: str) -> Optional[str]:
+    """The newest results file in RESULTS_DIR other than exclude."""
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    paths = [
+        join(RESULTS_DIR, file)
+        for file in os.listdir(RESULTS_DIR)
+        if file.endswith(".json") and join(RESULTS_DIR, file) != exclude
+    ]
+    return max(paths, key=os.path.getmtime, default=None)
+
+
+def compare(cases: Dict[str, Dict], previous: Dict[str, Dict]) -> List[str]:
+    """Print every case against previous, returning the regressed ones."""
+    regressions = []
+    header = f"{'case':<40} {'rows':>8} {'seconds':>9}"
+    print(f"{header} {'previous':>9} {'ratio':>6}")
+    for case, result in cases.items():
+        line = f"{case:<40} {result['rows']:>8} {result['seconds']:>9.4f}"
+        if case in previous:
+            before = previous[case]["seconds"]
+            ratio = result["seconds"] / before
+            line += f" {before:>9.4f} {ratio:>6.2f}"
+            if ratio > 1 + THRESHOLD:
+                line += "  SLOWER"
+                regressions.append(case)
+        print(line)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--latency", type=float, default=LATENCY)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument(
+        "--compare", help="Results file to compare with (default: newest)."
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 on regressions.",
+    )
+    args = parser.parse_args(argv)
+
+    cases = {}
+    for endpoint_name in args.endpoints:
+        for size in args.sizes:
+            cases.update(
+                bench_endpoint(endpoint_name, size, args.latency, args.repeat)
+            )  # noqa
+
+    commit = commit_id()
+    output = join(RESULTS_DIR, f"{commit}.json")
+    previous_path = args.compare or previous_results(exclude=output)
+    previous = {}
+    if previous_path:
+        with open(previous_path) as f:
+            previous = json.load(f)["cases"]
+        print(f"Comparing with {os.path.relpath(previous_path, ROOT)}.")
+    regressions = compare(cases, previous)
+
+    # Runs of a subset of the cases add to the commit's results.
+    if os.path.exists(output):
+        with open(output) as f:
+            cases = {**json.load(f)["cases"], **cases}
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "date": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "latency": args.latency,
+                "repeat": args.repeat,
+                "cases": cases,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Saved {os.path.relpath(output, ROOT)}.")
+    if regressions:
+        print(f"{len(regressions)} cases more than {THRESHOLD:.0%} slower.")
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
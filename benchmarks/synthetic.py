@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic CFBD-shaped payloads for benchmarks.
+
+Every generator is seeded so the same arguments always produce the same
+payload.
+"""
+
+import json
+import os
+import random
+from os.path import join
+from typing import Dict, List
+
+from atd_utils.cache import partition_file_name
+from atd_utils.cfbd_endpoint_configs import SEASON_TYPES, WEEKS
+
+CATEGORIES = {
+    "passing": ["C/ATT", "YDS", "AVG", "TD", "INT", "QBR"],
+    "rushing": ["CAR", "YDS", "AVG", "TD", "LONG"],
+    "receiving": ["REC", "YDS", "AVG", "TD", "LONG"],
+    "defensive": ["TOT", "SOLO", "SACKS", "TFL", "PD", "QB HUR", "TD"],
+}
+CONFERENCES = ["SEC", "Big Ten", "ACC", "Big 12", "Pac-12", "Mountain West"]
+
+
+def player_game_stats(
+    games: int, athletes: int = 4, seed: int = 0
+) -> List[Dict]:  # noqa
+    """One week of get_player_game_stats responses."""
+    rng = random.Random(seed)
+    payload = []
+    for game_ix in range(games):
+        teams = []
+        for home_away in ["home", "away"]:
+            school = f"School {rng.randrange(130)}"
+            categories = [
+                {
+                    "name": category,
+                    "types": [
+                        {
+                            "name": type_name,
+                            "athletes": [
+                                {
+                                    "id": str(rng.randrange(10**6)),
+                                    "name": f"Player {rng.randrange(10**4)}",
+                                    "stat": str(rng.randrange(100)),
+                                }
+                                for _ in range(athletes)
+                            ],
+                        }
+                        for type_name in type_names
+                    ],
+                }
+                for category, type_names in CATEGORIES.items()
+            ]
+            teams.append(
+                {
+                    "school": school,
+                    "conference": rng.choice(CONFERENCES),
+                    "homeAway": home_away,
+                    "points": rng.randrange(60),
+                    "categories": categories,
+                }
+            )
+        payload.append({"id": seed * 10**4 + game_ix, "teams": teams})
+    return payload
+
+
+def games(count: int, seed: int = 0) -> List[Dict]:
+    """
+    get_games responses for `count` games spread over the 2000-2022
+    seasons. About one game in twenty goes to overtime, and one in fifty
+    has no line scores, as in older seasons.
+    """
+    rng = random.Random(seed)
+    payload = []
+    for game_ix in range(count):
+        season = rng.randrange(2000, 2023)
+        postseason = rng.random() < 0.05
+        month, day = (
+            (1, rng.randrange(1, 10))
+            if postseason
+            else (
+                rng.choice([9, 10, 11]),
+                rng.randrange(1, 29),
+            )
+        )  # noqa
+        line_scores = []
+        for _ in range(2):
+            periods = 4 + (rng.randrange(1, 4) if rng.random() < 0.05 else 0)
+            scores = [rng.choice([0, 3, 7, 10, 14]) for _ in range(periods)]
+            line_scores.append(None if rng.random() < 0.02 else scores)
+        date = f"{season + postseason}-{month:02d}-{day:02d}"
+        payload.append(
+            {
+                "id": seed * 10**6 + game_ix,
+                "season": season,
+                "week": 1 if postseason else rng.randrange(1, 16),
+                "season_type": "postseason" if postseason else "regular",
+                "start_date": f"{date}T23:30:00.000Z",
+                "neutral_site": rng.random() < 0.1,
+                "conference_game": rng.random() < 0.6,
+                "home_team": f"School {rng.randrange(130)}",
+                "home_conference": rng.choice(CONFERENCES),
+                "home_points": sum(line_scores[0] or []),
+                "home_line_scores": line_scores[0],
+                "away_team": f"School {rng.randrange(130)}",
+                "away_conference": rng.choice(CONFERENCES),
+                "away_points": sum(line_scores[1] or []),
+                "away_line_scores": line_scores[1],
+            }
+        )
+    return payload
+
+
+POLLS = [
+    "AP Top 25",
+    "Coaches Poll",
+    "FCS Coaches Poll",
+    "Playoff Committee Rankings",
+]  # noqa
+
+
+def rankings(season: int, seed: int = 0) -> List[Dict]:
+    """A season of get_rankings responses, one per week of SEASON_TYPES."""
+    rng = random.Random(seed)
+    payload = []
+    for season_type in SEASON_TYPES:
+        for week in WEEKS if season_type == "regular" else [1]:
+            polls = [
+                {
+                    "poll": poll,
+                    "ranks": [
+                        {
+                            "rank": rank,
+                            "school": f"School {rng.randrange(130)}",
+                            "conference": rng.choice(CONFERENCES),
+                            "first_place_votes": rng.randrange(60)
+                            if rank < 4
+                            else None,
+                            "points": 1600 - rank * 60,
+                        }
+                        for rank in range(1, 26)
+                    ],
+                }
+                for poll in POLLS
+            ]
+            payload.append(
+                {
+                    "season": season,
+                    "season_type": season_type,
+                    "week": week,
+                    "polls": polls,
+                }
+            )
+    return payload
+
+
+def coaches(year: int, count: int = 130, seed: int = 0) -> List[Dict]:
+    """A get_coaches response: `count` head coaches of one season."""
+    rng = random.Random(seed)
+    payload = []
+    for coach_ix in range(count):
+        hired = rng.randrange(year - 15, year + 1)
+        wins = rng.randrange(13)
+        payload.append(
+            {
+                "first_name": f"First {coach_ix}",
+                "last_name": f"Last {rng.randrange(10**4)}",
+                "hire_date": f"{hired}-12-0{rng.randrange(1, 10)}T00:00:00.000Z",  # noqa
+                "seasons": [
+                    {
+                        "school": f"School {coach_ix}",
+                        "year": year,
+                        "games": 12,
+                        "wins": wins,
+                        "losses": 12 - wins,
+                        "ties": 0,
+                        "preseason_rank": rng.choice(
+                            [None, rng.randrange(1, 26)]
+                        ),  # noqa
+                        "postseason_rank": rng.choice(
+                            [None, rng.randrange(1, 26)]
+                        ),  # noqa
+                        "srs": round(rng.uniform(-20, 30), 1),
+                        "sp_overall": round(rng.uniform(-20, 30), 1),
+                        "sp_offense": round(rng.uniform(15, 45), 1),
+                        "sp_defense": round(rng.uniform(10, 40), 1),
+                    }
+                ],
+            }
+        )
+    return payload
+
+
+def calendar(year: int) -> List[Dict]:
+    """A get_calendar response: regular season weeks 1-15, one bowl week."""
+    weeks = [("regular", week) for week in range(1, 16)] + [("postseason", 1)]
+    return [
+        {"season": year, "week": week, "season_type": season_type}
+        for season_type, week in weeks
+    ]
+
+
+def write_week_files(
+    data_dir: str, endpoint_name: str, files: int, games: int = 2
+) -> None:  # noqa
+    """
+    Write `files` per-week files for endpoint_name under data_dir, walking
+    back through the seasons 32 weeks at a time.
+    """
+    path = join(data_dir, endpoint_name)
+    os.makedirs(path, exist_ok=True)
+    partitions = (
+        (year, season_type, week)
+        for year in range(2022, 1900, -1)
+        for season_type in SEASON_TYPES
+        for week in WEEKS
+    )
+    for ix, (year, season_type, week) in zip(range(files), partitions):
+        file_name = partition_file_name(endpoint_name, year, season_type, week)
+        with open(join(path, file_name), "w") as f:
+            f.write(json.dumps(player_game_stats(games, seed=ix)))
@@ -46,6 +46,10 @@ setup(
     package_dir={"atd_utils": "atd_utils"},
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        # The Parquet tier of load_to_df, see atd_utils.columnar_cache.
+        "columnar": ["pyarrow>=14.0"],
+    },
     license="ISCL",
     zip_safe=False,
     keywords="atd_utils",
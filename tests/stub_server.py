@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+A local stand-in for the CFBD HTTP API used by tests and benchmarks.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = dict(parse_qsl(url.query))
+        with self.server.lock:
+            self.server.requests.append((url.path, query))
+        status, headers, body = self.server.handler(url.path, query)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded keep-alive HTTP server that counts connections and requests.
+
+    Args:
+        handler: Callable taking (path, query_dict) and returning a
+            (status, headers, body) tuple. body may be bytes or any JSON
+            serializable object. Defaults to an empty list for every path.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, handler=None):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.handler = handler or (lambda path, query: (200, {}, []))
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = []
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_request(self):
+        request = super().get_request()
+        with self.lock:
+            self.connections += 1
+        return request
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
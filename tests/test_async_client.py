@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_async_client
+----------------------------------
+
+Tests for `atd_utils.async_client` module, run against a local stub of the
+CFBD API.
+"""
+
+import unittest
+import asyncio
+import shutil
+import os
+from os.path import join
+import sys
+
+from atd_utils.async_client import AsyncCfbdClient
+from atd_utils.data_utils import CfbdClient, ApiRequestError
+from atd_utils.instrumentation import MetricsCollector
+from tests.stub_server import StubServer
+
+
+def fake_cfbd(path, query):
+    """
+    Answer /calendar, /games and /games/players like the CFBD API would.
+    """
+    if path == "/games":
+        game = {
+            "id": int(query["year"]) * 10,
+            "season": int(query["year"]),
+            "season_type": query["seasonType"],
+            "home_team": "Georgia",
+            "home_line_scores": [7, 0, 14, 3],
+        }
+        return 200, {}, [game]
+    if path == "/calendar":
+        weeks = [("regular", week) for week in range(1, 17)]
+        return (
+            200,
+            {},
+            [
+                {"season": int(query["year"]), "week": week, "seasonType": st}
+                for st, week in weeks + [("postseason", 1)]
+            ],
+        )
+    if path == "/games/players":
+        if query["seasonType"] == "postseason" and query["week"] != "1":
+            return 200, {}, []
+        game = {
+            "id": int(query["week"]),
+            "teams": [{"school": "Georgia", "categories": []}],
+        }
+        return 200, {}, [game]
+    return 404, {}, {"message": "not found"}
+
+
+class TestAsyncCfbdClient(unittest.TestCase):
+    def setUp(self):
+        self.sync_dir = "test_data_sync123"
+        self.async_dir = "test_data_async123"
+        self.server = StubServer(fake_cfbd).__enter__()
+        self.sync_client = CfbdClient(
+            api_key="your_api_key_here",
+            data_dir=self.sync_dir,
+            scratch_dir=join(self.sync_dir, "scratch"),
+            requests_per_second=1000,
+        )
+        self.client = AsyncCfbdClient(
+            api_key="your_api_key_here",
+            data_dir=self.async_dir,
+            scratch_dir=join(self.async_dir, "scratch"),
+            requests_per_second=1000,
+        )
+        for client in [self.sync_client, self.client]:
+            client.cfbd_configuration.host = self.server.url
+
+    def tearDown(self):
+        self.server.__exit__()
+        shutil.rmtree(self.sync_dir, ignore_errors=True)
+        shutil.rmtree(self.async_dir, ignore_errors=True)
+
+    def test_pull_data_matches_sync_client(self):
+        """
+        Test that the async client returns the same records and writes the
+        same files as CfbdClient.
+        """
+        years = range(2019, 2022)
+        expected = self.sync_client.pull_data(years, "get_games")
+        sync_requests = len(self.server.requests)
+        results = asyncio.run(self.client.pull_data(years, "get_games"))
+        assert results == expected
+        assert len(self.server.requests) == 2 * sync_requests
+        assert sorted(os.listdir(join(self.sync_dir, "get_games"))) == sorted(
+            os.listdir(join(self.async_dir, "get_games"))
+        )
+
+    def test_metrics_match_sync_client(self):
+        """
+        Test that the async client counts requests, records and bytes like
+        CfbdClient does.
+        """
+        for client in [self.sync_client, self.client]:
+            client.metrics = MetricsCollector()
+        self.sync_client.pull_data(range(2020, 2022), "get_games")
+        asyncio.run(self.client.pull_data(range(2020, 2022), "get_games"))
+        for name in ["requests", "records", "bytes_received"]:
+            expected = self.sync_client.metrics.counter(
+                name, endpoint="get_games"
+            )  # noqa
+            assert expected > 0
+            actual = self.client.metrics.counter(name, endpoint="get_games")
+            assert actual == expected
+        for name in ["request", "response_parse"]:
+            stats = self.client.metrics.span_stats(name, endpoint="get_games")
+            assert stats["count"] == 4
+
+    def test_pull_year_weeks(self):
+        """Test that weekly endpoints are pulled and saved per week."""
+        endpoint_name = "get_player_game_stats"
+        expected = self.sync_client.pull_year(2021, endpoint_name)
+        results = asyncio.run(self.client.pull_year(2021, endpoint_name))
+        assert results == expected
+        assert len(results) == 17
+        week_files = os.listdir(join(self.async_dir, "get_player_game_stats"))
+        assert "get_player_game_stats_2021_regular_16.json" in week_files
+
+    def test_inherited_sync_methods(self):
+        """
+        Test that the synchronous methods inherited from CfbdClient make
+        blocking requests instead of returning coroutines.
+        """
+        batches = list(self.client.iter_pull(2021, "get_games"))
+        assert [len(records) for _, records in batches] == [1, 1]
+        missing = self.client.missing_partitions("get_player_game_stats", 2021)  # noqa
+        assert len(missing) == 17
+        asyncio.run(self.client.pull_year(2021, "get_player_game_stats"))
+        assert (
+            self.client.missing_partitions("get_player_game_stats", 2021) == []
+        )  # noqa
+
+    def test_client_error(self):
+        """Test that a 404 raises ApiRequestError without retrying."""
+
+        async def pull():
+            async with self.client:
+                return await self.client.ahit_endpoint(
+                    "TeamsApi",
+                    "get_fbs_teams",
+                    {},
+                )
+
+        with self.assertRaises(ApiRequestError) as context:
+            asyncio.run(pull())
+        assert context.exception.status == 404
+        assert len(self.server.requests) == 1
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -14,9 +14,12 @@ import os
 from os.path import join
 import sys
 import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import sqlite3
-from atd_utils import data_utils
+from atd_utils import data_utils, database
 
 # from atd_utils.cfbd_endpoint_configs import ENDPOINTS_DICT
 from atd_utils.data_utils import (
@@ -26,6 +29,10 @@ from atd_utils.data_utils import (
     EndpointLoadingNotImplemented,
 )  # noqa
 from unittest.mock import patch, MagicMock
+from atd_utils.cache import current_season
+from atd_utils.compression import AtomicWriter
+from atd_utils.instrumentation import MetricsCollector, to_prometheus
+from tests.stub_server import StubServer
 
 
 class TestCfbdClient(unittest.TestCase):
@@ -284,6 +291,666 @@ class TestCfbdClient(unittest.TestCase):
         assert results[2] == 2001
         assert results[3] == 2000
 
+    def test_pull_data_parallel(self):
+        """
+        Test that pull_data pulls years concurrently and still returns them
+        from the most recent year to the oldest.
+        """
+        my_api = self.client
+        lock = threading.Lock()
+        in_flight = []
+        max_in_flight = []
+
+        def mock_pull_year(
+            year, endpoint_name, request_params, save, force, iter_teams
+        ):
+            with lock:
+                in_flight.append(year)
+                max_in_flight.append(len(in_flight))
+            # Older years finish first.
+            time.sleep((year - 2010) * 0.002)
+            with lock:
+                in_flight.remove(year)
+            return [year, year]
+
+        my_api.pull_year = MagicMock(side_effect=mock_pull_year)
+
+        results = my_api.pull_data(
+            range(2010, 2021), "my_endpoint", max_workers=4
+        )  # noqa
+        assert len(results) == 22
+        assert results[::2] == list(range(2020, 2009, -1))
+        assert max(max_in_flight) > 1
+        assert max(max_in_flight) <= 4
+
+    def test_pull_data_parallel_iter_teams(self):
+        """
+        Test that a parallel pull over teams loads the teams on the calling
+        thread, whose connection the worker threads can't use.
+        """
+        teams = [{"id": 1, "school": "Georgia", "logos": []}]
+        self.client.save_partition("get_fbs_teams", teams, 2020)
+        pulled = []
+
+        def pull_over_teams(
+            request_func, api_name, endpoint_name, request_params, teams
+        ):
+            pulled.append(request_params["year"])
+            return [
+                {"year": request_params["year"], "school": school}
+                for school in teams.school
+            ]
+
+        pull_config = {"api": "TeamsApi", "pull_func": pull_over_teams}
+        endpoints = {"my_endpoint": {"pull": pull_config}}
+        with patch.dict(data_utils.ENDPOINTS_DICT, endpoints):
+            results = self.client.pull_data(
+                range(2018, 2022),
+                "my_endpoint",
+                save=False,
+                iter_teams=True,
+                max_workers=4,
+            )
+        assert sorted(pulled) == [2018, 2019, 2020, 2021]
+        assert [r["year"] for r in results] == [2021, 2020, 2019, 2018]
+        assert {r["school"] for r in results} == {"Georgia"}
+
+    def test_hit_endpoint_reuses_connections(self):
+        """
+        Test that every hit_endpoint call shares one pooled ApiClient and so
+        one keep-alive connection.
+        """
+        with StubServer() as server:
+            self.client.cfbd_configuration.host = server.url
+            for week in range(1, 9):
+                data = self.client.hit_endpoint(
+                    "GamesApi", "get_games", {"year": 2021, "week": week}
+                )
+                assert data == []
+            assert len(server.requests) == 8
+            assert server.connections == 1
+            # Repeated calls are answered from the response cache.
+            params = {"week": 1, "year": 2021}
+            self.client.hit_endpoint("GamesApi", "get_games", params)
+            assert len(server.requests) == 8
+        games_api = self.client.get_api_instance("GamesApi")
+        assert games_api is self.client.get_api_instance("GamesApi")
+        teams_api = self.client.get_api_instance("TeamsApi")
+        assert teams_api.api_client is games_api.api_client
+
+    def test_pull_year_incremental(self):
+        """
+        Test that incremental pulls reuse finished seasons from the cache
+        and always pull the current season again.
+        """
+        hit_endpoint = MagicMock(
+            side_effect=lambda api, endpoint, params: [dict(params)]
+        )
+        self.client.hit_endpoint = hit_endpoint
+        first = self.client.pull_year(2015, "get_games")
+        assert hit_endpoint.call_count == 2
+        assert os.path.exists(
+            join(self.data_dir, "get_games", "get_games_2015.json")
+        )  # noqa
+
+        cached = self.client.pull_year(2015, "get_games", incremental=True)
+        assert cached == first
+        assert hit_endpoint.call_count == 2
+
+        self.client.pull_year(current_season(), "get_games", incremental=True)
+        self.client.pull_year(current_season(), "get_games", incremental=True)
+        assert hit_endpoint.call_count == 6
+
+    def test_pull_year_incremental_weeks(self):
+        """
+        Test that weekly endpoints pull the weeks of the season's calendar,
+        are cached per week, and only missing weeks are pulled again.
+        """
+        calendar = [
+            {"season": 2015, "week": week, "season_type": "regular"}
+            for week in range(0, 15)
+        ] + [{"season": 2015, "week": 1, "season_type": "postseason"}]
+
+        def fake_hit_endpoint(api, endpoint, params):
+            if endpoint == "get_calendar":
+                return calendar
+            return [dict(params)]
+
+        hit_endpoint = MagicMock(side_effect=fake_hit_endpoint)
+        self.client.hit_endpoint = hit_endpoint
+        endpoint_name = "get_player_game_stats"
+        first = self.client.pull_year(2015, endpoint_name)
+        assert hit_endpoint.call_count == 17
+        endpoint_dir = join(self.data_dir, endpoint_name)
+        week_files = [f for f in os.listdir(endpoint_dir) if f[0] != "."]
+        assert len(week_files) == 16
+        assert f"{endpoint_name}_2015_regular_0.json" in week_files
+        assert f"{endpoint_name}_2015_postseason_1.json" in week_files
+        assert f"{endpoint_name}_2015_postseason_2.json" not in week_files
+
+        os.remove(join(endpoint_dir, f"{endpoint_name}_2015_regular_3.json"))
+        second = self.client.pull_year(2015, endpoint_name, incremental=True)
+        assert hit_endpoint.call_count == 18
+        assert hit_endpoint.call_args[0][2]["week"] == 3
+        assert second == first
+
+        # Without a calendar, weeks 1-16 of both season types are pulled.
+        calendar = []
+        self.client.pull_year(2016, endpoint_name)
+        assert hit_endpoint.call_count == 18 + 1 + 32
+
+    def test_cache_manifest(self):
+        """
+        Test that the manifest indexes saved and foreign partition files,
+        that loads find their files through it, and that it reports the
+        partitions missing from the cache.
+        """
+        calendar = [
+            {"season": 2015, "week": week, "season_type": "regular"}
+            for week in range(1, 4)
+        ]
+
+        def fake_hit_endpoint(api, endpoint, params):
+            if endpoint == "get_calendar":
+                return calendar
+            return []
+
+        self.client.hit_endpoint = MagicMock(side_effect=fake_hit_endpoint)
+        endpoint_name = "get_player_game_stats"
+        endpoint_dir = join(self.data_dir, endpoint_name)
+        missing = self.client.missing_partitions(endpoint_name, 2015)
+        assert [key["week"] for key in missing] == [1, 2, 3]
+        self.client.pull_year(2015, endpoint_name)
+        assert self.client.missing_partitions(endpoint_name, 2015) == []
+        os.remove(join(endpoint_dir, f"{endpoint_name}_2015_regular_2.json"))
+        assert self.client.missing_partitions(endpoint_name, 2015) == [
+            {"year": 2015, "season_type": "regular", "week": 2}
+        ]
+
+        for year in [2020, 2021]:
+            self.save_games(year)
+        entries = self.client.manifest.entries("get_games")
+        entry = entries["get_games_2020.json"]
+        path = join(self.data_dir, "get_games", "get_games_2020.json")
+        assert entry["year"] == 2020 and entry["week"] is None
+        assert entry["records"] == 3
+        assert entry["bytes"] == os.path.getsize(path)
+        assert len(entry["checksum"]) == 64
+
+        # Files saved some other way are indexed, and deleted ones dropped.
+        shutil.copy(
+            path, join(self.data_dir, "get_games", "get_games_2019.json")
+        )  # noqa
+        os.remove(join(self.data_dir, "get_games", "get_games_2021.json"))
+        df = self.client.load_to_df("get_games")
+        assert sorted(df.season.unique().tolist()) == [2020]
+        assert sorted(self.client.manifest.partitions("get_games")) == [
+            "get_games_2019.json",
+            "get_games_2020.json",
+        ]
+        # An unchanged directory isn't listed again.
+        with patch("atd_utils.cache.RACY_SECONDS", 0):
+            self.client.load_to_df("get_games", years=[2019])
+            with patch("atd_utils.cache.os.listdir") as listdir:
+                self.client.frame_cache.clear()
+                df = self.client.load_to_df("get_games", years=[2019])
+            listdir.assert_not_called()
+        assert len(df) == 3
+
+    def test_load_to_df_week_files(self):
+        """
+        Test that per-week files load into one frame with a fresh index and
+        the year, season_type and week taken from each file name.
+        """
+        endpoint_name = "get_player_game_stats"
+        game = {
+            "id": 1,
+            "teams": [
+                {
+                    "school": "Georgia",
+                    "conference": "SEC",
+                    "homeAway": "home",
+                    "categories": [
+                        {
+                            "name": "passing",
+                            "types": [
+                                {
+                                    "name": "YDS",
+                                    "athletes": [
+                                        {"id": "1", "name": "A", "stat": "9"},
+                                        {"id": "2", "name": "B", "stat": "3"},
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+        for week in range(1, 4):
+            self.client.save_partition(
+                endpoint_name, [game], 2021, "regular", week
+            )  # noqa
+        df = self.client.load_to_df(endpoint_name)
+        assert df.shape[0] == 6
+        assert df.index.tolist() == list(range(6))
+        assert sorted(df.week.unique().tolist()) == [1, 2, 3]
+        assert df.season_type.unique().tolist() == ["regular"]
+        assert df.year.unique().tolist() == [2021]
+
+        assert df.game_id.dtype == "int64"
+
+        # Empty weeks change neither the dtypes nor the column order.
+        self.client.save_partition(endpoint_name, [], 2021, "postseason", 1)
+        with_empty = self.client.load_to_df(endpoint_name)
+        pd.testing.assert_frame_equal(with_empty, df)
+
+        self.client.frame_cache.clear()
+        parallel_df = self.client.load_to_df(endpoint_name, max_workers=2)
+        pd.testing.assert_frame_equal(parallel_df, df)
+        self.client.columnar = False
+        self.client.frame_cache.clear()
+        streamed_df = self.client.load_to_df(endpoint_name, streaming=True)
+        pd.testing.assert_frame_equal(streamed_df, df)
+
+    def save_games(self, year, home_points=7):
+        games = [
+            {
+                "id": year * 10 + ix,
+                "season": year,
+                "week": ix + 1,
+                "season_type": "postseason" if ix == 2 else "regular",
+                "start_date": f"{year}-09-0{ix + 1}T23:30:00.000Z",
+                "home_team": "Georgia",
+                "away_team": "Clemson",
+                "home_line_scores": [home_points, 0, 14, 3, 7][: 3 + ix],
+                "away_line_scores": None if ix else [3, 3, 3, 3],
+            }
+            for ix in range(3)
+        ]
+        self.client.save_partition("get_games", games, year)
+
+    def test_compressed_cache(self):
+        """
+        Test that compressed partitions load like uncompressed ones, are
+        checksummed, and that corrupt files are detected.
+        """
+        self.save_games(2020)
+        plain = self.client.load_to_df("get_games")
+        self.client.compression = "gzip"
+        self.save_games(2020)
+        self.save_games(2021)
+        path = join(self.data_dir, "get_games", "get_games_2020.json")
+        with open(path, "rb") as f:
+            assert f.read(2) == b"\x1f\x8b"
+        # A temporary file left behind by a crashed write isn't loaded.
+        stale = AtomicWriter(path)._tmp_path
+        with open(stale, "w") as f:
+            f.write('[{"id": ')
+        self.client.frame_cache.clear()
+        mixed = self.client.load_to_df("get_games")
+        assert len(mixed) == 6
+        assert sorted(self.client.manifest.partitions("get_games")) == [
+            "get_games_2020.json",
+            "get_games_2021.json",
+        ]
+        pd.testing.assert_frame_equal(
+            mixed[mixed.season == 2020].reset_index(drop=True), plain
+        )
+
+        entry = self.client.manifest.get("get_games", "get_games_2020.json")
+        assert len(entry["checksum"]) == 64
+        assert self.client.verify_cache("get_games") == []
+        records = self.client.read_cached_partition("get_games", 2020)
+        assert len(records) == 3
+        with open(path, "r+b") as f:
+            f.seek(20)
+            f.write(b"\x00")
+        assert self.client.verify_cache("get_games") == ["get_games_2020.json"]
+        assert self.client.read_cached_partition("get_games", 2020) is None
+        with self.assertRaises(ValueError):
+            CfbdClient(api_key="key", data_dir=self.data_dir, compression="bz2")  # noqa
+
+    def test_columnar_needs_pyarrow_14(self):
+        """
+        Test that the columnar cache is only turned on by default with a
+        pyarrow it works with, and can't be turned on with an older one.
+        """
+        with patch("atd_utils.columnar_cache.pa.__version__", "13.0.0"):
+            assert not data_utils.columnar_cache.available()
+            client = CfbdClient(api_key="key", data_dir=self.data_dir)
+            assert client.columnar is False
+            with self.assertRaises(ValueError):
+                CfbdClient(api_key="key", data_dir=self.data_dir, columnar=True)  # noqa
+        with patch("atd_utils.columnar_cache.pa.__version__", "14.0.1"):
+            assert data_utils.columnar_cache.available()
+
+    def test_load_to_df_columnar(self):
+        """
+        Test that warm loads read the Parquet copies, return the same frame
+        as the JSON load, and notice when a JSON file changes.
+        """
+        for year in [2020, 2021, 2022]:
+            self.save_games(year)
+        cold = self.client.load_to_df("get_games")
+        columnar_dir = join(self.data_dir, "get_games", ".columnar")
+        assert len(os.listdir(columnar_dir)) == 3
+        self.client.frame_cache.clear()
+        with patch("atd_utils.data_utils.load_file") as load_file:
+            warm = self.client.load_to_df("get_games")
+            assert load_file.call_count == 0
+        pd.testing.assert_frame_equal(warm, cold)
+
+        self.save_games(2021, home_points=21)
+        df = self.client.load_to_df(
+            "get_games", years=[2021], columns=["id", "home_q1_points"]
+        )
+        assert df.columns.tolist() == ["id", "home_q1_points"]
+        assert df.id.tolist() == [20210, 20211, 20212]
+        assert df.home_q1_points.tolist() == [21, 21, 21]
+
+    def test_load_to_df_pushdown(self):
+        """
+        Test that filters skip the files their names rule out, filter rows
+        on the fields the names don't hold, and project columns.
+        """
+        self.client.columnar = False
+        endpoint_name = "get_player_game_stats"
+        endpoint_dir = join(self.data_dir, endpoint_name)
+        game = {
+            "id": 1,
+            "teams": [
+                {
+                    "school": "Georgia",
+                    "conference": "SEC",
+                    "homeAway": "home",
+                    "categories": [
+                        {
+                            "name": "passing",
+                            "types": [
+                                {
+                                    "name": "YDS",
+                                    "athletes": [
+                                        {"id": "1", "name": "A", "stat": "9"},
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        }
+        for week in range(1, 4):
+            self.client.save_partition(
+                endpoint_name, [game], 2021, "regular", week
+            )  # noqa
+        # Opening a file the filters rule out would fail.
+        with open(
+            join(endpoint_dir, f"{endpoint_name}_2020_regular_1.json"), "w"
+        ) as f:  # noqa
+            f.write("not json")
+        df = self.client.load_to_df(
+            endpoint_name,
+            years=[2021],
+            weeks=[2, 3],
+            season_types=["regular"],
+            columns=["athlete_name", "week"],
+        )
+        assert df.columns.tolist() == ["athlete_name", "week"]
+        assert sorted(df.week.tolist()) == [2, 3]
+
+        for year in [2020, 2021]:
+            self.save_games(year)
+        df = self.client.load_to_df(
+            "get_games",
+            years=[2021],
+            season_types=["regular"],
+        )
+        assert df.id.tolist() == [20210, 20211]
+        assert df.index.tolist() == [0, 1]
+        columns = ["id", "home_team"]
+        df = self.client.load_to_df("get_games", weeks=[3], columns=columns)
+        assert df.columns.tolist() == ["id", "home_team"]
+        assert sorted(df.id.tolist()) == [20202, 20212]
+
+    def test_load_to_df_no_matches(self):
+        """Test that filters no file matches load an empty frame."""
+        self.save_games(2020)
+        df = self.client.load_to_df("get_games", years=[1999])
+        assert df.empty
+        df = self.client.load_to_df("get_games", years=[1999], columns=["id"])
+        assert df.empty
+
+    def test_load_to_df_upsert(self):
+        """
+        Test that upserts only write new or changed partitions, replace
+        rows by their natural key, and index the table.
+        """
+        for year in [2020, 2021]:
+            self.save_games(year)
+        self.client.load_to_df("get_games", write_mode="upsert")
+        count = "SELECT COUNT(*) FROM get_games"
+        assert self.conn.execute(count).fetchone()[0] == 6
+        index_list = self.conn.execute("PRAGMA index_list(get_games)")
+        indexes = {row[1] for row in index_list}
+        assert "ux_get_games_key" in indexes
+        assert "ix_get_games_season_week" in indexes
+
+        # Rows of unchanged partitions are left alone.
+        with self.conn:
+            self.conn.execute("UPDATE get_games SET home_team = 'x'")
+        self.save_games(2021, home_points=21)
+        path = join(self.data_dir, "get_games", "get_games_2021.json")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        self.save_games(2022)
+        self.client.load_to_df(
+            "get_games", save_to_db=True, write_mode="upsert"
+        )  # noqa
+        df = pd.read_sql_query(
+            "SELECT id, home_team, home_q1_points FROM get_games ORDER BY id",
+            self.conn,
+        )
+        assert df.id.tolist() == [
+            20200,
+            20201,
+            20202,
+            20210,
+            20211,
+            20212,
+            20220,
+            20221,
+            20222,
+        ]  # noqa
+        assert df.home_team.tolist()[:3] == ["x"] * 3
+        assert df.home_team.tolist()[3:] == ["Georgia"] * 6
+        assert df.home_q1_points.tolist()[3:6] == [21, 21, 21]
+
+        with patch("atd_utils.database.frame_rows") as frame_rows:
+            self.client.load_to_df(
+                "get_games", save_to_db=True, write_mode="append"
+            )  # noqa
+            assert frame_rows.call_count == 0
+
+    def test_load_to_df_filtered_upsert_rebuilds(self):
+        """
+        Test that a filtered upsert into a table the replace mode wrote
+        rebuilds it from every partition instead of dropping the others.
+        """
+        for year in [2020, 2021, 2022]:
+            self.save_games(year)
+        self.client.load_to_df("get_games")
+        self.client.load_to_df(
+            "get_games", years=[2022], save_to_db=True, write_mode="upsert"
+        )
+        seasons = self.conn.execute(
+            "SELECT season, COUNT(*) FROM get_games GROUP BY season"
+        ).fetchall()
+        assert seasons == [(2020, 3), (2021, 3), (2022, 3)]
+
+        # Loads that can't be written are refused rather than skipped.
+        with self.assertRaises(ValueError):
+            self.client.load_to_df("get_games", years=[2022], save_to_db=True)
+        with self.assertRaises(ValueError):
+            self.client.load_to_df(
+                "get_games",
+                columns=["id"],
+                save_to_db=True,
+                write_mode="upsert",
+            )
+
+        self.client.load_to_df("get_games", save_to_db=True)
+        with self.assertRaises(ValueError):
+            database.write_partitions(
+                self.client.conn,
+                "get_games",
+                self.client.load_to_df("get_games", years=[2022]),
+                join(self.data_dir, "get_games"),
+                {"get_games_2022.json": {"year": 2022}},
+                complete=False,
+            )
+
+    def test_query(self):
+        """
+        Test that queries run on pooled WAL connections from many threads,
+        and read the committed data while a write is in progress.
+        """
+        for year in [2020, 2021]:
+            self.save_games(year)
+        self.client.load_to_df("get_games")
+        mode = self.client.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+        sql = "SELECT id FROM get_games WHERE season = ? ORDER BY id"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            frames = list(
+                executor.map(
+                    lambda year: self.client.query(sql, (year,)),
+                    [2020, 2021] * 8,
+                )
+            )
+        assert frames[1].id.tolist() == [20210, 20211, 20212]
+        assert self.client.read_pool._opened <= self.client.read_pool.size
+
+        self.client.conn.execute("DELETE FROM get_games")
+        assert self.client.conn.in_transaction
+        table = self.client.query(
+            "SELECT COUNT(*) AS n FROM get_games", arrow=True
+        )  # noqa
+        assert table.column("n").to_pylist() == [6]
+        self.client.conn.commit()
+        assert self.client.query("SELECT * FROM get_games").empty
+        with patch("atd_utils.data_utils.pa", None):
+            with self.assertRaises(ValueError):
+                self.client.query("SELECT * FROM get_games", arrow=True)
+
+    def test_load_to_df_frame_cache(self):
+        """
+        Test that repeated loads come from the frame cache until one of the
+        endpoint's files changes, and that callers get their own copy.
+        """
+        for year in [2020, 2021]:
+            self.save_games(year)
+        first = self.client.load_to_df("get_games")
+        first["id"] = 0
+        with patch.object(CfbdClient, "_load_files") as load_files:
+            second = self.client.load_to_df("get_games")
+            assert load_files.call_count == 0
+        assert second.id.tolist() != [0] * 6
+
+        self.save_games(2022)
+        third = self.client.load_to_df("get_games")
+        assert len(third) == 9
+        assert len(self.client.load_to_df("get_games", years=[2022])) == 3
+        assert len(self.client.frame_cache) == 2
+
+    @patch("retrying.time.sleep", MagicMock())
+    def test_metrics(self):
+        """
+        Test that pulls and loads report their spans and counters to the
+        client's metrics.
+        """
+        metrics = MetricsCollector()
+        self.client.metrics = metrics
+        statuses = [503]
+        game = {
+            "id": 1,
+            "season": 2021,
+            "week": 1,
+            "season_type": "regular",
+            "home_team": "Georgia",
+        }
+
+        def handler(path, query):
+            if statuses:
+                return statuses.pop(), {}, {"message": "unavailable"}
+            return 200, {}, [game]
+
+        with StubServer(handler) as server:
+            self.client.cfbd_configuration.host = server.url
+            self.client.pull_year(2021, "get_games")
+            self.client.pull_year(2021, "get_games")
+        endpoint = {"endpoint": "get_games"}
+        assert metrics.counter("requests", **endpoint) == 2
+        assert metrics.counter("retries", **endpoint) == 1
+        assert metrics.counter("response_cache_hits", **endpoint) == 2
+        assert metrics.counter("records", **endpoint) == 4
+        assert metrics.counter("bytes_received", **endpoint) > 0
+        assert metrics.span_stats("request", **endpoint)["count"] == 3
+        assert metrics.span_stats("response_parse", **endpoint)["count"] == 2
+        path = join(self.data_dir, "get_games", "get_games_2021.json")
+        size = os.path.getsize(path)
+        assert metrics.counter("bytes_written", **endpoint) == 2 * size
+
+        self.client.load_to_df("get_games")
+        self.client.load_to_df("get_games")
+        for span in ["load", "file_parse", "normalize", "df_load_process"]:
+            assert metrics.span_stats(span, **endpoint)["count"] >= 1, span
+        assert metrics.counter("frame_cache_hits", **endpoint) == 1
+        assert metrics.counter("rows_written", table="get_games") == 2
+        stats = metrics.span_stats(
+            "sql_write", table="get_games", mode="replace"
+        )  # noqa
+        assert stats["count"] == 1
+        text = to_prometheus(metrics)
+        assert 'atd_requests_total{endpoint="get_games"} 2' in text
+        assert 'atd_load_seconds_count{endpoint="get_games"} 2' in text
+
+    def test_iter_pull(self):
+        """
+        Test that iter_pull yields each request's records lazily and writes
+        the same files pull_year does.
+        """
+        hit_endpoint = MagicMock(
+            side_effect=lambda api, endpoint, params: [dict(params)] * 2
+        )
+        self.client.hit_endpoint = hit_endpoint
+        expected = self.client.pull_year(2015, "get_games")
+        path = join(self.data_dir, "get_games", "get_games_2015.json")
+        with open(path, "rb") as f:
+            expected_file = json.loads(f.read())
+
+        batches = self.client.iter_pull([2014, 2015], "get_games")
+        params, batch = next(batches)
+        assert hit_endpoint.call_count == 3
+        assert params == {"year": 2015, "season_type": "regular"}
+        assert batch == expected[:2]
+        rest = list(batches)
+        assert [p["year"] for p, _ in rest] == [2015, 2014, 2014]
+        with open(path, "rb") as f:
+            assert json.loads(f.read()) == expected_file
+        assert os.path.exists(path.replace("2015", "2014"))
+
+        # A stream closed part way through a year leaves no partial file.
+        batches = self.client.iter_pull(2013, "get_games")
+        next(batches)
+        batches.close()
+        assert not os.path.exists(path.replace("2015", "2013"))
+        assert not [
+            f
+            for f in os.listdir(join(self.data_dir, "get_games"))
+            if f.endswith(".tmp")
+        ]  # noqa
+
 
 if __name__ == "__main__":
     sys.exit(unittest.main())
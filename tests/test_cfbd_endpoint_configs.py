@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_cfbd_endpoint_configs
+----------------------------------
+
+Tests for `atd_utils.cfbd_endpoint_configs` module.
+"""
+
+import unittest
+import sys
+import random
+import time
+import threading
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from atd_utils.cfbd_endpoint_configs import (
+    calendar_weeks,
+    PLAYER_GAME_STATS_CATEGORICALS,
+    get_player_game_stats_to_df,
+    get_rankings_load_process,
+    load_games_load_process,
+    pull_over_season_types_and_weeks,
+    pull_over_season_types,
+)
+
+
+def legacy_load_games_load_process(df: pd.DataFrame) -> pd.DataFrame:
+    """The row-by-row load_games_load_process, kept as a reference."""
+    for side in ["home", "away"]:
+        line_scores = df[f"{side}_line_scores"]
+        df[
+            [f"{side}_q{quarter}_points" for quarter in range(1, 5)]
+        ] = line_scores.apply(
+            lambda x: pd.Series([np.nan] * 4)
+            if x is None or len(x) == 0
+            else pd.Series(x[:4])
+        )  # noqa
+        df[f"{side}_ot_total_points"] = line_scores.apply(
+            lambda x: sum(x[4:]) if x is not None and len(x) > 4 else None
+        )
+        df[f"{side}_ot_points_per_period"] = line_scores.apply(
+            lambda x: str(x[4:]) if x is not None and len(x) > 4 else None
+        )
+        df[f"{side}_num_ot_periods"] = line_scores.apply(
+            lambda x: len(x[4:]) if x is not None and len(x) > 4 else None
+        )
+    df.drop("home_line_scores", axis=1, inplace=True)
+    df.drop("away_line_scores", axis=1, inplace=True)
+    df["game_date"] = pd.to_datetime(df.start_date)
+    df["season_year"] = df.game_date.apply(
+        lambda x: pd.to_datetime(x).year - 1
+        if pd.to_datetime(x).month < 6
+        else pd.to_datetime(x).year
+    )
+    df.drop("start_date", axis=1, inplace=True)
+    return df
+
+
+def legacy_get_player_game_stats_pre_pandas_load_process(
+    data: List[Dict],
+) -> List[Dict]:  # noqa
+    """The dict-per-row flattener get_player_game_stats used to run."""
+    rows = []
+    for game in data:
+        game_id = game["id"]
+        teams = game["teams"]
+        for team in teams:
+            categories = team["categories"]
+            if "home_away" in team.keys():
+                home_away = team["home_away"]
+                team_name = team["school"]["name"]
+                conference = team["school"]["conference"]
+            else:
+                home_away = team["homeAway"]
+                team_name = team["school"]
+                conference = team["conference"]
+            categories = team["categories"]
+            for category in categories:
+                name = category["name"]
+                types = category["types"]
+                for typ in types:
+                    typ_name = typ["name"]
+                    athletes = typ["athletes"]
+                    for athlete in athletes:
+                        athlete_id = athlete["id"]
+                        athlete_name = athlete["name"]
+                        stat = athlete["stat"]
+                        row = {
+                            "game_id": game_id,
+                            "home_away": "home" if home_away else "away",
+                            "team_name": team_name,
+                            "conference": conference,
+                            "category": name,
+                            "type": typ_name,
+                            "athlete_id": athlete_id,
+                            "athlete_name": athlete_name,
+                            "stat": stat,
+                        }
+                        rows.append(row)
+    return rows
+
+
+class TestPullFuncs(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def fake_request(self, api_name, endpoint_name, request_params):
+        """Echo the request params back after a random delay."""
+        time.sleep(random.uniform(0, 0.005))
+        with self.lock:
+            self.calls.append(request_params)
+        return [dict(request_params)]
+
+    def test_weeks_serial_order(self):
+        """
+        Test that every week of both season types is pulled in order.
+        """
+        request_params = {"year": 2021}
+        results = pull_over_season_types_and_weeks(
+            self.fake_request, "GamesApi", "get_games", request_params
+        )
+        assert len(results) == 32
+        assert [r["season_type"] for r in results[:16]] == ["regular"] * 16
+        assert [r["week"] for r in results[16:]] == list(range(1, 17))
+        assert request_params == {"year": 2021}
+
+    def test_weeks_concurrent(self):
+        """
+        Test that the concurrent mode returns the same ordered results and
+        never shares a request params dict between requests.
+        """
+        request_params = {"year": 2021}
+        serial = pull_over_season_types_and_weeks(
+            self.fake_request, "GamesApi", "get_games", request_params
+        )
+        self.calls = []
+        concurrent = pull_over_season_types_and_weeks(
+            self.fake_request,
+            "GamesApi",
+            "get_games",
+            request_params,
+            max_workers=8,
+        )
+        assert concurrent == serial
+        assert len({id(params) for params in self.calls}) == 32
+        assert request_params == {"year": 2021}
+
+    def test_calendar_weeks(self):
+        """
+        Test that only the calendar's weeks are pulled, in season type then
+        week order.
+        """
+        calendar = [
+            {"week": week, "season_type": season_type}
+            for season_type, week in [
+                ("postseason", 1),
+                ("regular", 2),
+                ("regular", 0),
+                ("regular", 1),
+                ("both", 1),
+            ]
+        ]
+        weeks = calendar_weeks(calendar)
+        assert weeks == {"regular": [0, 1, 2], "postseason": [1]}
+        results = pull_over_season_types_and_weeks(
+            self.fake_request,
+            "GamesApi",
+            "get_games",
+            {"year": 2021},
+            weeks=weeks,  # noqa
+        )
+        assert [(r["season_type"], r["week"]) for r in results] == [
+            ("regular", 0),
+            ("regular", 1),
+            ("regular", 2),
+            ("postseason", 1),
+        ]
+        assert calendar_weeks([]) == {}
+
+    def test_season_types_concurrent(self):
+        request_params = {"year": 2021}
+        results = pull_over_season_types(
+            self.fake_request,
+            "GamesApi",
+            "get_games",
+            request_params,
+            max_workers=2,
+        )
+        assert [r["season_type"] for r in results] == ["regular", "postseason"]  # noqa
+        assert request_params == {"year": 2021}
+
+
+def legacy_get_rankings_load_process(df: pd.DataFrame) -> pd.DataFrame:
+    """The explode and json_normalize get_rankings_load_process."""
+    exploded_first = df.explode("polls")
+    normalized_polls = pd.json_normalize(exploded_first["polls"])
+    recombined = pd.concat(
+        [
+            exploded_first.reset_index(drop=True),
+            normalized_polls.reset_index(drop=True),
+        ],
+        axis=1,
+    )
+    exploded_ranks = recombined.explode("ranks")
+    normalized_ranks = pd.json_normalize(exploded_ranks["ranks"])
+    final_recombined = pd.concat(
+        [
+            exploded_ranks.reset_index(drop=True),
+            normalized_ranks.reset_index(drop=True),
+        ],
+        axis=1,
+    )
+    return_cols = [
+        col for col in final_recombined.columns if col not in ["polls", "ranks"]  # noqa
+    ]  # noqa
+    return final_recombined[return_cols]
+
+
+class TestLoadProcesses(unittest.TestCase):
+    def assert_same_games(self, games):
+        expected = legacy_load_games_load_process(pd.DataFrame(games))
+        df = load_games_load_process(pd.DataFrame(games))
+        pd.testing.assert_frame_equal(df, expected)
+        return df
+
+    def test_load_games_load_process(self):
+        """
+        Test that the vectorized games process matches the row-by-row one,
+        dtypes included, with and without overtime and missing scores.
+        """
+        games = [
+            {
+                "id": ix,
+                "start_date": date,
+                "home_line_scores": home,
+                "away_line_scores": away,
+            }
+            for ix, (date, home, away) in enumerate(
+                [
+                    ("2021-09-04T23:30:00.000Z", [7, 0, 14, 3], [3, 3, 3, 3]),
+                    (
+                        "2022-01-10T01:00:00.000Z",
+                        [7, 7, 7, 7, 3],
+                        [7, 7, 7, 7, 7, 8],
+                    ),  # noqa
+                    ("2003-10-04T19:00:00.000Z", None, [0, 0, 0, 0]),
+                    ("2003-10-11T19:00:00.000Z", [], [0, 10, 0, 0]),
+                ]
+            )
+        ]
+        df = self.assert_same_games(games)
+        assert df.home_ot_points_per_period.tolist()[:2] == [None, "[3]"]
+        assert df.away_ot_total_points.tolist()[1] == 15
+        assert df.season_year.tolist() == [2021, 2021, 2003, 2003]
+        # No overtime at all, and every game in overtime.
+        self.assert_same_games(games[:1])
+        self.assert_same_games(games[1:2])
+
+    def test_get_player_game_stats_to_df(self):
+        """
+        Test that the columnar flattener produces the rows json_normalize
+        made of the pre-pandas load process, with categorical team and stat
+        columns.
+        """
+        athletes = [{"id": "1", "name": "A", "stat": "9"}]
+        categories = [
+            {
+                "name": "passing",
+                "types": [
+                    {"name": "YDS", "athletes": athletes * 2},
+                    {"name": "TD", "athletes": []},
+                ],
+            },
+            {
+                "name": "rushing",
+                "types": [{"name": "CAR", "athletes": athletes}],
+            },  # noqa
+        ]
+        data = [
+            {
+                "id": 1,
+                "teams": [
+                    {
+                        "school": "Georgia",
+                        "conference": "SEC",
+                        "homeAway": "away",
+                        "categories": categories,
+                    },
+                    {
+                        "school": {"name": "Clemson", "conference": None},
+                        "home_away": "home",
+                        "categories": categories[1:],
+                    },
+                ],
+            },
+            {"id": 2, "teams": []},
+        ]
+        expected = pd.json_normalize(
+            legacy_get_player_game_stats_pre_pandas_load_process(data)
+        )
+        df = get_player_game_stats_to_df(iter(data))
+        for column in PLAYER_GAME_STATS_CATEGORICALS:
+            assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(
+            df.astype({c: object for c in PLAYER_GAME_STATS_CATEGORICALS}),
+            expected.fillna(np.nan),
+        )
+        assert get_player_game_stats_to_df([]).empty
+
+    def test_get_rankings_load_process(self):
+        """
+        Test that the single-pass rankings flattener matches the explode
+        and json_normalize version, with a categorical poll column.
+        """
+
+        def ranks(count, votes=None):
+            return [
+                {
+                    "rank": rank,
+                    "school": f"School {rank}",
+                    "conference": None if rank == 3 else "SEC",
+                    "first_place_votes": votes,
+                    "points": 100 - rank,
+                }
+                for rank in range(1, count + 1)
+            ]
+
+        df = pd.DataFrame(
+            [
+                {
+                    "season": 2021,
+                    "season_type": "regular",
+                    "week": week,
+                    "polls": [
+                        {"poll": "AP Top 25", "ranks": ranks(3, week)},
+                        {"poll": "Coaches Poll", "ranks": ranks(week)},
+                    ],
+                    "year": 2021,
+                }
+                for week in [1, 2]
+            ]
+        )
+        expected = legacy_get_rankings_load_process(df.copy())
+        flat = get_rankings_load_process(df.copy())
+        assert isinstance(flat.poll.dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(flat.astype({"poll": object}), expected)
+        assert flat.shape[0] == 9
+
+    def test_get_rankings_load_process_missing(self):
+        """
+        Test that weeks without polls and polls without ranks keep a row,
+        as they did with explode.
+        """
+        rank = {
+            "rank": 1,
+            "school": "Georgia",
+            "conference": "SEC",
+            "first_place_votes": 60,
+            "points": 1500,
+        }
+        polls = [
+            {"poll": "AP Top 25", "ranks": [rank]},
+            {"poll": "Playoff Committee Rankings", "ranks": []},
+        ]
+        df = pd.json_normalize(
+            [
+                {"season": 2021, "week": 1, "polls": polls},
+                {"season": 2021, "week": 2, "polls": []},
+                {"season": 2021, "week": 3},
+            ],
+            max_level=0,
+        )
+        expected = legacy_get_rankings_load_process(df.copy())
+        flat = get_rankings_load_process(df.copy())
+        pd.testing.assert_frame_equal(
+            flat.astype({"poll": object}).fillna(np.nan),
+            expected.fillna(np.nan),
+        )
+        assert flat.week.tolist() == [1, 1, 2, 3]
+        assert flat["rank"].isna().tolist() == [False, True, True, True]
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
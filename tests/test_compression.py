@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_compression
+----------------------------------
+
+Tests for `atd_utils.compression` module.
+"""
+
+import os
+from os.path import join
+import shutil
+import sys
+import tempfile
+import unittest
+
+from atd_utils import compression
+from atd_utils.compression import (
+    AtomicWriter,
+    atomic_write,
+    check_compression,
+    checksum,
+    decompress,
+    file_checksum,
+    open_file,
+    read_bytes,
+)
+
+DATA = b'[{"id": 1, "home_team": "Georgia"}]\n' * 1000
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.path = join(self.data_dir, "get_games_2021.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def codecs(self):
+        return [None, "gzip"] + (
+            ["zstd"] if compression.zstandard is not None else []
+        )  # noqa
+
+    def test_round_trip(self):
+        """
+        Test that files read back the same whatever the codec, and that
+        the checksum is of the bytes on disk.
+        """
+        for codec in self.codecs():
+            writer = atomic_write(self.path, DATA, codec)
+            assert read_bytes(self.path) == DATA, codec
+            with open_file(self.path) as f:
+                assert f.readline() == DATA.splitlines(keepends=True)[0]
+            with open(self.path, "rb") as f:
+                stored = f.read()
+            assert decompress(stored) == DATA
+            assert writer.checksum == checksum(stored)
+            assert writer.checksum == file_checksum(self.path)
+            assert writer.size == len(stored)
+            if codec is not None:
+                assert len(stored) < len(DATA) / 10, codec
+        # gzip output doesn't depend on when it was written.
+        first = atomic_write(self.path, DATA, "gzip").checksum
+        assert atomic_write(self.path, DATA, "gzip").checksum == first
+
+    def test_atomic(self):
+        """
+        Test that a failed write leaves the old file in place and no
+        temporary file behind.
+        """
+        atomic_write(self.path, DATA)
+        with self.assertRaises(KeyError):
+            with AtomicWriter(self.path, "gzip") as f:
+                f.write(b"[{")
+                raise KeyError("interrupted")
+        assert read_bytes(self.path) == DATA
+        assert os.listdir(self.data_dir) == ["get_games_2021.json"]
+
+    def test_check_compression(self):
+        check_compression(None)
+        check_compression("gzip")
+        with self.assertRaises(ValueError):
+            check_compression("bz2")
+        with self.assertRaises(ValueError):
+            AtomicWriter(self.path, "lz4")
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_frame_cache
+----------------------------------
+
+Tests for `atd_utils.frame_cache` module.
+"""
+
+import os
+from os.path import join
+import shutil
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+from atd_utils.frame_cache import FrameCache, file_signature
+
+
+class TestFrameCache(unittest.TestCase):
+    def frame(self, rows):
+        return pd.DataFrame({"x": range(rows)})
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used frames are evicted to stay under
+        the memory budget, and oversized frames aren't cached.
+        """
+        nbytes = self.frame(100).memory_usage(deep=True).sum()
+        cache = FrameCache(max_bytes=int(nbytes * 2.5))
+        for key in "abc":
+            cache.put(key, (), self.frame(100))
+        assert cache.get("a", ()) is None
+        assert cache.get("b", ()) is not None
+        cache.put("d", (), self.frame(100))
+        assert cache.get("c", ()) is None
+        assert cache.get("b", ()) is not None
+        assert cache.nbytes <= cache.max_bytes
+        cache.put("e", (), self.frame(1000))
+        assert cache.get("e", ()) is None
+        assert FrameCache(max_bytes=0).get("a", ()) is None
+
+    def test_signature(self):
+        """Test that rewriting a file invalidates frames loaded from it."""
+        path = tempfile.mkdtemp()
+        try:
+            with open(join(path, "a.json"), "w") as f:
+                f.write("[]")
+            signature = file_signature(path, ["a.json"])
+            cache = FrameCache()
+            cache.put("a", signature, self.frame(1))
+            assert cache.get("a", file_signature(path, ["a.json"])) is not None  # noqa
+            with open(join(path, "a.json"), "w") as f:
+                f.write("[{}]")
+            os.utime(join(path, "a.json"), ns=(0, 10**18))
+            assert cache.get("a", file_signature(path, ["a.json"])) is None
+            assert len(cache) == 0 and cache.nbytes == 0
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_imports
+----------------------------------
+
+Tests for the lazy attributes of the `atd_utils` package.
+"""
+
+import importlib
+import subprocess
+import sys
+import unittest
+from typing import Dict
+
+import atd_utils
+
+# Modules `import atd_utils` used to load, which lightweight uses of the
+# package shouldn't pay for.
+HEAVY_MODULES = ["pandas", "numpy", "cfbd", "pyarrow"]
+# Cumulative microseconds `import atd_utils` may take. It took ~650 ms when
+# the package imported data_utils eagerly.
+IMPORT_BUDGET_US = 100_000
+
+
+def import_times(code: str) -> Dict[str, int]:
+    """
+    Run code in a fresh interpreter under `-X importtime`.
+
+    Returns:
+        {module name: cumulative import time in microseconds} for every
+        module the code imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestLazyImports(unittest.TestCase):
+    def assert_not_imported(self, times: Dict[str, int]) -> None:
+        imported = [name for name in HEAVY_MODULES if name in times]
+        assert not imported, f"{imported} imported"
+
+    def test_import_time(self):
+        """
+        Test that importing the package doesn't import its submodules or
+        their dependencies.
+        """
+        times = import_times("import atd_utils")
+        self.assert_not_imported(times)
+        assert "atd_utils.data_utils" not in times
+        assert times["atd_utils"] < IMPORT_BUDGET_US, times["atd_utils"]
+
+        for module in ["cache", "rate_limit", "serializers"]:
+            self.assert_not_imported(import_times(f"import atd_utils.{module}"))  # noqa
+
+    def test_client_defers_cfbd(self):
+        """
+        Test that the cfbd SDK is only imported once the client needs to
+        call the API.
+        """
+        code = (
+            "import sys, tempfile\n"
+            "from atd_utils import CfbdClient\n"
+            "with tempfile.TemporaryDirectory() as data_dir:\n"
+            "    client = CfbdClient(api_key='key', data_dir=data_dir,\n"
+            "        scratch_dir=data_dir + '/scratch')\n"
+            "    assert 'cfbd' not in sys.modules\n"
+            "    auth = client.cfbd_configuration.api_key['Authorization']\n"
+            "    assert auth == 'key'\n"
+            "    assert 'cfbd' in sys.modules\n"
+        )
+        import_times(code)
+
+    def test_lazy_attributes(self):
+        """
+        Test that every name in __all__ resolves to the object its
+        submodule defines, and that unknown names raise AttributeError.
+        """
+        assert sorted(atd_utils.__all__) == sorted(atd_utils._ATTRIBUTE_MODULES)  # noqa
+        for name in atd_utils.__all__:
+            module = importlib.import_module(
+                f"atd_utils.{atd_utils._ATTRIBUTE_MODULES[name]}"
+            )  # noqa
+            assert getattr(atd_utils, name) is getattr(module, name)
+        assert atd_utils.data_utils is importlib.import_module(
+            "atd_utils.data_utils"
+        )  # noqa
+        assert "CfbdClient" in dir(atd_utils)
+        from atd_utils import AsyncCfbdClient
+        from atd_utils.async_client import AsyncCfbdClient as defined
+
+        assert AsyncCfbdClient is defined
+        with self.assertRaises(AttributeError):
+            atd_utils.not_a_name
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_instrumentation
+----------------------------------
+
+Tests for `atd_utils.instrumentation` module.
+"""
+
+import json
+import sys
+import threading
+import unittest
+
+from atd_utils.instrumentation import (
+    Instrumentation,
+    MetricsCollector,
+    to_json,
+    to_prometheus,
+)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_no_op(self):
+        """Test that the default instrumentation accepts and drops metrics."""
+        metrics = Instrumentation()
+        with metrics.span("request", endpoint="get_games"):
+            pass
+        metrics.count("records", 3, endpoint="get_games")
+        metrics.observe("request", 0.5)
+
+    def test_collector(self):
+        """
+        Test that counters add up, spans keep their count, sum and max, and
+        labels set to None are dropped.
+        """
+        metrics = MetricsCollector()
+
+        def work():
+            for _ in range(100):
+                metrics.count("records", 2, endpoint="get_games")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert metrics.counter("records", endpoint="get_games") == 800
+        assert metrics.counter("records", endpoint="get_coaches") == 0
+
+        metrics.observe("request", 0.25, endpoint="get_games")
+        metrics.observe("request", 0.75, endpoint="get_games", week=None)
+        with metrics.span("request", endpoint="get_games"):
+            pass
+        stats = metrics.span_stats("request", endpoint="get_games")
+        assert stats["count"] == 3
+        assert 1.0 <= stats["sum"] < 1.1
+        assert stats["max"] == 0.75
+        assert metrics.span_stats("load") is None
+
+        metrics.reset()
+        assert metrics.snapshot() == {"counters": [], "spans": []}
+
+    def test_exporters(self):
+        """Test the JSON and Prometheus text exports of a collector."""
+        metrics = MetricsCollector()
+        metrics.count("requests", endpoint="get_games")
+        metrics.count("requests", endpoint='we"ird')
+        metrics.observe("request", 0.5, endpoint="get_games")
+        metrics.observe("sql_write", 2.0, table="get_games", mode="upsert")
+
+        snapshot = json.loads(to_json(metrics))
+        assert snapshot["counters"][0] == {
+            "name": "requests",
+            "labels": {"endpoint": "get_games"},
+            "value": 1,
+        }
+        assert snapshot["spans"][1]["labels"] == {
+            "mode": "upsert",
+            "table": "get_games",
+        }
+
+        lines = to_prometheus(metrics).splitlines()
+        assert lines == [
+            "# TYPE atd_requests_total counter",
+            'atd_requests_total{endpoint="get_games"} 1',
+            'atd_requests_total{endpoint="we\\"ird"} 1',
+            "# TYPE atd_request_seconds summary",
+            'atd_request_seconds_count{endpoint="get_games"} 1',
+            'atd_request_seconds_sum{endpoint="get_games"} 0.5',
+            "# TYPE atd_sql_write_seconds summary",
+            'atd_sql_write_seconds_count{mode="upsert",table="get_games"} 1',
+            'atd_sql_write_seconds_sum{mode="upsert",table="get_games"} 2.0',
+            "# TYPE atd_request_seconds_max gauge",
+            'atd_request_seconds_max{endpoint="get_games"} 0.5',
+            "# TYPE atd_sql_write_seconds_max gauge",
+            'atd_sql_write_seconds_max{mode="upsert",table="get_games"} 2.0',
+        ]
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
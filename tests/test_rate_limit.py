@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_rate_limit
+----------------------------------
+
+Tests for `atd_utils.rate_limit` and the retry behaviour of
+`atd_utils.data_utils.get_api_response`.
+"""
+
+import unittest
+import sys
+from unittest.mock import patch, MagicMock
+
+from cfbd.rest import ApiException
+from urllib3.exceptions import MaxRetryError
+
+from atd_utils.rate_limit import TokenBucket, parse_retry_after
+from atd_utils.data_utils import get_api_response, ApiRequestError
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def api_exception(status, headers=None):
+    exception = ApiException(status=status, reason="test")
+    exception.headers = headers
+    return exception
+
+
+class TestTokenBucket(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(
+            rate=2, capacity=2, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_acquire_rate(self):
+        """Test that a burst is allowed and then tokens arrive at rate."""
+        for _ in range(6):
+            self.bucket.acquire()
+        # 2 tokens up front, then 4 more at 2 per second.
+        assert self.clock.now == 2.0
+
+    def test_throttle_and_recover(self):
+        """Test that a 429 pauses for Retry-After and halves the rate."""
+        self.bucket.throttle(retry_after=5)
+        assert self.bucket.rate == 1
+        self.bucket.acquire()
+        assert self.clock.now >= 5
+        for _ in range(20):
+            self.bucket.recover()
+        assert self.bucket.rate == 2
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after({"Retry-After": "3"}) == 3
+        assert parse_retry_after({"retry-after": "1.5"}) == 1.5
+        past = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert parse_retry_after({"Retry-After": past}) == 0
+        assert parse_retry_after({"Retry-After": "soon"}) is None
+        assert parse_retry_after(None) is None
+
+
+@patch("retrying.time.sleep", MagicMock())
+class TestGetApiResponse(unittest.TestCase):
+    def test_client_error_fails_fast(self):
+        """Test that a non-retryable 4xx is only attempted once."""
+        endpoint = MagicMock(side_effect=api_exception(404))
+        with self.assertRaises(ApiRequestError) as context:
+            get_api_response(endpoint, {"year": 2021})
+        assert context.exception.status == 404
+        assert endpoint.call_count == 1
+
+    def test_server_error_retried(self):
+        """Test that 5xx errors are retried until they succeed."""
+        endpoint = MagicMock(side_effect=[api_exception(503), ["ok"]])
+        assert get_api_response(endpoint, {"year": 2021}) == ["ok"]
+        assert endpoint.call_count == 2
+
+    def test_network_error_retried(self):
+        """Test that urllib3 connection errors are retried as status 0."""
+        error = MaxRetryError(None, "/games", "Connection refused")
+        endpoint = MagicMock(side_effect=[error, error, ["ok"]])
+        assert get_api_response(endpoint, {}) == ["ok"]
+        assert endpoint.call_count == 3
+
+        endpoint = MagicMock(side_effect=error)
+        with self.assertRaises(ApiRequestError) as context:
+            get_api_response(endpoint, {})
+        assert context.exception.status == 0
+
+    def test_rate_limited_throttles(self):
+        """Test that a 429 throttles the shared limiter by Retry-After."""
+        limiter = MagicMock()
+        endpoint = MagicMock(
+            side_effect=[api_exception(429, {"Retry-After": "7"}), ["ok"]]
+        )
+        assert get_api_response(endpoint, {}, limiter) == ["ok"]
+        limiter.throttle.assert_called_once_with(7.0)
+        assert limiter.acquire.call_count == 2
+        limiter.recover.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_response_cache
+----------------------------------
+
+Tests for `atd_utils.response_cache` module.
+"""
+
+from os.path import join
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from datetime import datetime
+
+from atd_utils.cache import current_season
+from atd_utils.response_cache import (
+    DEFAULT_TTL,
+    NEGATIVE_TTL,
+    ResponseCache,
+    request_key,
+)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.now = time.time()
+        self.cache = ResponseCache(
+            join(self.path, "responses.db"),
+            ttls={"get_rankings": {"cache_ttl": 10}},
+            clock=lambda: self.now,
+        )
+        self.year = current_season()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_key(self):
+        """Test that keys ignore param order but not values."""
+        a = request_key("GamesApi", "get_games", {"year": 1, "week": 2})
+        b = request_key("GamesApi", "get_games", {"week": 2, "year": 1})
+        c = request_key("GamesApi", "get_games", {"week": 3, "year": 1})
+        assert a == b != c
+
+    def test_ttls(self):
+        """
+        Test that current season responses expire after their endpoint's
+        TTL, empty ones sooner, and finished seasons' never.
+        """
+        games = [{"id": 1, "home_team": "Georgia"}]
+        params = {"year": self.year, "week": 1}
+        self.cache.put("GamesApi", "get_games", params, games)
+        self.cache.put("GamesApi", "get_games", {"year": self.year}, [])
+        self.cache.put("RankingsApi", "get_rankings", params, games)
+        self.cache.put("GamesApi", "get_games", {"year": 2001}, [])
+        assert self.cache.get("GamesApi", "get_games", params) == games
+        assert self.cache.get("GamesApi", "get_games", {"week": 2}) is None
+
+        self.now += NEGATIVE_TTL + 1
+        assert self.cache.get("RankingsApi", "get_rankings", params) is None
+        season = {"year": self.year}
+        assert self.cache.get("GamesApi", "get_games", season) is None
+        assert self.cache.get("GamesApi", "get_games", params) == games
+
+        self.now += DEFAULT_TTL
+        assert self.cache.get("GamesApi", "get_games", params) is None
+        assert self.cache.get("GamesApi", "get_games", {"year": 2001}) == []
+
+        self.cache.clear("get_games")
+        assert self.cache.get("GamesApi", "get_games", {"year": 2001}) is None
+
+    def test_mid_season_responses_expire(self):
+        """
+        Test that responses fetched while their season was being played
+        expire after the season ends, and ones fetched after it never do.
+        """
+        params = {"year": 2025, "season_type": "postseason", "week": 2}
+        self.now = datetime(2025, 12, 1).timestamp()
+        self.cache.put("GamesApi", "get_games", params, [])
+        self.now = datetime(2026, 10, 1).timestamp()
+        assert self.cache.get("GamesApi", "get_games", params) is None
+
+        self.cache.put("GamesApi", "get_games", params, [])
+        self.now = datetime(2030, 1, 1).timestamp()
+        assert self.cache.get("GamesApi", "get_games", params) == []
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())
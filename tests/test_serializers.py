@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_serializers
+----------------------------------
+
+Tests for `atd_utils.serializers` module.
+"""
+
+import unittest
+import shutil
+import os
+from os.path import join
+import sys
+import json
+
+from atd_utils.compression import atomic_write, file_checksum
+from atd_utils.serializers import (
+    SERIALIZERS,
+    get_serializer,
+    read_json,
+    iter_json_array,
+    iter_records,
+    JsonArrayWriter,
+)
+
+
+class TestSerializers(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = "test_serializers123"
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.records = [
+            {"id": 1, "name": "Georgia", "line_scores": [7, 0, 14, 3]},
+            {"id": 22, "name": 'Tech "Yellow Jackets"', "nested": {"a": []}},
+            12345,
+            "a, ] string",
+            [],
+        ]
+        self.path = join(self.data_dir, "records.json")
+        with open(self.path, "w") as f:
+            f.write(json.dumps(self.records, indent=2))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test that every installed backend round trips through bytes."""
+        for name in SERIALIZERS:
+            serializer = get_serializer(name)
+            data = serializer.dumps(self.records)
+            assert isinstance(data, bytes)
+            assert serializer.loads(data) == self.records
+        assert get_serializer().name in SERIALIZERS
+        with self.assertRaises(ValueError):
+            get_serializer("pickle")
+
+    def test_read_json(self):
+        assert read_json(self.path) == self.records
+        assert read_json(self.path, "json") == self.records
+
+    def test_iter_json_array(self):
+        """
+        Test that streaming yields the same records whatever the chunk
+        size, including numbers split across chunks.
+        """
+        for chunk_size in [1, 2, 3, 7, 64, 1 << 16]:
+            streamed = list(iter_json_array(self.path, chunk_size))
+            assert streamed == self.records, chunk_size
+
+    def test_iter_json_array_errors(self):
+        with open(self.path, "w") as f:
+            f.write('[{"id": 1}, {"id": ')
+        with self.assertRaises(ValueError):
+            list(iter_json_array(self.path, 4))
+        with open(self.path, "w") as f:
+            f.write('{"id": 1}')
+        with self.assertRaises(ValueError):
+            list(iter_json_array(self.path))
+
+    def test_iter_records_json_lines(self):
+        path = join(self.data_dir, "records.jsonl")
+        with open(path, "w") as f:
+            f.write("\n".join(json.dumps(record) for record in self.records))
+        assert list(iter_records(path)) == self.records
+        assert list(iter_records(self.path)) == self.records
+
+    def test_json_array_writer(self):
+        """
+        Test that batches written by JsonArrayWriter read back as one
+        array, and that a failed write leaves the old file alone.
+        """
+        path = join(self.data_dir, "written.json")
+        for name in SERIALIZERS:
+            with JsonArrayWriter(path, name) as writer:
+                writer.write([])
+                writer.write(self.records[:2])
+                writer.write(iter(self.records[2:]))
+            assert writer.count == len(self.records)
+            assert read_json(path) == self.records
+        with self.assertRaises(KeyError):
+            with JsonArrayWriter(path) as writer:
+                writer.write([{"id": 3}])
+                raise KeyError("interrupted")
+        assert read_json(path) == self.records
+        assert sorted(os.listdir(self.data_dir)) == [
+            "records.json",
+            "written.json",
+        ]  # noqa
+
+        with JsonArrayWriter(path, compression="gzip") as writer:
+            writer.write(self.records)
+        assert writer.checksum == file_checksum(path)
+        assert writer.size == os.path.getsize(path)
+        assert read_json(path) == self.records
+
+    def test_compressed_files(self):
+        """Test that every reader decompresses gzip files transparently."""
+        path = join(self.data_dir, "records.json")
+        atomic_write(path, json.dumps(self.records).encode(), "gzip")
+        assert read_json(path) == self.records
+        assert list(iter_json_array(path, 3)) == self.records
+        lines_path = join(self.data_dir, "records.jsonl")
+        lines = "\n".join(json.dumps(record) for record in self.records)
+        atomic_write(lines_path, lines.encode(), "gzip")
+        assert list(iter_records(lines_path)) == self.records
+
+
+if __name__ == "__main__":
+    sys.exit(unittest.main())